@@ -28,12 +28,22 @@ target_metadata = BaseModel.metadata
 # ... etc.
 config.set_main_option("sqlalchemy.url", Environment().POSTGRES_DATABASE_URI)
 
+# Indexes created on demand by migrations (e.g. -x brin=true) and not declared on the models,
+# ignored by autogenerate so they are not dropped.
+OPTIONAL_INDEXES = {"ix_features_time_brin"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (type_ == "index" and name in OPTIONAL_INDEXES)
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -51,7 +61,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
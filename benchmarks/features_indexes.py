@@ -0,0 +1,135 @@
+"""
+Compare query plans and latencies of the features read paths with and without the time indexes.
+
+A scratch copy of the features table (no rows are read from or written to `features` itself) is filled
+with synthetic, time-ordered events, then the queries issued by the API are run with EXPLAIN ANALYZE:
+
+- range: GET /features/ for one day
+- map: GET /visualization/map for one week with a minimum magnitude
+- page: a keyset page of GET /features/?limit=1000 in the middle of a month
+
+They are measured with no index on time, with the B-tree indexes of the models, and with a BRIN index only:
+
+    python -m benchmarks.features_indexes --rows 1000000
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from src.app.database.config import engine
+
+TABLE = "benchmark_features"
+START_TIME = datetime(2020, 1, 1)
+
+QUERIES = {
+    "range": f"""
+        SELECT * FROM {TABLE}
+        WHERE time >= :day AND time <= :day + interval '1 day'
+        ORDER BY time DESC
+    """,
+    "map": f"""
+        SELECT id, latitude, longitude, mag, place, time, depth, event_id, tsunami, alert FROM {TABLE}
+        WHERE time >= :day AND time <= :day + interval '7 days' AND mag BETWEEN 4.5 AND 10
+            AND latitude IS NOT NULL AND longitude IS NOT NULL
+        ORDER BY time DESC
+    """,
+    "page": f"""
+        SELECT * FROM {TABLE}
+        WHERE time >= :day AND time <= :day + interval '30 days' AND (time, id) < (:day + interval '15 days', :id)
+        ORDER BY time DESC, id DESC
+        LIMIT 1001
+    """,
+}
+
+INDEX_SETS = {
+    "no time index": [],
+    "btree": [
+        f"CREATE INDEX {TABLE}_time_id ON {TABLE} (time, id)",
+        f"CREATE INDEX {TABLE}_time_mag ON {TABLE} (time, mag)",
+    ],
+    "brin": [f"CREATE INDEX {TABLE}_time_brin ON {TABLE} USING brin (time)"],
+}
+
+
+def create_table(connection: Connection, rows: int, span_days: int) -> None:
+    """Create the scratch table with the primary key and unique event_id index of features only."""
+    connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    connection.execute(text(f"CREATE TABLE {TABLE} (LIKE features INCLUDING DEFAULTS)"))
+    connection.execute(text(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id), ADD UNIQUE (event_id)"))
+    # Events are appended in time order, as the ETL mostly does, so the physical order follows time.
+    connection.execute(
+        text(f"""
+            INSERT INTO {TABLE} (id, time, updated, mag, place, latitude, longitude, depth, event_id, tsunami,
+                status, net, metadata_id)
+            SELECT gen_random_uuid(), event_time, event_time, round((random() * random() * 8)::numeric, 1),
+                'place ' || n, random() * 180 - 90, random() * 360 - 180, random() * 100, 'bench' || n, 0,
+                'reviewed', 'us', gen_random_uuid()
+            FROM generate_series(1, :rows) AS n,
+                LATERAL (SELECT :start + (n * :step) * interval '1 second' AS event_time) AS t
+        """),
+        {"rows": rows, "start": START_TIME, "step": span_days * 86400 / rows},
+    )
+    connection.execute(text(f"VACUUM ANALYZE {TABLE}"))
+
+
+def drop_time_indexes(connection: Connection) -> None:
+    for statements in INDEX_SETS.values():
+        for statement in statements:
+            connection.execute(text(f"DROP INDEX IF EXISTS {statement.split()[2]}"))
+
+
+def measure(connection: Connection, name: str, parameters: dict, repeat: int) -> tuple[str, float]:
+    """Return the top plan nodes and the median execution time in milliseconds of a query."""
+    query = QUERIES[name]
+    plan = connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {query}"), parameters).scalars().all()
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        connection.execute(text(query), parameters).fetchall()
+        timings.append((time.perf_counter() - start_time) * 1000)
+    nodes = [line.strip().lstrip("-> ").split("  (")[0] for line in plan if "->" in line or line == plan[0]]
+    return " > ".join(nodes[:3]), statistics.median(timings)
+
+
+def main(rows: int, span_days: int, repeat: int, keep: bool) -> None:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        print(f"Loading {rows} synthetic events over {span_days} days into {TABLE}...")
+        start_time = time.perf_counter()
+        create_table(connection, rows, span_days)
+        print(f"Loaded in {time.perf_counter() - start_time:.1f}s")
+
+        parameters = {"day": START_TIME + timedelta(days=span_days // 2), "id": "ffffffff-ffff-ffff-ffff-ffffffffffff"}
+        try:
+            for index_set, statements in INDEX_SETS.items():
+                drop_time_indexes(connection)
+                for statement in statements:
+                    connection.execute(text(statement))
+                connection.execute(text(f"ANALYZE {TABLE}"))
+                size = connection.execute(
+                    text(
+                        f"SELECT pg_size_pretty(sum(pg_relation_size(indexrelid))) FROM pg_index "
+                        f"WHERE indrelid = '{TABLE}'::regclass AND indexrelid::regclass::text LIKE '%time%'"
+                    )
+                ).scalar()
+                print(f"\n== {index_set} (time index size: {size or '0 bytes'})")
+                for name in QUERIES:
+                    plan, latency = measure(connection, name, parameters, repeat)
+                    print(f"{name:<6} {latency:9.2f} ms   {plan}")
+        finally:
+            if not keep:
+                connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--span-days", type=int, default=730, help="Days covered by the synthetic events")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query, the median is reported")
+    parser.add_argument("--keep", action="store_true", help=f"Keep the {TABLE} table after the run")
+    arguments = parser.parse_args()
+    main(arguments.rows, arguments.span_days, arguments.repeat, arguments.keep)
@@ -0,0 +1,101 @@
+"""
+Measure the per-request overhead of the application middleware stack.
+
+A trivial endpoint is served in-process twice, bare and wrapped in the middlewares registered on
+`src.app.main.app`, and both are hit with concurrent requests through an ASGI transport, so the
+difference in latency is the cost of the middlewares alone. Run it on two revisions to compare stacks:
+
+    python -m benchmarks.middleware_overhead --requests 20000 --concurrency 200
+
+Execution logs are written to PostgreSQL in the background by ExecutionLogsWriter; exclude the middleware
+with `--exclude ExecutionLogsMiddleware` to measure dispatch overhead alone.
+"""
+
+import argparse
+import asyncio
+import base64
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+from starlette.types import ASGIApp
+
+from src.app.config import Environment
+from src.app.main import app as application
+from src.app.middlewares.execution_logs_writer import ExecutionLogsWriter
+
+
+def build_app(excluded: set[str], with_middlewares: bool, writer: ExecutionLogsWriter) -> ASGIApp:
+    app = FastAPI()
+    app.state.execution_logs_writer = writer
+
+    @app.get("/benchmark")
+    async def benchmark():
+        return {"ok": True}
+
+    asgi_app: ASGIApp = app
+    if with_middlewares:
+        # user_middleware lists the outermost middleware first, so wrap from the innermost one.
+        for middleware in reversed(application.user_middleware):
+            if middleware.cls.__name__ not in excluded:
+                asgi_app = middleware.cls(asgi_app, **middleware.options)
+    return asgi_app
+
+
+async def run(asgi_app: ASGIApp, requests: int, concurrency: int) -> tuple[float, list[float]]:
+    credentials = base64.b64encode(f"{Environment.API_USERNAME}:{Environment.API_PASSWORD}".encode()).decode()
+    headers = {"Authorization": f"Basic {credentials}"}
+    latencies: list[float] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=asgi_app), base_url="http://benchmark") as client:
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                start_time = time.perf_counter()
+                response = await client.get("/benchmark", headers=headers)
+                latencies.append(time.perf_counter() - start_time)
+                response.raise_for_status()
+
+        start_time = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - start_time, latencies
+
+
+def report(name: str, elapsed: float, latencies: list[float]) -> float:
+    mean = statistics.fmean(latencies)
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    print(f"{name:<12} {len(latencies) / elapsed:>9.0f} req/s   mean {mean * 1000:7.2f} ms   p99 {p99 * 1000:7.2f} ms")
+    return elapsed / len(latencies)
+
+
+async def main(requests: int, concurrency: int, excluded: set[str]):
+    stack = [m.cls.__name__ for m in application.user_middleware if m.cls.__name__ not in excluded]
+    print(f"{requests} requests, concurrency {concurrency}, middlewares: {', '.join(stack)}")
+
+    writer = ExecutionLogsWriter()
+    await writer.start()
+
+    # Warm up both apps (imports, connection pool) before measuring.
+    for with_middlewares in (False, True):
+        await run(build_app(excluded, with_middlewares, writer), min(requests, 500), concurrency)
+
+    bare = report("bare", *await run(build_app(excluded, False, writer), requests, concurrency))
+    stacked = report("middlewares", *await run(build_app(excluded, True, writer), requests, concurrency))
+    print(f"overhead     {(stacked - bare) * 1_000_000:.0f} us of event loop time per request")
+
+    await writer.stop()
+    print(f"execution logs: {writer.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--exclude", action="append", default=[], help="Middleware class name to leave out")
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.requests, arguments.concurrency, set(arguments.exclude)))
@@ -0,0 +1,132 @@
+"""
+Compare radius searches with and without the geohash prefix index.
+
+A scratch copy of the features table (no rows are read from or written to `features` itself) is filled
+with synthetic events, half of them spread uniformly over the globe and half clustered around a few
+seismic hot spots, then the radius query of GET /search/radius is run for several radii:
+
+- scan: exact haversine distance computed for every row
+- geohash: candidates from the geohash prefixes covering the circle, exact distance on the candidates only
+
+    python -m benchmarks.spatial_search --rows 1000000
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from src.app.database.config import engine
+from src.data_integration.geohash import EARTH_RADIUS_KM, cover, encode_many
+
+TABLE = "benchmark_features"
+# Tokyo, Los Angeles, Santiago, Jakarta: centers of the clustered events and of the searches.
+HOT_SPOTS = [(35.7, 139.7), (34.05, -118.25), (-33.45, -70.67), (-6.2, 106.8)]
+RADII_KM = [10, 100, 500, 2000]
+
+DISTANCE = f"""
+    2 * {EARTH_RADIUS_KM} * asin(least(1.0, sqrt(
+        power(sin((radians(latitude::float) - radians(:latitude)) / 2), 2)
+        + cos(radians(:latitude)) * cos(radians(latitude::float))
+        * power(sin((radians(longitude::float) - radians(:longitude)) / 2), 2)
+    )))
+"""
+
+
+def create_table(connection: Connection, rows: int) -> None:
+    """Create the scratch table with synthetic coordinates and their geohashes."""
+    connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    connection.execute(text(f"CREATE TABLE {TABLE} (LIKE features INCLUDING DEFAULTS)"))
+    connection.execute(text(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id), ADD UNIQUE (event_id)"))
+
+    random = np.random.default_rng(0)
+    uniform = rows // 2
+    centers = np.array(HOT_SPOTS)[random.integers(0, len(HOT_SPOTS), rows - uniform)]
+    latitudes = np.concatenate(
+        [np.degrees(np.arcsin(random.uniform(-1, 1, uniform))), centers[:, 0] + random.normal(0, 2, rows - uniform)]
+    ).clip(-90, 90)
+    longitudes = np.concatenate(
+        [random.uniform(-180, 180, uniform), centers[:, 1] + random.normal(0, 2, rows - uniform)]
+    )
+    longitudes = (longitudes + 180) % 360 - 180
+    geohashes = encode_many(latitudes.tolist(), longitudes.tolist())
+
+    batch_size = 100_000
+    for start in range(0, rows, batch_size):
+        connection.execute(
+            text(f"""
+                INSERT INTO {TABLE} (id, time, mag, latitude, longitude, geohash, event_id, metadata_id)
+                SELECT gen_random_uuid(), now(), round((random() * random() * 8)::numeric, 1), latitude, longitude,
+                    geohash, 'bench' || (:start + n), gen_random_uuid()
+                FROM unnest(CAST(:latitudes AS float[]), CAST(:longitudes AS float[]), CAST(:geohashes AS varchar[]))
+                    WITH ORDINALITY AS batch(latitude, longitude, geohash, n)
+            """),
+            {
+                "start": start,
+                "latitudes": latitudes[start : start + batch_size].tolist(),
+                "longitudes": longitudes[start : start + batch_size].tolist(),
+                "geohashes": geohashes[start : start + batch_size],
+            },
+        )
+    connection.execute(text(f"CREATE INDEX {TABLE}_geohash ON {TABLE} (geohash varchar_pattern_ops)"))
+    connection.execute(text(f"VACUUM ANALYZE {TABLE}"))
+
+
+def measure(connection: Connection, query: str, parameters: dict, repeat: int) -> tuple[int, float]:
+    """Return the number of rows and the median execution time in milliseconds of a query."""
+    timings, count = [], 0
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        count = len(connection.execute(text(query), parameters).fetchall())
+        timings.append((time.perf_counter() - start_time) * 1000)
+    return count, statistics.median(timings)
+
+
+def main(rows: int, repeat: int, keep: bool) -> None:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        print(f"Loading {rows} synthetic events into {TABLE}...")
+        start_time = time.perf_counter()
+        create_table(connection, rows)
+        print(f"Loaded in {time.perf_counter() - start_time:.1f}s")
+
+        try:
+            for latitude, longitude in HOT_SPOTS[:2]:
+                print(f"\n== around ({latitude}, {longitude})")
+                for radius_km in RADII_KM:
+                    prefixes = cover(latitude, longitude, radius_km)
+                    parameters = {"latitude": latitude, "longitude": longitude, "radius_km": radius_km}
+                    prefix_filter = " OR ".join(f"geohash LIKE '{prefix}%'" for prefix in prefixes)
+                    queries = {
+                        "scan": f"""
+                            SELECT * FROM (SELECT id, latitude, longitude, {DISTANCE} AS distance_km FROM {TABLE}) AS c
+                            WHERE distance_km <= :radius_km ORDER BY distance_km
+                        """,
+                        "geohash": f"""
+                            SELECT * FROM (
+                                SELECT id, latitude, longitude, {DISTANCE} AS distance_km FROM {TABLE}
+                                WHERE {prefix_filter}
+                            ) AS c
+                            WHERE distance_km <= :radius_km ORDER BY distance_km
+                        """,
+                    }
+                    results = {name: measure(connection, query, parameters, repeat) for name, query in queries.items()}
+                    assert results["scan"][0] == results["geohash"][0]
+                    print(
+                        f"{radius_km:>5} km {results['scan'][0]:>8} rows   scan {results['scan'][1]:9.2f} ms   "
+                        f"geohash {results['geohash'][1]:9.2f} ms ({len(prefixes)} cells)"
+                    )
+        finally:
+            if not keep:
+                connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query, the median is reported")
+    parser.add_argument("--keep", action="store_true", help=f"Keep the {TABLE} table after the run")
+    arguments = parser.parse_args()
+    main(arguments.rows, arguments.repeat, arguments.keep)
@@ -3,6 +3,7 @@ Earthquake API - A modular Python package for collecting and processing earthqua
 
 This package provides:
 - Base API client for making HTTP requests with configurable headers and parameters
+- Async base API client sharing a pooled connection, with a blocking facade for scripts
 - USGS Earthquake API client for fetching earthquake data
 
 Modules:
@@ -13,8 +14,15 @@ Modules:
 __version__ = "1.0.0"
 __author__ = "gs-costa"
 
-from src.api import BaseAPIClient
-from src.api.clients import USGSEarthquakeClient
+from src.api import AsyncBaseAPIClient, BaseAPIClient, SyncClientFacade
+from src.api.clients import AsyncUSGSEarthquakeClient, USGSEarthquakeClient
 from src.logger import Logger
 
-__all__ = ["BaseAPIClient", "USGSEarthquakeClient", "Logger"]
+__all__ = [
+    "BaseAPIClient",
+    "AsyncBaseAPIClient",
+    "SyncClientFacade",
+    "USGSEarthquakeClient",
+    "AsyncUSGSEarthquakeClient",
+    "Logger",
+]
@@ -2,6 +2,8 @@
 API module for base API client functionality.
 """
 
-from .base_api import BaseAPIClient
+from .async_base_api import AsyncBaseAPIClient
+from .base_api import APIResponseError, BaseAPIClient
+from .sync_facade import SyncClientFacade
 
-__all__ = ["BaseAPIClient"]
+__all__ = ["APIResponseError", "BaseAPIClient", "AsyncBaseAPIClient", "SyncClientFacade"]
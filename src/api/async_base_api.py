@@ -0,0 +1,141 @@
+"""
+Asynchronous base API client sharing a long-lived, pooled HTTP connection.
+"""
+
+from collections.abc import AsyncIterator
+from importlib.util import find_spec
+from typing import Any
+
+import httpx
+
+from ..logger import Logger
+from .base_api import APIResponseError, build_url
+
+
+class AsyncBaseAPIClient:
+    """
+    Asyncio-native counterpart of BaseAPIClient.
+
+    A single instance owns an httpx connection pool that keeps connections alive between requests,
+    so it is meant to be created once (e.g. in the application lifespan) and shared by every request.
+    """
+
+    logger = Logger(__name__)
+
+    def __init__(
+        self,
+        base_url: str,
+        default_headers: dict[str, str] | None = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 60.0,
+        timeout: float = 60.0,
+        http2: bool = False,
+    ):
+        """
+        Initialize the async base API client.
+
+        Args:
+            base_url (str): The base URL for the API
+            default_headers (Optional[Dict[str, str]]): Default headers to include in all requests
+            max_connections (int): Maximum number of concurrent connections in the pool
+            max_keepalive_connections (int): Maximum number of idle connections kept open
+            keepalive_expiry (float): Seconds an idle connection is kept open
+            timeout (float): Default timeout in seconds for each request
+            http2 (bool): Whether to negotiate HTTP/2, requires the optional `h2` package
+        """
+        self.base_url = base_url.rstrip("/")
+        self.default_headers = default_headers or {}
+
+        if http2 and find_spec("h2") is None:
+            self.logger.warning("HTTP/2 requested but the 'h2' package is not installed, falling back to HTTP/1.1")
+            http2 = False
+
+        self.client = httpx.AsyncClient(
+            headers=self.default_headers,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=timeout,
+            http2=http2,
+        )
+
+    def _build_url(self, endpoint: str, params: dict[str, Any] | None = None) -> str:
+        """
+        Build the complete URL with endpoint and query parameters.
+
+        Args:
+            endpoint (str): The API endpoint path
+            params (Optional[Dict[str, Any]]): Query parameters
+
+        Returns:
+            str: Complete URL with parameters
+        """
+        return build_url(self.base_url, endpoint, params)
+
+    async def get(
+        self, endpoint: str, params: dict[str, Any] | None = None, headers: dict[str, str] | None = None, **kwargs
+    ) -> httpx.Response:
+        """
+        Make a GET request to the specified endpoint.
+
+        Args:
+            endpoint (str): The API endpoint path
+            params (Optional[Dict[str, Any]]): Query parameters
+            headers (Optional[Dict[str, str]]): Additional headers for this request
+            **kwargs: Additional arguments to pass to httpx.AsyncClient.get()
+
+        Returns:
+            httpx.Response: The response object, with its body already read
+
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        url = self._build_url(endpoint, params)
+
+        self.logger.info(f"Sending GET request to {url}")
+
+        return await self.client.get(url, headers=headers, **kwargs)
+
+    async def stream_get(
+        self, endpoint: str, params: dict[str, Any] | None = None, chunk_size: int = 65536
+    ) -> AsyncIterator[bytes]:
+        """
+        Make a GET request and yield the response body in chunks as it is received.
+
+        Args:
+            endpoint (str): The API endpoint path
+            params (Optional[Dict[str, Any]]): Query parameters
+            chunk_size (int): Maximum size in bytes of each yielded chunk
+
+        Yields:
+            bytes: Chunks of the response body
+
+        Raises:
+            APIResponseError: If the API answers with a non-success status code
+            httpx.HTTPError: If the request fails
+        """
+        url = self._build_url(endpoint, params)
+
+        self.logger.info(f"Streaming GET request to {url}")
+
+        async with self.client.stream("GET", url) as response:
+            if not response.is_success:
+                await response.aread()
+                raise APIResponseError(response.status_code, response.text)
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+
+    async def aclose(self):
+        """Close the connection pool."""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.aclose()
@@ -2,6 +2,7 @@
 Base API client for making HTTP requests with configurable headers and parameters.
 """
 
+from collections.abc import Iterator
 from typing import Any
 from urllib.parse import urlencode
 
@@ -10,6 +11,37 @@ import requests
 from ..logger import Logger
 
 
+class APIResponseError(Exception):
+    """Raised by streaming requests when the API answers with a non-success status code."""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"{status_code} - {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+def build_url(base_url: str, endpoint: str, params: dict[str, Any] | None = None) -> str:
+    """
+    Build the complete URL with endpoint and query parameters.
+
+    Args:
+        base_url (str): The base URL for the API, without trailing slash
+        endpoint (str): The API endpoint path
+        params (Optional[Dict[str, Any]]): Query parameters
+
+    Returns:
+        str: Complete URL with parameters
+    """
+    url = f"{base_url}/{endpoint.lstrip('/')}"
+
+    if params:
+        clean_params = {k: str(v) for k, v in params.items() if v is not None}
+        if clean_params:
+            url += f"?{urlencode(clean_params)}"
+
+    return url
+
+
 class BaseAPIClient:
     """
     Base class for API clients that provides common HTTP request functionality.
@@ -46,14 +78,7 @@ class BaseAPIClient:
         Returns:
             str: Complete URL with parameters
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-
-        if params:
-            clean_params = {k: str(v) for k, v in params.items() if v is not None}
-            if clean_params:
-                url += f"?{urlencode(clean_params)}"
-
-        return url
+        return build_url(self.base_url, endpoint, params)
 
     def get(
         self, endpoint: str, params: dict[str, Any] | None = None, headers: dict[str, str] | None = None, **kwargs
@@ -83,6 +108,29 @@ class BaseAPIClient:
 
         return self.session.get(url, headers=request_headers, **kwargs)
 
+    def stream_get(
+        self, endpoint: str, params: dict[str, Any] | None = None, chunk_size: int = 65536
+    ) -> Iterator[bytes]:
+        """
+        Make a GET request and yield the response body in chunks as it is received.
+
+        Args:
+            endpoint (str): The API endpoint path
+            params (Optional[Dict[str, Any]]): Query parameters
+            chunk_size (int): Maximum size in bytes of each yielded chunk
+
+        Yields:
+            bytes: Chunks of the response body
+
+        Raises:
+            APIResponseError: If the API answers with a non-success status code
+            requests.RequestException: If the request fails
+        """
+        with self.get(endpoint, params=params, stream=True) as response:
+            if not response.ok:
+                raise APIResponseError(response.status_code, response.text)
+            yield from response.iter_content(chunk_size=chunk_size)
+
     def close(self):
         """Close the session."""
         self.session.close()
@@ -2,6 +2,7 @@
 Clients module for specific API client implementations.
 """
 
+from .async_usgs_earthquake_client import AsyncUSGSEarthquakeClient
 from .usgs_earthquake_client import USGSEarthquakeClient
 
-__all__ = ["USGSEarthquakeClient"]
+__all__ = ["USGSEarthquakeClient", "AsyncUSGSEarthquakeClient"]
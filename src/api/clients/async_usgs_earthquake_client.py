@@ -0,0 +1,105 @@
+"""
+Asynchronous USGS Earthquake API client backed by a shared connection pool.
+"""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+
+from src.api.async_base_api import AsyncBaseAPIClient
+from src.api.clients.usgs_earthquake_client import USGSQueryMixin
+
+
+class AsyncUSGSEarthquakeClient(USGSQueryMixin, AsyncBaseAPIClient):
+    """
+    Asyncio-native client for the USGS Earthquake API.
+
+    Wrap it in a SyncClientFacade to call it from threads or scripts without an event loop.
+    """
+
+    def __init__(self, default_headers: dict[str, str] | None = None, **pool_options: Any):
+        """
+        Initialize the async USGS Earthquake API client.
+
+        Args:
+            default_headers (Optional[Dict[str, str]]): Default headers to include in all requests
+            **pool_options: Connection pool options forwarded to AsyncBaseAPIClient (max_connections, http2, ...)
+        """
+        super().__init__(self.BASE_URL, self._default_headers(default_headers), **pool_options)
+
+    async def query_earthquakes(
+        self,
+        start_time: Any,
+        end_time: Any,
+        format_type: str = "geojson",
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Query earthquakes from the USGS API.
+
+        Args:
+            start_time: Start time for the query (string, datetime, or date)
+            end_time: End time for the query (string, datetime, or date)
+            format_type: Response format ('geojson', 'json', 'xml', 'csv', 'text')
+            **kwargs: Additional query parameters (check https://earthquake.usgs.gov/fdsnws/event/1/#parameters for all possible parameters)
+
+        Returns:
+            httpx.Response: The API response
+
+        Raises:
+            httpx.HTTPError: If the request fails
+            ValueError: If date formats are invalid
+        """
+
+        params = self._query_params(start_time, end_time, format_type, **kwargs)
+
+        return await self.get("query", params=params)
+
+    async def count_earthquakes(self, start_time: Any, end_time: Any, **kwargs) -> httpx.Response:
+        """
+        Count the earthquakes matching a query without downloading them.
+
+        Args:
+            start_time: Start time for the query (string, datetime, or date)
+            end_time: End time for the query (string, datetime, or date)
+            **kwargs: Additional query parameters, same as in query_earthquakes
+
+        Returns:
+            httpx.Response: The API response, a JSON body with "count" and "maxAllowed"
+
+        Raises:
+            httpx.HTTPError: If the request fails
+            ValueError: If date formats are invalid
+        """
+
+        params = self._query_params(start_time, end_time, "geojson", **kwargs)
+
+        return await self.get("count", params=params)
+
+    async def stream_earthquakes(
+        self, start_time: Any, end_time: Any, format_type: str = "geojson", chunk_size: int = 65536, **kwargs
+    ) -> AsyncIterator[bytes]:
+        """
+        Query earthquakes from the USGS API, yielding the response body in chunks as it is received.
+
+        Args:
+            start_time: Start time for the query (string, datetime, or date)
+            end_time: End time for the query (string, datetime, or date)
+            format_type: Response format ('geojson', 'json', 'xml', 'csv', 'text')
+            chunk_size: Maximum size in bytes of each yielded chunk
+            **kwargs: Additional query parameters, same as in query_earthquakes
+
+        Yields:
+            bytes: Chunks of the response body
+
+        Raises:
+            APIResponseError: If the API answers with a non-success status code
+            httpx.HTTPError: If the request fails
+            ValueError: If date formats are invalid
+        """
+
+        params = self._query_params(start_time, end_time, format_type, **kwargs)
+
+        async for chunk in self.stream_get("query", params=params, chunk_size=chunk_size):
+            yield chunk
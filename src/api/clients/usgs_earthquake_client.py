@@ -2,6 +2,7 @@
 USGS Earthquake API client for fetching earthquake data.
 """
 
+from collections.abc import Iterator
 from datetime import date, datetime
 from typing import Any
 
@@ -10,25 +11,15 @@ import requests
 from src.api.base_api import BaseAPIClient
 
 
-class USGSEarthquakeClient(BaseAPIClient):
+class USGSQueryMixin:
     """
-    Client for interacting with the USGS Earthquake API.
-
-    This client provides methods to query earthquake data from the USGS FDSN Event API.
+    USGS FDSN Event API specifics shared by the sync and async clients.
     """
 
     BASE_URL = "https://earthquake.usgs.gov/fdsnws/event/1"
 
-    def __init__(self, default_headers: dict[str, str] | None = None):
-        """
-        Initialize the USGS Earthquake API client.
-
-        Args:
-            default_headers (Optional[Dict[str, str]]): Default headers to include in all requests
-        """
-        headers = {"User-Agent": "Earthquake-API-Client/1.0", "Accept": "application/json", **(default_headers or {})}
-
-        super().__init__(self.BASE_URL, headers)
+    def _default_headers(self, default_headers: dict[str, str] | None = None) -> dict[str, str]:
+        return {"User-Agent": "Earthquake-API-Client/1.0", "Accept": "application/json", **(default_headers or {})}
 
     def _format_date(self, date_input: Any) -> str:
         """
@@ -66,6 +57,46 @@ class USGSEarthquakeClient(BaseAPIClient):
         else:
             raise ValueError(f"Invalid datetime format: {datetime_input}")
 
+    def _query_params(self, start_time: Any, end_time: Any, format_type: str, **kwargs) -> dict[str, Any]:
+        """
+        Build the query parameters shared by the query and count endpoints.
+
+        Args:
+            start_time: Start time for the query (string, datetime, or date)
+            end_time: End time for the query (string, datetime, or date)
+            format_type: Response format ('geojson', 'json', 'xml', 'csv', 'text')
+            **kwargs: Additional query parameters
+
+        Returns:
+            Dict[str, Any]: Query parameters
+        """
+        params = {
+            "format": format_type,
+            "starttime": self._format_datetime(start_time),
+            "endtime": self._format_datetime(end_time),
+        }
+
+        params.update(kwargs)
+
+        return params
+
+
+class USGSEarthquakeClient(USGSQueryMixin, BaseAPIClient):
+    """
+    Client for interacting with the USGS Earthquake API.
+
+    This client provides methods to query earthquake data from the USGS FDSN Event API.
+    """
+
+    def __init__(self, default_headers: dict[str, str] | None = None):
+        """
+        Initialize the USGS Earthquake API client.
+
+        Args:
+            default_headers (Optional[Dict[str, str]]): Default headers to include in all requests
+        """
+        super().__init__(self.BASE_URL, self._default_headers(default_headers))
+
     def query_earthquakes(
         self,
         start_time: Any,
@@ -90,12 +121,53 @@ class USGSEarthquakeClient(BaseAPIClient):
             ValueError: If date formats are invalid
         """
 
-        params = {
-            "format": format_type,
-            "starttime": self._format_datetime(start_time),
-            "endtime": self._format_datetime(end_time),
-        }
-
-        params.update(kwargs)
+        params = self._query_params(start_time, end_time, format_type, **kwargs)
 
         return self.get("query", params=params)
+
+    def count_earthquakes(self, start_time: Any, end_time: Any, **kwargs) -> requests.Response:
+        """
+        Count the earthquakes matching a query without downloading them.
+
+        Args:
+            start_time: Start time for the query (string, datetime, or date)
+            end_time: End time for the query (string, datetime, or date)
+            **kwargs: Additional query parameters, same as in query_earthquakes
+
+        Returns:
+            requests.Response: The API response, a JSON body with "count" and "maxAllowed"
+
+        Raises:
+            requests.RequestException: If the request fails
+            ValueError: If date formats are invalid
+        """
+
+        params = self._query_params(start_time, end_time, "geojson", **kwargs)
+
+        return self.get("count", params=params)
+
+    def stream_earthquakes(
+        self, start_time: Any, end_time: Any, format_type: str = "geojson", chunk_size: int = 65536, **kwargs
+    ) -> Iterator[bytes]:
+        """
+        Query earthquakes from the USGS API, yielding the response body in chunks as it is received.
+
+        Args:
+            start_time: Start time for the query (string, datetime, or date)
+            end_time: End time for the query (string, datetime, or date)
+            format_type: Response format ('geojson', 'json', 'xml', 'csv', 'text')
+            chunk_size: Maximum size in bytes of each yielded chunk
+            **kwargs: Additional query parameters, same as in query_earthquakes
+
+        Yields:
+            bytes: Chunks of the response body
+
+        Raises:
+            APIResponseError: If the API answers with a non-success status code
+            requests.RequestException: If the request fails
+            ValueError: If date formats are invalid
+        """
+
+        params = self._query_params(start_time, end_time, format_type, **kwargs)
+
+        yield from self.stream_get("query", params=params, chunk_size=chunk_size)
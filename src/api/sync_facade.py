@@ -0,0 +1,84 @@
+"""
+Blocking facade over asynchronous API clients, for threads and scripts without an event loop.
+"""
+
+import functools
+import inspect
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+from anyio.from_thread import BlockingPortal, start_blocking_portal
+
+
+class SyncClientFacade:
+    """
+    Expose the coroutine methods of an async API client as blocking calls, and its async generator
+    methods as blocking iterators.
+
+    Calls are executed on the event loop behind a blocking portal, so the connection pool of the
+    wrapped client is shared. Inside the application the portal of the running event loop is passed in
+    and worker threads reuse the application-owned client; scripts omit it and the facade starts a
+    private event loop thread that lives until `close()`.
+    """
+
+    def __init__(self, async_client: Any, portal: BlockingPortal | None = None):
+        """
+        Initialize the facade.
+
+        Args:
+            async_client: The async API client to wrap (e.g. AsyncUSGSEarthquakeClient)
+            portal (Optional[BlockingPortal]): Portal to an already running event loop that owns the client
+        """
+        self.async_client = async_client
+        self._portal_manager = None
+        if portal is None:
+            self._portal_manager = start_blocking_portal()
+            portal = self._portal_manager.__enter__()
+        self.portal = portal
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.async_client, name)
+        if inspect.isasyncgenfunction(attribute):
+
+            @functools.wraps(attribute)
+            def blocking_iterator(*args, **kwargs):
+                return self._iterate(attribute(*args, **kwargs))
+
+            return blocking_iterator
+
+        if inspect.iscoroutinefunction(attribute):
+
+            @functools.wraps(attribute)
+            def blocking_call(*args, **kwargs):
+                return self.portal.call(functools.partial(attribute, *args, **kwargs))
+
+            return blocking_call
+
+        return attribute
+
+    def _iterate(self, async_iterator: AsyncIterator) -> Iterator:
+        """Consume an async generator item by item on the event loop of the portal."""
+        try:
+            while True:
+                try:
+                    yield self.portal.call(async_iterator.__anext__)
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.portal.call(async_iterator.aclose)
+
+    def close(self):
+        """Close the wrapped client and the private event loop, only if the facade owns them."""
+        if self._portal_manager is None:
+            return
+        self.portal.call(self.async_client.aclose)
+        self._portal_manager.__exit__(None, None, None)
+        self._portal_manager = None
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
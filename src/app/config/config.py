@@ -1,4 +1,5 @@
-from os import getenv
+from os import getenv, path
+from tempfile import gettempdir
 
 
 class Environment:
@@ -10,7 +11,42 @@ class Environment:
     POSTGRES_DATABASE_URI = (
         f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
     )
+    POSTGRES_ASYNC_DATABASE_URI = (
+        f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+    )
+
+    # Connections of the async request pool; requests beyond pool size + overflow wait for a free connection.
+    POSTGRES_ASYNC_POOL_SIZE = int(getenv("POSTGRES_ASYNC_POOL_SIZE", 20))
+    POSTGRES_ASYNC_MAX_OVERFLOW = int(getenv("POSTGRES_ASYNC_MAX_OVERFLOW", 10))
 
     API_USERNAME = getenv("API_USERNAME", "admin")
     API_PASSWORD = getenv("API_PASSWORD", "admin")
     API_REALM = getenv("API_REALM", "EarthquakeAPI")
+
+    USGS_MAX_WORKERS = int(getenv("USGS_MAX_WORKERS", 4))
+    USGS_MAX_CONNECTIONS = int(getenv("USGS_MAX_CONNECTIONS", 20))
+    USGS_HTTP2 = getenv("USGS_HTTP2", "false").lower() == "true"
+    # Seconds between two polls of the events updated in USGS, 0 disables the poller of the API process.
+    USGS_POLL_INTERVAL = float(getenv("USGS_POLL_INTERVAL", 0))
+    USGS_POLL_HORIZON_DAYS = int(getenv("USGS_POLL_HORIZON_DAYS", 30))
+    # Number of day-sized chunks of the ingestion jobs run concurrently by each API worker.
+    INGEST_JOB_WORKERS = int(getenv("INGEST_JOB_WORKERS", 2))
+
+    EXECUTION_LOGS_QUEUE_SIZE = int(getenv("EXECUTION_LOGS_QUEUE_SIZE", 10000))
+    EXECUTION_LOGS_BATCH_SIZE = int(getenv("EXECUTION_LOGS_BATCH_SIZE", 500))
+    EXECUTION_LOGS_FLUSH_INTERVAL = float(getenv("EXECUTION_LOGS_FLUSH_INTERVAL", 1.0))
+
+    TILE_CACHE_MAX_ENTRIES = int(getenv("TILE_CACHE_MAX_ENTRIES", 4096))
+    TILE_CACHE_TTL = float(getenv("TILE_CACHE_TTL", 300))
+    TILE_CACHE_DISK_TTL = float(getenv("TILE_CACHE_DISK_TTL", 3600))
+    # An empty value keeps the tile cache in memory only.
+    TILE_CACHE_DIR = getenv("TILE_CACHE_DIR", path.join(gettempdir(), "earthquake_api_tiles"))
+
+    # A redis:// URL shares cached query results between workers, an empty value keeps them in each worker.
+    RESULT_CACHE_URL = getenv("RESULT_CACHE_URL", "")
+    RESULT_CACHE_MAX_ENTRIES = int(getenv("RESULT_CACHE_MAX_ENTRIES", 256))
+    RESULT_CACHE_TTL = float(getenv("RESULT_CACHE_TTL", 60))
+    # Results with more rows are not cached.
+    RESULT_CACHE_MAX_ROWS = int(getenv("RESULT_CACHE_MAX_ROWS", 10000))
+    # Rows kept by the in-process cache over all results, which bounds its memory.
+    RESULT_CACHE_MAX_TOTAL_ROWS = int(getenv("RESULT_CACHE_MAX_TOTAL_ROWS", 200000))
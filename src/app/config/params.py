@@ -1,3 +1,6 @@
+import base64
+import json
+import uuid
 from datetime import datetime
 
 from fastapi import HTTPException, status
@@ -21,3 +24,56 @@ def validate_date_format(*args: str) -> None:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Invalid date format: Please enter the date in the correct format (yyyy-mm-dd)",
                 )
+
+
+def encode_cursor(time: datetime, id: uuid.UUID) -> str:
+    """
+    Encodes the (time, id) key of the last returned record as an opaque pagination cursor.
+    Args:
+        time (datetime): Time of the last returned record.
+        id (uuid.UUID): ID of the last returned record.
+    Returns:
+        str: URL-safe cursor.
+    """
+    payload = json.dumps([time.isoformat(), str(id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """
+    Decodes a pagination cursor created by encode_cursor.
+    Args:
+        cursor (str): The cursor received from the client.
+    Returns:
+        tuple[datetime, uuid.UUID]: The (time, id) key the next page starts after.
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        time, id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(time), uuid.UUID(id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+def parse_bbox(bbox: str) -> tuple[float, float, float, float]:
+    """
+    Parses a bounding box given as "west,south,east,north" in degrees.
+    Args:
+        bbox (str): The bounding box received from the client.
+    Returns:
+        tuple[float, float, float, float]: The (west, south, east, north) bounds, west is greater than
+        east when the box crosses the antimeridian.
+    Raises:
+        HTTPException: If the bounding box is malformed or out of range.
+    """
+    try:
+        west, south, east, north = (float(value) for value in bbox.split(","))
+    except ValueError:
+        west = south = east = north = float("nan")
+    if not (-180 <= west <= 180 and -180 <= east <= 180 and -90 <= south <= north <= 90):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid bounding box: Please enter west,south,east,north in degrees",
+        )
+    return west, south, east, north
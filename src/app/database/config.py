@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from ..config import Environment
@@ -11,3 +12,14 @@ engine = create_engine(
     pool_recycle=600,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Request handling runs on the event loop with asyncpg, the sync engine is kept for the ETL and scripts.
+# Concurrency is no longer capped by the threadpool, so the pool must stay below the server max_connections.
+async_engine = create_async_engine(
+    url=Environment.POSTGRES_ASYNC_DATABASE_URI,
+    pool_size=Environment.POSTGRES_ASYNC_POOL_SIZE,
+    max_overflow=Environment.POSTGRES_ASYNC_MAX_OVERFLOW,
+    pool_timeout=60,
+    pool_recycle=600,
+)
+AsyncSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, bind=async_engine, expire_on_commit=False)
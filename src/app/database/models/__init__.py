@@ -1,5 +1,17 @@
 from .execution_logs import ExecutionLogs
 from .features import Features
+from .ingestion_coverages import IngestionCoverages
+from .ingestion_job_chunks import IngestionJobChunks
+from .ingestion_jobs import IngestionJobs
+from .ingestion_watermarks import IngestionWatermarks
 from .metadatas import Metadatas
 
-__all__ = ["Metadatas", "Features", "ExecutionLogs"]
+__all__ = [
+    "Metadatas",
+    "Features",
+    "ExecutionLogs",
+    "IngestionCoverages",
+    "IngestionWatermarks",
+    "IngestionJobs",
+    "IngestionJobChunks",
+]
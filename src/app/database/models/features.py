@@ -1,4 +1,4 @@
-from sqlalchemy import DECIMAL, TIMESTAMP, Column, ForeignKey, Integer, String
+from sqlalchemy import DECIMAL, TIMESTAMP, Column, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import relationship
 
@@ -7,6 +7,14 @@ from src.app.database.models.base import BaseModel
 
 class Features(BaseModel):
     __tablename__ = "features"
+    # Keyset pagination walks (time, id), so every page is an index range scan whatever its position; the index
+    # also serves plain time range filters and sorts. (time, mag) lets the map query filter magnitudes in the index.
+    # Spatial searches scan geohash prefixes, which needs the pattern operator class under non-C collations.
+    __table_args__ = (
+        Index("ix_features_time_id", "time", "id"),
+        Index("ix_features_time_mag", "time", "mag"),
+        Index("ix_features_geohash", "geohash", postgresql_ops={"geohash": "varchar_pattern_ops"}),
+    )
 
     mag = Column(DECIMAL, nullable=True)
     place = Column(String, nullable=True)
@@ -36,6 +44,7 @@ class Features(BaseModel):
     latitude = Column(DECIMAL, nullable=True)
     longitude = Column(DECIMAL, nullable=True)
     depth = Column(DECIMAL, nullable=True)
+    geohash = Column(String(12), nullable=True)
     event_id = Column(String, nullable=False, unique=True)
     metadata_id = Column(PostgresUUID(as_uuid=True), ForeignKey("metadatas.id", ondelete="CASCADE"), nullable=False)
 
@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import TIMESTAMP, Column, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.orm import relationship
+
+from src.app.database.models.base import BaseModel
+
+
+class IngestionCoverages(BaseModel):
+    __tablename__ = "ingestion_coverages"
+    __table_args__ = (Index("ix_ingestion_coverages_window", "start_time", "end_time"),)
+
+    start_time = Column(TIMESTAMP, nullable=False, comment="Start of the ingested window (UTC, inclusive).")
+    end_time = Column(TIMESTAMP, nullable=False, comment="End of the ingested window (UTC, exclusive).")
+    fetched_at = Column(
+        TIMESTAMP,
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+        comment="Time (UTC) the window was fetched from the USGS API.",
+    )
+    metadata_id = Column(PostgresUUID(as_uuid=True), ForeignKey("metadatas.id", ondelete="CASCADE"), nullable=True)
+
+    metadatas = relationship("Metadatas", back_populates="ingestion_coverages")
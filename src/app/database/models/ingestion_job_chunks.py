@@ -0,0 +1,26 @@
+from sqlalchemy import TIMESTAMP, Column, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.orm import relationship
+
+from src.app.database.models.base import BaseModel
+
+
+class IngestionJobChunks(BaseModel):
+    __tablename__ = "ingestion_job_chunks"
+    __table_args__ = (
+        Index("ix_ingestion_job_chunks_job_id", "job_id", "start_time"),
+        Index("ix_ingestion_job_chunks_status", "status"),
+    )
+
+    job_id = Column(PostgresUUID(as_uuid=True), ForeignKey("ingestion_jobs.id", ondelete="CASCADE"), nullable=False)
+    start_time = Column(TIMESTAMP, nullable=False, comment="Start of the chunk (UTC, inclusive).")
+    end_time = Column(TIMESTAMP, nullable=False, comment="End of the chunk (UTC, exclusive).")
+    status = Column(String, nullable=False, comment="pending, running, succeeded or failed.")
+    rows_upserted = Column(Integer, nullable=False, default=0, comment="Number of features upserted by the chunk.")
+    started_at = Column(TIMESTAMP, nullable=True, comment="Time (UTC) the chunk was last started.")
+    finished_at = Column(TIMESTAMP, nullable=True, comment="Time (UTC) the chunk finished.")
+    error = Column(String, nullable=True, comment="Error of the last failed run of the chunk.")
+    metadata_id = Column(PostgresUUID(as_uuid=True), ForeignKey("metadatas.id", ondelete="SET NULL"), nullable=True)
+
+    ingestion_jobs = relationship("IngestionJobs", back_populates="ingestion_job_chunks")
+    metadatas = relationship("Metadatas", back_populates="ingestion_job_chunks")
@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import TIMESTAMP, Column, String
+from sqlalchemy.orm import relationship
+
+from src.app.database.models.base import BaseModel
+
+
+class IngestionJobs(BaseModel):
+    __tablename__ = "ingestion_jobs"
+
+    start_time = Column(TIMESTAMP, nullable=False, comment="Start of the range to ingest (UTC, inclusive).")
+    end_time = Column(TIMESTAMP, nullable=False, comment="End of the range to ingest (UTC, exclusive).")
+    origin = Column(
+        String,
+        nullable=False,
+        default="api",
+        server_default="api",
+        comment="api for jobs submitted to the API, which resumes them, or backfill for the backfill CLI.",
+    )
+    created_at = Column(
+        TIMESTAMP,
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+        comment="Time (UTC) the job was submitted.",
+    )
+
+    ingestion_job_chunks = relationship("IngestionJobChunks", back_populates="ingestion_jobs")
@@ -0,0 +1,14 @@
+from sqlalchemy import TIMESTAMP, Column, String
+
+from src.app.database.models.base import BaseModel
+
+
+class IngestionWatermarks(BaseModel):
+    __tablename__ = "ingestion_watermarks"
+
+    name = Column(String, nullable=False, unique=True, comment="Name of the incremental feed.")
+    start_time = Column(
+        TIMESTAMP, nullable=False, comment="Start of the polled time window (UTC), moved forward by every poll."
+    )
+    watermark = Column(TIMESTAMP, nullable=False, comment="Latest `updated` time (UTC) of the events applied.")
+    polled_at = Column(TIMESTAMP, nullable=False, comment="Time (UTC) of the last successful poll.")
@@ -16,3 +16,5 @@ class Metadatas(BaseModel):
 
     features = relationship("Features", back_populates="metadatas")
     execution_logs = relationship("ExecutionLogs", back_populates="metadatas")
+    ingestion_coverages = relationship("IngestionCoverages", back_populates="metadatas")
+    ingestion_job_chunks = relationship("IngestionJobChunks", back_populates="metadatas")
@@ -1,16 +1,31 @@
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
 from datetime import datetime
-from typing import Literal, TypeVar
+from typing import Any, Literal, TypeVar
 
-from fastapi import Request
+from fastapi import HTTPException, Request, status
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from src.app.config.params import validate_date_format
-from src.app.database.models import Features
-from src.app.repositories.database_repository import DatabaseRepository
+from src.app.config import Environment
+from src.app.config.params import decode_cursor, encode_cursor, validate_date_format
+from src.app.database.models import Features, IngestionCoverages, IngestionJobChunks, IngestionJobs
+from src.app.domains.result_cache import result_key
+from src.app.middlewares.database_session import get_db_session
+from src.app.repositories.async_database_repository import AsyncDatabaseRepository
+from src.data_integration import geohash
+from src.data_integration.coverage import AsyncCoverageLedger
 from src.data_integration.earthquake_usgs import EarthquakeUSGSETL
+from src.data_integration.jobs import API_ORIGIN, PENDING, IngestJobProgress, job_progress, plan_chunks
 
 T = TypeVar("T", bound=BaseModel)
 
+# Magnitude bound used when a spatial search filters on only one side of the magnitude range.
+MAX_MAGNITUDE = 10.0
+# First radius tried by nearest-neighbour searches, which is multiplied by 4 until enough earthquakes are found.
+NEAREST_INITIAL_RADIUS_KM = 50.0
+
 
 class EarthquakeService:
     """
@@ -19,9 +34,105 @@ class EarthquakeService:
 
     def __init__(self, request: Request):
         self.request = request
-        self.db_session = request.state.db_session
 
-    def get_earthquake_data(
+    @property
+    def db_session(self) -> AsyncSession:
+        """Session of the request, only opened once the service actually queries."""
+        return get_db_session(self.request)
+
+    async def refresh_data(self, start_time: str, end_time: str, fetch_new_data: bool = True) -> None:
+        """
+        Ingest the missing or stale parts of a date range from the USGS API before it is queried.
+
+        Args:
+            start_time: Start date in YYYY-MM-DD format
+            end_time: End date in YYYY-MM-DD format
+            fetch_new_data: Whether to fetch new data from USGS API (default: True)
+        """
+        start_time_fmt = datetime.strptime(start_time, "%Y-%m-%d")
+        end_time_fmt = datetime.strptime(end_time, "%Y-%m-%d")
+
+        self.request.state.metadata_id = None
+        # The freshness check stays on the event loop, so requests for ingested ranges never wait for a thread.
+        if fetch_new_data and await AsyncCoverageLedger(self.db_session).stale_intervals(start_time_fmt, end_time_fmt):
+            # Return the connection to the pool while the blocking ETL (bulk COPY, worker threads) runs in a thread.
+            await self.db_session.commit()
+
+            async def fetch() -> uuid.UUID | None:
+                etl = EarthquakeUSGSETL(client=self.request.app.state.usgs_client)
+                return await run_in_threadpool(etl.main, start_time=start_time, end_time=end_time)
+
+            # Concurrent requests for the same range share a single download and upsert, and its metadata id.
+            metadata_id = await self.request.app.state.usgs_fetches.run((start_time_fmt, end_time_fmt), fetch)
+            self.request.state.metadata_id = metadata_id
+
+    async def cached_result(
+        self,
+        key: str,
+        response_model: type[T],
+        window: tuple[datetime, datetime],
+        load: Callable[[], Awaitable[list[T]]],
+    ) -> list[T]:
+        """
+        Return the result of a query from the result cache, loading and caching it on a miss.
+
+        Args:
+            key: Key of the query, from `result_key`
+            response_model: Pydantic model class of the result
+            window: (start, end) time window (inclusive) the query reads, whose ingestion invalidates the result
+            load: Coroutine function running the query
+
+        Returns:
+            List of formatted results
+        """
+        result_cache = self.request.app.state.result_cache
+        result = await result_cache.get(key, response_model)
+        if result is not None:
+            return result
+
+        generation = await result_cache.generation()
+        result = await load()
+        if len(result) <= Environment.RESULT_CACHE_MAX_ROWS:
+            await result_cache.set(key, result, response_model, window, generation)
+        return result
+
+    async def get_data_version(self, start_time: str, end_time: str, fetch_new_data: bool = True) -> str:
+        """
+        Get a token that changes whenever the features of a date range change, without loading them.
+
+        The range is refreshed first, then summarized by its number of features, their update times and the
+        ingestion runs covering it, which the ETL changes on every write to the range.
+
+        Args:
+            start_time: Start date in YYYY-MM-DD format
+            end_time: End date in YYYY-MM-DD format
+            fetch_new_data: Whether to fetch new data from USGS API (default: True)
+
+        Returns:
+            Version of the date range
+        """
+
+        validate_date_format(start_time, end_time)
+
+        start_time_fmt = datetime.strptime(start_time, "%Y-%m-%d")
+        end_time_fmt = datetime.strptime(end_time, "%Y-%m-%d")
+
+        await self.refresh_data(start_time, end_time, fetch_new_data)
+
+        count, last_updated, updated_checksum = await AsyncDatabaseRepository(
+            Features, self.db_session
+        ).get_version_by_date_range(
+            date_column="time", start_time=start_time_fmt, end_time=end_time_fmt, version_column="updated"
+        )
+        coverages = await AsyncDatabaseRepository(IngestionCoverages, self.db_session).get_overlapping(
+            "start_time", "end_time", start_time_fmt, end_time_fmt
+        )
+        await self.db_session.commit()
+
+        runs = ",".join(sorted(str(coverage.metadata_id) for coverage in coverages))  # type: ignore
+        return f"{count}:{last_updated}:{updated_checksum}:{runs}"
+
+    async def get_earthquake_data(
         self,
         start_time: str,
         end_time: str,
@@ -29,10 +140,16 @@ class EarthquakeService:
         order_by: str = "time",
         order: Literal["asc", "desc"] = "desc",
         fetch_new_data: bool = True,
+        ranges: dict[str, tuple[Any, Any]] | None = None,
+        not_null: list[str] | None = None,
+        use_cache: bool = True,
     ) -> list[T]:
         """
         Get earthquake data within a date range with common processing.
 
+        Only the columns of `response_model` are selected, and the filters are applied by the database. Results
+        are served from the result cache until the ETL writes features in the date range.
+
         Args:
             start_time: Start date in YYYY-MM-DD format
             end_time: End date in YYYY-MM-DD format
@@ -40,6 +157,9 @@ class EarthquakeService:
             order_by: Column to order by (default: "time")
             order: Order direction (default: "desc")
             fetch_new_data: Whether to fetch new data from USGS API (default: True)
+            ranges: Column name to (minimum, maximum) inclusive bounds the features must fall within
+            not_null: Columns the features must have a value for
+            use_cache: Whether to go through the result cache (default: True)
 
         Returns:
             List of formatted features
@@ -47,21 +167,379 @@ class EarthquakeService:
 
         validate_date_format(start_time, end_time)
 
-        if fetch_new_data:
-            metadata_id = EarthquakeUSGSETL().main(start_time=start_time, end_time=end_time)
-            self.request.state.metadata_id = metadata_id
-        else:
-            self.request.state.metadata_id = None
+        start_time_fmt = datetime.strptime(start_time, "%Y-%m-%d")
+        end_time_fmt = datetime.strptime(end_time, "%Y-%m-%d")
+
+        await self.refresh_data(start_time, end_time, fetch_new_data)
+
+        async def load() -> list[T]:
+            database_repository = AsyncDatabaseRepository(Features, self.db_session)
+
+            features = await database_repository.get_by_date_range(
+                date_column="time",
+                start_time=start_time_fmt,
+                end_time=end_time_fmt,
+                order_by=order_by,
+                order=order,
+                columns=list(response_model.model_fields),
+                ranges=ranges,
+                not_null=not_null,
+            )
+            # End the read transaction so the connection is not held while the response is serialized.
+            await self.db_session.commit()
+
+            return [response_model.model_validate(feature) for feature in features]
+
+        if not use_cache:
+            return await load()
+        key = result_key(
+            "get_earthquake_data",
+            start_time=start_time_fmt,
+            end_time=end_time_fmt,
+            response_model=response_model,
+            order_by=order_by,
+            order=order,
+            ranges=ranges,
+            not_null=not_null,
+        )
+        return await self.cached_result(key, response_model, (start_time_fmt, end_time_fmt), load)
+
+    async def get_earthquake_clusters(
+        self,
+        start_time: str,
+        end_time: str,
+        response_model: type[T],
+        cells: int,
+        fetch_new_data: bool = True,
+        ranges: dict[str, tuple[Any, Any]] | None = None,
+        use_cache: bool = True,
+    ) -> list[T]:
+        """
+        Get earthquake data within a date range aggregated into the cells of a map grid.
 
-        database_repository = DatabaseRepository(Features, self.db_session)
+        The database returns one row per non-empty cell, so the result size depends on the grid and the
+        filtered area, not on the number of earthquakes in the date range.
+
+        Args:
+            start_time: Start date in YYYY-MM-DD format
+            end_time: End date in YYYY-MM-DD format
+            response_model: Pydantic model class for response formatting
+            cells: Number of grid cells along each axis of the world map
+            fetch_new_data: Whether to fetch new data from USGS API (default: True)
+            ranges: Column name to (minimum, maximum) inclusive bounds the features must fall within
+            use_cache: Whether to go through the result cache (default: True)
+
+        Returns:
+            List of formatted clusters with their centroid, number of earthquakes and maximum magnitude
+        """
+
+        validate_date_format(start_time, end_time)
 
         start_time_fmt = datetime.strptime(start_time, "%Y-%m-%d")
         end_time_fmt = datetime.strptime(end_time, "%Y-%m-%d")
 
-        features = database_repository.get_by_date_range(
-            date_column="time", start_time=start_time_fmt, end_time=end_time_fmt, order_by=order_by, order=order
+        await self.refresh_data(start_time, end_time, fetch_new_data)
+
+        async def load() -> list[T]:
+            database_repository = AsyncDatabaseRepository(Features, self.db_session)
+
+            clusters = await database_repository.get_grid_clusters(
+                date_column="time",
+                start_time=start_time_fmt,
+                end_time=end_time_fmt,
+                latitude_column="latitude",
+                longitude_column="longitude",
+                value_column="mag",
+                cells=cells,
+                ranges=ranges,
+            )
+            await self.db_session.commit()
+
+            return [response_model.model_validate(cluster) for cluster in clusters]
+
+        if not use_cache:
+            return await load()
+        key = result_key(
+            "get_earthquake_clusters",
+            start_time=start_time_fmt,
+            end_time=end_time_fmt,
+            response_model=response_model,
+            cells=cells,
+            ranges=ranges,
         )
+        return await self.cached_result(key, response_model, (start_time_fmt, end_time_fmt), load)
 
-        formatted_features = [response_model.model_validate(feature) for feature in features]
+    async def get_earthquake_page(
+        self,
+        start_time: str,
+        end_time: str,
+        response_model: type[T],
+        limit: int,
+        cursor: str | None = None,
+        fetch_new_data: bool = True,
+    ) -> tuple[list[T], str | None]:
+        """
+        Get one page of earthquake data within a date range, newest first, with keyset pagination.
 
-        return formatted_features
+        Args:
+            start_time: Start date in YYYY-MM-DD format
+            end_time: End date in YYYY-MM-DD format
+            response_model: Pydantic model class for response formatting
+            limit: Maximum number of features in the page
+            cursor: Cursor returned with the previous page, None for the first page
+            fetch_new_data: Whether to fetch new data from USGS API; only the first page fetches, so that
+                following pages continue over the same data (default: True)
+
+        Returns:
+            Tuple of the formatted features and the cursor of the next page (None on the last page)
+        """
+
+        validate_date_format(start_time, end_time)
+        after = decode_cursor(cursor) if cursor else None
+
+        start_time_fmt = datetime.strptime(start_time, "%Y-%m-%d")
+        end_time_fmt = datetime.strptime(end_time, "%Y-%m-%d")
+
+        await self.refresh_data(start_time, end_time, fetch_new_data and after is None)
+
+        database_repository = AsyncDatabaseRepository(Features, self.db_session)
+
+        # One extra record tells whether another page follows, without a COUNT query.
+        features = await database_repository.get_page_by_date_range(
+            date_column="time", start_time=start_time_fmt, end_time=end_time_fmt, limit=limit + 1, after=after
+        )
+        await self.db_session.commit()
+
+        next_cursor = None
+        if len(features) > limit:
+            features = features[:limit]
+            next_cursor = encode_cursor(features[-1].time, features[-1].id)  # type: ignore
+
+        return [response_model.model_validate(feature) for feature in features], next_cursor
+
+    async def stream_earthquake_data(
+        self,
+        start_time: str,
+        end_time: str,
+        response_model: type[T],
+        order_by: str = "time",
+        order: Literal["asc", "desc"] = "desc",
+        fetch_new_data: bool = True,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[T]]:
+        """
+        Get earthquake data within a date range as a stream of batches read from a server-side cursor.
+
+        The range is validated and refreshed from the USGS API before returning, so errors surface before a
+        streaming response starts; the returned iterator then only reads from the database.
+
+        Args:
+            start_time: Start date in YYYY-MM-DD format
+            end_time: End date in YYYY-MM-DD format
+            response_model: Pydantic model class for response formatting
+            order_by: Column to order by (default: "time")
+            order: Order direction (default: "desc")
+            fetch_new_data: Whether to fetch new data from USGS API (default: True)
+            batch_size: Number of features per batch (default: 1000)
+
+        Returns:
+            Async iterator over lists of formatted features
+        """
+
+        validate_date_format(start_time, end_time)
+
+        start_time_fmt = datetime.strptime(start_time, "%Y-%m-%d")
+        end_time_fmt = datetime.strptime(end_time, "%Y-%m-%d")
+
+        await self.refresh_data(start_time, end_time, fetch_new_data)
+
+        database_repository = AsyncDatabaseRepository(Features, self.db_session)
+
+        async def formatted_batches() -> AsyncIterator[list[T]]:
+            async for features in database_repository.stream_by_date_range(
+                date_column="time",
+                start_time=start_time_fmt,
+                end_time=end_time_fmt,
+                order_by=order_by,
+                order=order,
+                batch_size=batch_size,
+            ):
+                yield [response_model.model_validate(feature) for feature in features]
+            await self.db_session.commit()
+
+        return formatted_batches()
+
+    @staticmethod
+    def _search_ranges(
+        start_time: str | None, end_time: str | None, min_magnitude: float | None, max_magnitude: float | None
+    ) -> dict[str, tuple[Any, Any]]:
+        """Build the optional time and magnitude filters of the spatial searches."""
+        validate_date_format(start_time, end_time)  # type: ignore
+
+        ranges: dict[str, tuple[Any, Any]] = {}
+        if start_time or end_time:
+            ranges["time"] = (
+                datetime.strptime(start_time, "%Y-%m-%d") if start_time else datetime.min,
+                datetime.strptime(end_time, "%Y-%m-%d") if end_time else datetime.max,
+            )
+        if min_magnitude is not None or max_magnitude is not None:
+            ranges["mag"] = (
+                min_magnitude if min_magnitude is not None else -MAX_MAGNITUDE,
+                max_magnitude if max_magnitude is not None else MAX_MAGNITUDE,
+            )
+        return ranges
+
+    async def search_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        response_model: type[T],
+        limit: int | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+        min_magnitude: float | None = None,
+        max_magnitude: float | None = None,
+    ) -> list[T]:
+        """
+        Get the ingested earthquakes within a great-circle distance of a point, nearest first.
+
+        Args:
+            latitude: Latitude of the center in degrees
+            longitude: Longitude of the center in degrees
+            radius_km: Maximum distance in kilometers
+            response_model: Pydantic model class for response formatting, with a `distance_km` field
+            limit: Maximum number of features to return
+            start_time: Optional start date in YYYY-MM-DD format
+            end_time: Optional end date in YYYY-MM-DD format
+            min_magnitude: Optional minimum magnitude
+            max_magnitude: Optional maximum magnitude
+
+        Returns:
+            List of formatted features with their distance to the point
+        """
+        self.request.state.metadata_id = None
+        ranges = self._search_ranges(start_time, end_time, min_magnitude, max_magnitude)
+
+        database_repository = AsyncDatabaseRepository(Features, self.db_session)
+        features = await database_repository.get_by_distance(
+            latitude_column="latitude",
+            longitude_column="longitude",
+            geohash_column="geohash",
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            prefixes=geohash.cover(latitude, longitude, radius_km),
+            columns=[column for column in response_model.model_fields if column != "distance_km"],
+            limit=limit,
+            ranges=ranges,
+        )
+        await self.db_session.commit()
+
+        return [response_model.model_validate(feature) for feature in features]
+
+    async def search_nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        response_model: type[T],
+        max_radius_km: float = geohash.MAX_DISTANCE_KM,
+        start_time: str | None = None,
+        end_time: str | None = None,
+        min_magnitude: float | None = None,
+        max_magnitude: float | None = None,
+    ) -> list[T]:
+        """
+        Get the `k` ingested earthquakes nearest to a point, nearest first.
+
+        The search radius starts small and grows until it holds `k` earthquakes: every earthquake closer than
+        the k-th one found is then inside the radius too, so the result is exact while dense areas only scan
+        a few small geohash cells.
+
+        Args:
+            latitude: Latitude of the point in degrees
+            longitude: Longitude of the point in degrees
+            k: Number of earthquakes to return
+            response_model: Pydantic model class for response formatting, with a `distance_km` field
+            max_radius_km: Distance in kilometers beyond which earthquakes are ignored
+            start_time: Optional start date in YYYY-MM-DD format
+            end_time: Optional end date in YYYY-MM-DD format
+            min_magnitude: Optional minimum magnitude
+            max_magnitude: Optional maximum magnitude
+
+        Returns:
+            List of at most `k` formatted features with their distance to the point
+        """
+        radius_km = min(NEAREST_INITIAL_RADIUS_KM, max_radius_km)
+        while True:
+            features = await self.search_radius(
+                latitude,
+                longitude,
+                radius_km,
+                response_model,
+                limit=k,
+                start_time=start_time,
+                end_time=end_time,
+                min_magnitude=min_magnitude,
+                max_magnitude=max_magnitude,
+            )
+            if len(features) >= k or radius_km >= max_radius_km:
+                return features
+            radius_km = min(radius_km * 4, max_radius_km)
+
+    async def submit_ingest_job(self, start_time: str, end_time: str) -> IngestionJobs:
+        """
+        Persist an ingestion job for a date range and queue its day-sized chunks to the job runner.
+
+        Args:
+            start_time: Start date in YYYY-MM-DD format
+            end_time: End date in YYYY-MM-DD format
+
+        Returns:
+            The created job
+        """
+
+        validate_date_format(start_time, end_time)
+
+        start_time_fmt = datetime.strptime(start_time, "%Y-%m-%d")
+        end_time_fmt = datetime.strptime(end_time, "%Y-%m-%d")
+        if start_time_fmt >= end_time_fmt:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_time must be before end_time")
+
+        job = await AsyncDatabaseRepository(IngestionJobs, self.db_session).create(
+            IngestionJobs(start_time=start_time_fmt, end_time=end_time_fmt, origin=API_ORIGIN)
+        )
+        # Most recent days first, they are the ones clients usually look at while the job runs.
+        chunks = [
+            {"id": uuid.uuid4(), "job_id": job.id, "start_time": chunk_start, "end_time": chunk_end, "status": PENDING}  # type: ignore
+            for chunk_start, chunk_end in reversed(plan_chunks(start_time_fmt, end_time_fmt))
+        ]
+        await AsyncDatabaseRepository(IngestionJobChunks, self.db_session).bulk_insert(chunks)
+        self.request.app.state.ingest_jobs.enqueue([chunk["id"] for chunk in chunks])
+        return job  # type: ignore
+
+    async def get_ingest_job(
+        self, job_id: uuid.UUID
+    ) -> tuple[IngestionJobs, IngestJobProgress, list[IngestionJobChunks]]:
+        """
+        Get an ingestion job with its progress.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            Tuple of the job, its progress and its chunks ordered by start time
+
+        Raises:
+            HTTPException: If the job does not exist
+        """
+        job = await AsyncDatabaseRepository(IngestionJobs, self.db_session).get_by_id(job_id)
+        if job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingestion job not found")
+
+        chunks = await AsyncDatabaseRepository(IngestionJobChunks, self.db_session).get_all_by(
+            order_by="start_time", job_id=job_id
+        )
+        await self.db_session.commit()
+        return job, job_progress(chunks), chunks  # type: ignore
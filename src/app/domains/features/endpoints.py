@@ -1,31 +1,134 @@
-from fastapi import APIRouter, Query, Request
+from typing import Literal
+
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 from src.app.domains.earthquake_service import EarthquakeService
 from src.app.domains.features.schema import FeaturesResponse
+from src.app.domains.formats import (
+    MSGPACK_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    encode_columns,
+    negotiate_format,
+    stream_json_array,
+    stream_msgpack_columns,
+    stream_ndjson,
+    to_msgpack,
+    to_ndjson,
+)
+from src.app.domains.http_cache import cache_headers, not_modified
 
 features_router = APIRouter(prefix="/features", tags=["features"])
 
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10000
+
 
-@features_router.get("/", response_model=list[FeaturesResponse])
-def get_features(
+@features_router.get(
+    "/",
+    response_model=list[FeaturesResponse],
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}, MSGPACK_MEDIA_TYPE: {}}}},
+)
+async def get_features(
     request: Request,
+    response: Response,
     start_time: str = Query(description="Start time in YYYY-MM-DD format"),
     end_time: str = Query(description="End time in YYYY-MM-DD format"),
+    limit: int | None = Query(
+        default=None,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description=f"Page size; without limit nor cursor the whole range is returned (default with a cursor: {DEFAULT_PAGE_SIZE})",
+    ),
+    cursor: str | None = Query(default=None, description="Cursor of the next page, from the X-Next-Cursor header"),
+    output_format: Literal["json", "ndjson", "msgpack"] | None = Query(
+        default=None,
+        alias="format",
+        description="Response body format: JSON array, newline-delimited JSON or MessagePack columns "
+        "(default: from the Accept header, else JSON)",
+    ),
+    stream: bool = Query(
+        default=False, description="Stream the whole range from a database cursor (always on for ndjson)"
+    ),
 ):
     """
     Get earthquake features within a date range.
 
+    Features are ordered by time, newest first. With `limit` (or `cursor`) a single page is returned and,
+    when more features follow, the cursor of the next page is sent in the `X-Next-Cursor` header and as a
+    `Link: <...>; rel="next"` URL.
+
+    Without pagination, `format=ndjson` or `stream=true` stream the range straight from a server-side
+    database cursor, so the first bytes are sent right away and memory stays flat whatever the range size.
+
+    `format=msgpack` (or `Accept: application/vnd.msgpack`) returns the features column by column as typed
+    arrays in a MessagePack document, or as a sequence of such documents, one per batch, when streamed.
+
+    Responses carry an ETag derived from the version of the date range, so a request with a matching
+    `If-None-Match` header is answered with 304 Not Modified before any feature is loaded.
+
     Args:
         request: FastAPI request object
+        response: FastAPI response object, carrying the pagination headers
         start_time: Start date in YYYY-MM-DD format
         end_time: End date in YYYY-MM-DD format
+        limit: Maximum number of features of the page
+        cursor: Opaque cursor of the page to return
+        output_format: Response body format, "json", "ndjson" or "msgpack"
+        stream: Whether to stream the whole range
 
     Returns:
-        JSON response with list of earthquake features within the specified date range
+        JSON (NDJSON or MessagePack) response with list of earthquake features within the specified date range
     """
+    output_format = negotiate_format(request, output_format, ["json", "ndjson", "msgpack"])
     earthquake_service = EarthquakeService(request)
-    features_json = earthquake_service.get_earthquake_data(
-        start_time=start_time, end_time=end_time, response_model=FeaturesResponse
+    # Only the first page fetches, so that following pages continue over the same data.
+    version = await earthquake_service.get_data_version(start_time, end_time, fetch_new_data=cursor is None)
+    headers = cache_headers(request, version, output_format, end_time)
+    not_modified_response = not_modified(request, headers)
+    if not_modified_response is not None:
+        return not_modified_response
+
+    if limit is None and cursor is None:
+        if output_format == "ndjson" or stream:
+            batches = await earthquake_service.stream_earthquake_data(
+                start_time=start_time, end_time=end_time, response_model=FeaturesResponse, fetch_new_data=False
+            )
+            if output_format == "ndjson":
+                return StreamingResponse(stream_ndjson(batches), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+            if output_format == "msgpack":
+                return StreamingResponse(
+                    stream_msgpack_columns(batches, FeaturesResponse), media_type=MSGPACK_MEDIA_TYPE, headers=headers
+                )
+            return StreamingResponse(stream_json_array(batches), media_type="application/json", headers=headers)
+
+        features = await earthquake_service.get_earthquake_data(
+            start_time=start_time, end_time=end_time, response_model=FeaturesResponse, fetch_new_data=False
+        )
+        if output_format == "msgpack":
+            return Response(
+                to_msgpack(encode_columns(features, FeaturesResponse)), media_type=MSGPACK_MEDIA_TYPE, headers=headers
+            )
+        response.headers.update(headers)
+        return features
+
+    features_json, next_cursor = await earthquake_service.get_earthquake_page(
+        start_time=start_time,
+        end_time=end_time,
+        response_model=FeaturesResponse,
+        limit=limit or DEFAULT_PAGE_SIZE,
+        cursor=cursor,
+        fetch_new_data=False,
     )
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
 
+    if output_format == "ndjson":
+        return Response(to_ndjson(features_json), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+    if output_format == "msgpack":
+        return Response(
+            to_msgpack(encode_columns(features_json, FeaturesResponse)), media_type=MSGPACK_MEDIA_TYPE, headers=headers
+        )
+    response.headers.update(headers)
     return features_json
@@ -0,0 +1,142 @@
+"""
+Response body encodings shared by the data endpoints.
+"""
+
+import types
+import typing
+import uuid
+from collections.abc import AsyncIterator, Iterable, Sequence
+from datetime import datetime
+from typing import Any
+
+import msgpack
+import numpy as np
+from fastapi import Request
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+MSGPACK_MEDIA_TYPE = "application/vnd.msgpack"
+
+MEDIA_TYPES = {"json": "application/json", "ndjson": NDJSON_MEDIA_TYPE, "msgpack": MSGPACK_MEDIA_TYPE}
+COLUMNS_VERSION = 1
+
+
+def negotiate_format(request: Request, output_format: str | None, supported: Iterable[str]) -> str:
+    """
+    Choose the response body format from the `format` query parameter, or else from the Accept header.
+
+    Args:
+        request: FastAPI request object
+        output_format: Value of the `format` query parameter, None when it was not given
+        supported: Formats the endpoint can produce, in order of preference for wildcard Accept headers
+
+    Returns:
+        Name of the format, "json" when nothing supported was asked for
+    """
+    if output_format:
+        return output_format
+    supported = list(supported)
+    for accepted in request.headers.get("accept", "").split(","):
+        media_type = accepted.split(";")[0].strip().lower()
+        for name in supported:
+            if MEDIA_TYPES[name] == media_type:
+                return name
+    return "json"
+
+
+def to_ndjson(models: Iterable[BaseModel]) -> bytes:
+    """Encode models as newline-delimited JSON, one object per line."""
+    return b"".join(model.model_dump_json().encode() + b"\n" for model in models)
+
+
+async def stream_ndjson(batches: AsyncIterator[list[BaseModel]]) -> AsyncIterator[bytes]:
+    """Encode a stream of model batches as newline-delimited JSON, one chunk per batch."""
+    async for batch in batches:
+        if batch:
+            yield to_ndjson(batch)
+
+
+async def stream_json_array(batches: AsyncIterator[list[BaseModel]]) -> AsyncIterator[bytes]:
+    """Encode a stream of model batches as a single JSON array, written incrementally one chunk per batch."""
+    separator = b"["
+    async for batch in batches:
+        if batch:
+            yield separator + b",".join(model.model_dump_json().encode() for model in batch)
+            separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+def _column_type(annotation: Any) -> type:
+    """Type of a field annotation, without the None of optional fields."""
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        return next(argument for argument in typing.get_args(annotation) if argument is not type(None))
+    return annotation
+
+
+def _validity(values: list[Any]) -> bytes | None:
+    """Little-endian bitmap with a bit set for each non-null value, None when no value is null."""
+    valid = np.array([value is not None for value in values], dtype=bool)
+    return None if valid.all() else np.packbits(valid, bitorder="little").tobytes()
+
+
+def encode_column(values: list[Any], column_type: type) -> dict[str, Any]:
+    """
+    Encode the values of one field as a typed array.
+
+    Floats become float32 with NaN for null, integers int32 and datetimes int64 milliseconds since the epoch
+    (naive datetimes are taken as UTC) with a `valid` bitmap when there are nulls, UUIDs 16 bytes each, and
+    other values dictionary-encoded strings with int32 indices, -1 for null.
+    """
+    if column_type is float:
+        return {"type": "float32", "data": np.array(values, dtype="<f4").tobytes()}
+    if column_type in (int, bool):
+        data = np.array([0 if value is None else value for value in values], dtype="<i4")
+        return {"type": "int32", "data": data.tobytes(), "valid": _validity(values)}
+    if column_type is datetime:
+        data = np.array([value.replace(tzinfo=None) if value else None for value in values], dtype="datetime64[ms]")
+        data = np.where(np.isnat(data), np.datetime64(0, "ms"), data).astype("<i8")
+        return {"type": "timestamp_ms", "data": data.tobytes(), "valid": _validity(values)}
+    if column_type is uuid.UUID:
+        data = b"".join(value.bytes if value else bytes(16) for value in values)
+        return {"type": "uuid", "data": data, "valid": _validity(values)}
+
+    dictionary: dict[str, int] = {}
+    indices = np.array(
+        [-1 if value is None else dictionary.setdefault(str(value), len(dictionary)) for value in values], dtype="<i4"
+    )
+    return {"type": "dictionary", "dictionary": list(dictionary), "indices": indices.tobytes()}
+
+
+def encode_columns(models: Sequence[BaseModel], model: type[BaseModel]) -> dict[str, Any]:
+    """
+    Encode models column by column, one typed array per field of `model`.
+
+    Args:
+        models: Instances of `model`
+        model: Pydantic model class whose fields are encoded
+
+    Returns:
+        {"version", "length", "columns": {field name: encoded column}} document
+    """
+    return {
+        "version": COLUMNS_VERSION,
+        "length": len(models),
+        "columns": {
+            name: encode_column([getattr(item, name) for item in models], _column_type(field.annotation))
+            for name, field in model.model_fields.items()
+        },
+    }
+
+
+def to_msgpack(content: Any) -> bytes:
+    """Encode a document of columns (and plain values) as MessagePack."""
+    return msgpack.packb(content, use_bin_type=True)
+
+
+async def stream_msgpack_columns(
+    batches: AsyncIterator[list[BaseModel]], model: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    """Encode a stream of model batches as a sequence of MessagePack column documents, one per batch."""
+    async for batch in batches:
+        if batch:
+            yield to_msgpack(encode_columns(batch, model))
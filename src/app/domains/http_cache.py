@@ -0,0 +1,75 @@
+"""
+HTTP caching of responses built from a date range of features: ETags, conditional requests and Cache-Control.
+"""
+
+import hashlib
+from datetime import datetime
+
+from fastapi import Request, Response, status
+
+from src.data_integration.coverage import FRESHNESS_POLICY, HISTORICAL_TTL, utc_now
+
+# Windows that ended before the last freshness tier are only refetched from USGS every HISTORICAL_TTL.
+CLOSED_WINDOW_AGE = FRESHNESS_POLICY[-1][0]
+
+
+def entity_tag(request: Request, version: str, output_format: str) -> str:
+    """
+    Compute the ETag of a response from the version of its date range and the parameters it was built with.
+
+    Args:
+        request: FastAPI request object, whose query parameters select the response content
+        version: Version of the date range, from EarthquakeService.get_data_version
+        output_format: Negotiated response body format
+
+    Returns:
+        Weak entity tag, the same bytes are not guaranteed across releases
+    """
+    parameters = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    digest = hashlib.sha1(f"{request.url.path}?{parameters}|{output_format}|{version}".encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def cache_control(end_time: str) -> str:
+    """
+    Build the Cache-Control header of a response covering a date range ending at `end_time` (YYYY-MM-DD).
+
+    Closed historical windows may be kept by any cache as long as the ingestion ledger keeps them without
+    refetching; more recent windows, which USGS still revises, must be revalidated with their ETag.
+    """
+    if utc_now() - datetime.strptime(end_time, "%Y-%m-%d") >= CLOSED_WINDOW_AGE:
+        return f"public, max-age={int(HISTORICAL_TTL.total_seconds())}"
+    return "no-cache"
+
+
+def cache_headers(request: Request, version: str, output_format: str, end_time: str) -> dict[str, str]:
+    """Build the ETag, Cache-Control and Vary headers of a response, see `entity_tag` and `cache_control`."""
+    return {
+        "ETag": entity_tag(request, version, output_format),
+        "Cache-Control": cache_control(end_time),
+        # The body depends on the Accept header, so shared caches must not mix representations.
+        "Vary": "Accept",
+    }
+
+
+def not_modified(request: Request, headers: dict[str, str]) -> Response | None:
+    """
+    Answer a conditional request whose If-None-Match header matches the ETag of the response.
+
+    Args:
+        request: FastAPI request object
+        headers: Headers of the response, from `cache_headers`
+
+    Returns:
+        304 Not Modified response with the caching headers, or None when the response must be sent
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return None
+
+    # If-None-Match uses the weak comparison: W/ prefixes are ignored.
+    etag = headers["ETag"].removeprefix("W/")
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
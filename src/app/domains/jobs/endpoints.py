@@ -0,0 +1,81 @@
+import uuid
+
+from fastapi import APIRouter, Query, Request, Response, status
+
+from src.app.domains.earthquake_service import EarthquakeService
+from src.app.domains.jobs.schema import IngestJobChunk, IngestJobResponse
+
+jobs_router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@jobs_router.post("/ingest", response_model=IngestJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_ingest_job(
+    request: Request,
+    response: Response,
+    start_time: str = Query(description="Start time in YYYY-MM-DD format"),
+    end_time: str = Query(description="End time in YYYY-MM-DD format"),
+):
+    """
+    Ingest a date range from the USGS API in the background.
+
+    The range is split into day-sized chunks, which are run by a thread pool of the API while the job id is
+    returned right away. Days already ingested and fresh are skipped by the chunks, so submitting a range again
+    only fetches what is missing or stale. Follow the progress with `GET /jobs/{job_id}`, sent in the
+    `Location` header.
+
+    Args:
+        request: FastAPI request object
+        response: FastAPI response object, carrying the Location header
+        start_time: Start date in YYYY-MM-DD format
+        end_time: End date in YYYY-MM-DD format
+
+    Returns:
+        JSON response with the pending job
+    """
+    earthquake_service = EarthquakeService(request)
+    job = await earthquake_service.submit_ingest_job(start_time, end_time)
+    response.headers["Location"] = str(request.url_for("get_ingest_job", job_id=job.id))
+    return await get_ingest_job(request, job.id, chunks=False)  # type: ignore
+
+
+@jobs_router.get("/{job_id}", response_model=IngestJobResponse)
+async def get_ingest_job(
+    request: Request,
+    job_id: uuid.UUID,
+    chunks: bool = Query(default=False, description="Include the state of every chunk"),
+):
+    """
+    Get the status and progress of an ingestion job.
+
+    The job is pending until a chunk starts, running while chunks are left, then succeeded, or failed when a
+    chunk failed (see its `error` with `chunks=true`). Throughput is measured from the start of the first chunk.
+
+    Args:
+        request: FastAPI request object
+        job_id: ID of the job
+        chunks: Whether to include the state of every chunk
+
+    Returns:
+        JSON response with the job progress and the ids of the metadata records of its ingestion runs
+    """
+    earthquake_service = EarthquakeService(request)
+    job, progress, job_chunks = await earthquake_service.get_ingest_job(job_id)
+    return IngestJobResponse(
+        id=job.id,  # type: ignore
+        start_time=job.start_time,  # type: ignore
+        end_time=job.end_time,  # type: ignore
+        created_at=job.created_at,  # type: ignore
+        status=progress.status,
+        chunks_total=progress.chunks_total,
+        chunks_pending=progress.chunks_pending,
+        chunks_running=progress.chunks_running,
+        chunks_succeeded=progress.chunks_succeeded,
+        chunks_failed=progress.chunks_failed,
+        rows_upserted=progress.rows_upserted,
+        started_at=progress.started_at,
+        finished_at=progress.finished_at,
+        elapsed=progress.elapsed,
+        rows_per_second=progress.rows_per_second,
+        metadata_ids=progress.metadata_ids,
+        chunks=[IngestJobChunk.model_validate(chunk) for chunk in job_chunks] if chunks else None,
+    )
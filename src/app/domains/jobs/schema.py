@@ -0,0 +1,42 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class IngestJobChunk(BaseModel):
+    """Pydantic model for a day-sized chunk of an ingestion job"""
+
+    start_time: datetime
+    end_time: datetime
+    status: str
+    rows_upserted: int
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+    metadata_id: uuid.UUID | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class IngestJobResponse(BaseModel):
+    """Response model for the status and progress of an ingestion job"""
+
+    id: uuid.UUID
+    start_time: datetime
+    end_time: datetime
+    created_at: datetime
+    status: str
+    chunks_total: int
+    chunks_pending: int
+    chunks_running: int
+    chunks_succeeded: int
+    chunks_failed: int
+    rows_upserted: int
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    elapsed: float
+    rows_per_second: float
+    metadata_ids: list[uuid.UUID]
+    chunks: list[IngestJobChunk] | None = None
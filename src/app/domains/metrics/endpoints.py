@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Request
+
+from src.app.domains.metrics.schema import (
+    ExecutionLogsMetrics,
+    MetricsResponse,
+    ResultCacheMetrics,
+    TileCacheMetrics,
+    USGSFetchesMetrics,
+)
+
+metrics_router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@metrics_router.get("/", response_model=MetricsResponse)
+async def get_metrics(request: Request):
+    """
+    Get the in-process counters of the API since it started.
+
+    Args:
+        request: FastAPI request object
+
+    Returns:
+        JSON response with the execution logs writer, tile cache, result cache and USGS fetches counters
+    """
+    return MetricsResponse(
+        execution_logs=ExecutionLogsMetrics.model_validate(request.app.state.execution_logs_writer.stats()),
+        tile_cache=TileCacheMetrics.model_validate(request.app.state.tile_cache.stats()),
+        result_cache=ResultCacheMetrics.model_validate(await request.app.state.result_cache.stats()),
+        usgs_fetches=USGSFetchesMetrics.model_validate(request.app.state.usgs_fetches.stats()),
+    )
@@ -0,0 +1,63 @@
+from pydantic import BaseModel
+
+
+class ExecutionLogsMetrics(BaseModel):
+    """Counters of the buffered execution logs writer"""
+
+    enqueued: int
+    written: int
+    dropped: int
+    failed: int
+    flushes: int
+    queued: int
+
+    class Config:
+        from_attributes = True
+
+
+class TileCacheMetrics(BaseModel):
+    """Counters of the vector tile cache"""
+
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    invalidations: int
+    entries: int
+
+    class Config:
+        from_attributes = True
+
+
+class ResultCacheMetrics(BaseModel):
+    """Counters of the query result cache"""
+
+    backend: str
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    entries: int
+
+    class Config:
+        from_attributes = True
+
+
+class USGSFetchesMetrics(BaseModel):
+    """Counters of the USGS fetches run by requests; `coalesced` requests awaited a fetch already in flight"""
+
+    calls: int
+    coalesced: int
+    failed: int
+    in_flight: int
+
+    class Config:
+        from_attributes = True
+
+
+class MetricsResponse(BaseModel):
+    """Response model for the in-process metrics of the API"""
+
+    execution_logs: ExecutionLogsMetrics
+    tile_cache: TileCacheMetrics
+    result_cache: ResultCacheMetrics
+    usgs_fetches: USGSFetchesMetrics
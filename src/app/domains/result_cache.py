@@ -0,0 +1,303 @@
+"""
+Cache of query results keyed by the normalized query, dropped when the ETL writes features in their time window.
+
+Two backends are available: MemoryResultCache, an LRU with a time to live local to the worker, and
+RedisResultCache, shared by every worker connected to the same Redis server. `create_result_cache` picks one
+from the RESULT_CACHE_URL setting.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+from src.app.config import Environment
+from src.logger import Logger
+
+Window = tuple[datetime, datetime]
+
+
+def result_key(query: str, **parameters: Any) -> str:
+    """
+    Build the cache key of a query from its name and parameters.
+
+    Parameters are normalized, so the same query always maps to the same key: dictionaries are sorted by key,
+    lists of names are sorted, datetimes are ISO formatted and models are replaced by their name.
+
+    Args:
+        query: Name of the query, e.g. the service method running it
+        **parameters: Parameters the result depends on
+
+    Returns:
+        Hexadecimal digest of the normalized query
+    """
+
+    def normalize(value: Any) -> Any:
+        if isinstance(value, type) and issubclass(value, BaseModel):
+            return f"{value.__module__}.{value.__qualname__}"
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, dict):
+            return {str(key): normalize(item) for key, item in sorted(value.items())}
+        if isinstance(value, list | set):
+            return sorted(normalize(item) for item in value)
+        if isinstance(value, tuple):
+            return [normalize(item) for item in value]
+        return value
+
+    normalized = json.dumps([query, normalize(parameters)], sort_keys=True, default=str)
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+
+def _epoch(value: datetime) -> float:
+    """Seconds since the epoch of a naive UTC datetime."""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+@lru_cache(maxsize=64)
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])  # type: ignore
+
+
+@dataclass
+class ResultCacheStats:
+    """Counters of a result cache since it was created; the Redis backend counts the lookups of this worker."""
+
+    backend: str
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+
+
+class MemoryResultCache:
+    """
+    In-process LRU cache of query results with a time to live.
+
+    Results are kept as the model instances returned by the service, and copied on a hit so callers cannot alter
+    the cached ones. The memory is bounded by the total number of rows kept rather than the number of results.
+    The cache is local to the worker: `ttl` bounds how long a worker serves a result another worker's ETL made
+    stale.
+    """
+
+    logger = Logger(__name__)
+
+    def __init__(
+        self,
+        max_entries: int = Environment.RESULT_CACHE_MAX_ENTRIES,
+        ttl: float = Environment.RESULT_CACHE_TTL,
+        max_total_rows: int = Environment.RESULT_CACHE_MAX_TOTAL_ROWS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of results kept, the least recently used are evicted first
+            ttl: Seconds a result is served
+            max_total_rows: Maximum number of rows kept over all results, the least recently used are evicted first
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_total_rows = max_total_rows
+        self._entries: OrderedDict[str, tuple[float, Window, list]] = OrderedDict()
+        self._total_rows = 0
+        # The ETL invalidates from worker threads while requests read on the event loop.
+        self._lock = threading.Lock()
+        self._stats = ResultCacheStats(backend="memory")
+        self._generation = 0
+
+    async def stats(self) -> ResultCacheStats:
+        with self._lock:
+            return replace(self._stats, entries=len(self._entries))
+
+    async def generation(self) -> int:
+        """Number of invalidations so far, to read before loading a result that will be cached."""
+        return self._generation
+
+    async def get(self, key: str, model: type[BaseModel]) -> list | None:
+        """Return a copy of the cached result of `key`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            result = entry[2]
+        # The models are mutable, a shallow copy of each is enough since their fields are scalars.
+        return [item.model_copy() for item in result]
+
+    async def set(self, key: str, result: list, model: type[BaseModel], window: Window, generation: int) -> None:
+        """
+        Cache the result of `key`.
+
+        Args:
+            key: Key of the query, from `result_key`
+            result: Model instances returned by the query
+            model: Model of the instances
+            window: (start, end) time window (inclusive) the result was read from
+            generation: Value of `generation()` before the result was read; the result is not cached if an
+                invalidation happened since
+        """
+        if len(result) > self.max_total_rows:
+            return
+        # Copied so later changes of the caller to its models do not reach the cache.
+        result = [item.model_copy() for item in result]
+        with self._lock:
+            if generation != self._generation:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_rows -= len(previous[2])
+            self._entries[key] = (time.monotonic(), window, result)
+            self._total_rows += len(result)
+            while len(self._entries) > self.max_entries or self._total_rows > self.max_total_rows:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._total_rows -= len(evicted)
+                self._stats.evictions += 1
+
+    def invalidate(self, start_time: datetime, end_time: datetime) -> None:
+        """Drop the results whose window overlaps [start_time, end_time], called by the ETL."""
+        with self._lock:
+            stale_keys = [
+                key
+                for key, (_, (window_start, window_end), _) in self._entries.items()
+                if window_start <= end_time and start_time <= window_end
+            ]
+            for key in stale_keys:
+                self._total_rows -= len(self._entries.pop(key)[2])
+            self._generation += 1
+            self._stats.invalidations += 1
+        self.logger.info(f"Invalidated {len(stale_keys)} results between {start_time} and {end_time}")
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisResultCache:
+    """
+    Query result cache stored in Redis, shared by every worker of the API.
+
+    Results are stored as JSON with a time to live. Next to them, a sorted set indexes the keys by the start
+    of their window, with the window end in the member, so an invalidation finds the overlapping results with
+    a single range query. A generation counter, checked atomically when a result is stored, keeps results read
+    before an invalidation by any worker out of the cache.
+    """
+
+    logger = Logger(__name__)
+
+    # Store a result only if no invalidation happened since its generation was read.
+    _SET_SCRIPT = """
+    if (redis.call('GET', KEYS[1]) or '0') ~= ARGV[1] then
+        return 0
+    end
+    redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+    redis.call('ZADD', KEYS[3], ARGV[4], ARGV[5])
+    return 1
+    """
+
+    def __init__(
+        self,
+        url: str = Environment.RESULT_CACHE_URL,
+        ttl: float = Environment.RESULT_CACHE_TTL,
+        prefix: str = "earthquake_api:results",
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            url: URL of the Redis server, e.g. redis://localhost:6379/0
+            ttl: Seconds a result is served
+            prefix: Prefix of the Redis keys of the cache
+        """
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError as e:
+            self.logger.error("The redis package is required by a redis:// RESULT_CACHE_URL")
+            raise e
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self.index_key = f"{prefix}:index"
+        self.generation_key = f"{prefix}:generation"
+        self.client = redis.asyncio.Redis.from_url(url)
+        # The ETL invalidates from worker threads, outside of the event loop the async client belongs to.
+        self.sync_client = redis.Redis.from_url(url)
+        self._set_script = self.client.register_script(self._SET_SCRIPT)
+        self._lock = threading.Lock()
+        self._stats = ResultCacheStats(backend="redis")
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def stats(self) -> ResultCacheStats:
+        # Expired members stay in the index until their window is invalidated, so this is an upper bound.
+        entries = await self.client.zcard(self.index_key)
+        with self._lock:
+            return replace(self._stats, entries=entries)
+
+    async def generation(self) -> int:
+        """Number of invalidations so far, to read before loading a result that will be cached."""
+        return int(await self.client.get(self.generation_key) or 0)
+
+    async def get(self, key: str, model: type[BaseModel]) -> list | None:
+        """Return the cached result of `key`, or None."""
+        payload = await self.client.get(self._entry_key(key))
+        with self._lock:
+            if payload is None:
+                self._stats.misses += 1
+                return None
+            self._stats.hits += 1
+        return _list_adapter(model).validate_json(payload)
+
+    async def set(self, key: str, result: list, model: type[BaseModel], window: Window, generation: int) -> None:
+        """Cache the result of `key`, see MemoryResultCache.set."""
+        window_start, window_end = window
+        await self._set_script(
+            keys=[self.generation_key, self._entry_key(key), self.index_key],
+            args=[
+                str(generation),
+                _list_adapter(model).dump_json(result),
+                max(1, int(self.ttl)),
+                _epoch(window_start),
+                f"{key}|{_epoch(window_end)}",
+            ],
+        )
+
+    def invalidate(self, start_time: datetime, end_time: datetime) -> None:
+        """Drop the results whose window overlaps [start_time, end_time], called by the ETL."""
+        # Bump the generation first, so results being read right now are not stored after the deletion.
+        self.sync_client.incr(self.generation_key)
+        members = self.sync_client.zrangebyscore(self.index_key, "-inf", _epoch(end_time))
+        stale_members = [member for member in members if float(member.rsplit(b"|", 1)[1]) >= _epoch(start_time)]
+        if stale_members:
+            pipeline = self.sync_client.pipeline()
+            pipeline.delete(*(self._entry_key(member.rsplit(b"|", 1)[0].decode()) for member in stale_members))
+            pipeline.zrem(self.index_key, *stale_members)
+            pipeline.execute()
+        with self._lock:
+            self._stats.invalidations += 1
+        self.logger.info(f"Invalidated {len(stale_members)} results between {start_time} and {end_time}")
+
+    async def close(self) -> None:
+        await self.client.aclose()
+        self.sync_client.close()
+
+
+ResultCache = MemoryResultCache | RedisResultCache
+
+
+def create_result_cache(url: str = Environment.RESULT_CACHE_URL) -> ResultCache:
+    """Create the Redis backend for a redis:// or rediss:// URL, the in-memory one otherwise."""
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisResultCache(url)
+    return MemoryResultCache()
@@ -0,0 +1,111 @@
+from fastapi import APIRouter, Query, Request
+
+from src.app.domains.earthquake_service import EarthquakeService
+from src.app.domains.search.schema import NearbyEarthquake, NearbySearchResponse
+from src.data_integration.geohash import MAX_DISTANCE_KM
+
+MAX_RESULTS = 10000
+
+search_router = APIRouter(prefix="/search", tags=["search"])
+
+
+@search_router.get("/radius", response_model=NearbySearchResponse)
+async def search_radius(
+    request: Request,
+    latitude: float = Query(ge=-90, le=90, description="Latitude of the center in degrees"),
+    longitude: float = Query(ge=-180, le=180, description="Longitude of the center in degrees"),
+    radius_km: float = Query(gt=0, le=MAX_DISTANCE_KM, description="Search radius in kilometers"),
+    start_time: str | None = Query(default=None, description="Start time in YYYY-MM-DD format"),
+    end_time: str | None = Query(default=None, description="End time in YYYY-MM-DD format"),
+    min_magnitude: float | None = Query(default=None, description="Minimum magnitude filter"),
+    max_magnitude: float | None = Query(default=None, description="Maximum magnitude filter"),
+    limit: int = Query(default=1000, ge=1, le=MAX_RESULTS, description="Maximum number of earthquakes"),
+):
+    """
+    Get the ingested earthquakes within a great-circle distance of a point, nearest first.
+
+    Args:
+        request: FastAPI request object
+        latitude: Latitude of the center in degrees
+        longitude: Longitude of the center in degrees
+        radius_km: Search radius in kilometers
+        start_time: Optional start date in YYYY-MM-DD format
+        end_time: Optional end date in YYYY-MM-DD format
+        min_magnitude: Optional minimum magnitude
+        max_magnitude: Optional maximum magnitude
+        limit: Maximum number of earthquakes to return
+
+    Returns:
+        JSON response with the earthquakes and their distance to the center
+    """
+    earthquake_service = EarthquakeService(request)
+    earthquakes = await earthquake_service.search_radius(
+        latitude=latitude,
+        longitude=longitude,
+        radius_km=radius_km,
+        response_model=NearbyEarthquake,
+        limit=limit,
+        start_time=start_time,
+        end_time=end_time,
+        min_magnitude=min_magnitude,
+        max_magnitude=max_magnitude,
+    )
+
+    return NearbySearchResponse(
+        earthquakes=earthquakes,
+        total_count=len(earthquakes),
+        center={"latitude": latitude, "longitude": longitude},
+        radius_km=radius_km,
+    )
+
+
+@search_router.get("/nearest", response_model=NearbySearchResponse)
+async def search_nearest(
+    request: Request,
+    latitude: float = Query(ge=-90, le=90, description="Latitude of the point in degrees"),
+    longitude: float = Query(ge=-180, le=180, description="Longitude of the point in degrees"),
+    k: int = Query(default=10, ge=1, le=MAX_RESULTS, description="Number of earthquakes to return"),
+    max_radius_km: float = Query(
+        default=MAX_DISTANCE_KM, gt=0, le=MAX_DISTANCE_KM, description="Ignore earthquakes further than this"
+    ),
+    start_time: str | None = Query(default=None, description="Start time in YYYY-MM-DD format"),
+    end_time: str | None = Query(default=None, description="End time in YYYY-MM-DD format"),
+    min_magnitude: float | None = Query(default=None, description="Minimum magnitude filter"),
+    max_magnitude: float | None = Query(default=None, description="Maximum magnitude filter"),
+):
+    """
+    Get the k ingested earthquakes nearest to a point, nearest first.
+
+    Args:
+        request: FastAPI request object
+        latitude: Latitude of the point in degrees
+        longitude: Longitude of the point in degrees
+        k: Number of earthquakes to return
+        max_radius_km: Distance in kilometers beyond which earthquakes are ignored
+        start_time: Optional start date in YYYY-MM-DD format
+        end_time: Optional end date in YYYY-MM-DD format
+        min_magnitude: Optional minimum magnitude
+        max_magnitude: Optional maximum magnitude
+
+    Returns:
+        JSON response with the earthquakes and their distance to the point
+    """
+    earthquake_service = EarthquakeService(request)
+    earthquakes = await earthquake_service.search_nearest(
+        latitude=latitude,
+        longitude=longitude,
+        k=k,
+        response_model=NearbyEarthquake,
+        max_radius_km=max_radius_km,
+        start_time=start_time,
+        end_time=end_time,
+        min_magnitude=min_magnitude,
+        max_magnitude=max_magnitude,
+    )
+
+    return NearbySearchResponse(
+        earthquakes=earthquakes,
+        total_count=len(earthquakes),
+        center={"latitude": latitude, "longitude": longitude},
+        radius_km=earthquakes[-1].distance_km if earthquakes else None,
+    )
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+from src.app.domains.visualization.schema import EarthquakeMapPoint
+
+
+class NearbyEarthquake(EarthquakeMapPoint):
+    """Pydantic model for an earthquake found by a spatial search"""
+
+    distance_km: float
+
+
+class NearbySearchResponse(BaseModel):
+    """Response model for spatial searches"""
+
+    earthquakes: list[NearbyEarthquake]
+    total_count: int
+    center: dict[str, float]
+    radius_km: float | None = None
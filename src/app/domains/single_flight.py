@@ -0,0 +1,77 @@
+"""
+Coalescing of concurrent identical calls within a worker: the first caller runs the call, the others await it.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, replace
+from typing import TypeVar
+
+from src.logger import Logger
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters of a SingleFlight since the application started."""
+
+    calls: int = 0
+    coalesced: int = 0
+    failed: int = 0
+    in_flight: int = 0
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time.
+
+    A caller finding a call in flight for its key awaits that call's result (or exception) instead of starting
+    its own. The call runs in its own task, so a caller disconnecting does not cancel it for the others.
+    """
+
+    logger = Logger(__name__)
+
+    def __init__(self, name: str):
+        """
+        Initialize the coalescer.
+
+        Args:
+            name: Name of the coalesced calls, used in logs
+        """
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self.counters = SingleFlightStats()
+
+    def stats(self) -> SingleFlightStats:
+        return replace(self.counters, in_flight=len(self._calls))
+
+    async def run(self, key: Hashable, function: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `function`, or await the call already in flight for `key`.
+
+        Args:
+            key: Normalized arguments of the call; calls with equal keys must have the same result
+            function: Coroutine function performing the call
+
+        Returns:
+            Result of the call
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.counters.coalesced += 1
+            self.logger.info(f"Joining the {self.name} in flight for {key}")
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(function())
+        self._calls[key] = task
+        self.counters.calls += 1
+
+        def done(finished: asyncio.Future) -> None:
+            del self._calls[key]
+            # Retrieve the exception, so it is not reported as unhandled when every caller went away.
+            if not finished.cancelled() and finished.exception() is not None:
+                self.counters.failed += 1
+
+        task.add_done_callback(done)
+        return await asyncio.shield(task)
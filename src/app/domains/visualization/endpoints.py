@@ -1,24 +1,72 @@
-from fastapi import APIRouter, Query, Request
+from typing import Any, Literal
+
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response, status
 from fastapi.responses import HTMLResponse
 
+from src.app.config.params import parse_bbox, validate_date_format
 from src.app.domains.earthquake_service import EarthquakeService
-from src.app.domains.visualization.schema import EarthquakeMapPoint, EarthquakeMapResponse
+from src.app.domains.formats import MSGPACK_MEDIA_TYPE, encode_columns, negotiate_format, to_msgpack
+from src.app.domains.http_cache import cache_headers, not_modified
+from src.app.domains.visualization import mvt
+from src.app.domains.visualization.schema import EarthquakeCluster, EarthquakeMapPoint, EarthquakeMapResponse
+from src.app.domains.visualization.tile_cache import TileKey
+
+MAX_ZOOM = 22
+# Below this zoom level the map receives clusters instead of individual earthquakes.
+POINTS_MIN_ZOOM = 9
+TILE_PIXELS = 256
+# Side of a cluster cell on screen, in pixels.
+CLUSTER_CELL_PIXELS = 64
+# Vector tiles are rendered client-side, so their clusters can be smaller: at most 16x16 per tile.
+TILE_CLUSTER_CELL_PIXELS = 16
+# Margin around point tiles, as a fraction of the tile size.
+TILE_BUFFER = 1 / 16
+TILE_LAYER = "earthquakes"
 
 visualization_router = APIRouter(prefix="/visualization", tags=["visualization"])
 
 
-@visualization_router.get("/map", response_model=EarthquakeMapResponse)
-def get_earthquake_map_data(
+def map_response(content: EarthquakeMapResponse, output_format: str, headers: dict[str, str]) -> Response:
+    """Encode a map response in the negotiated format, with the point lists as columns in MessagePack."""
+    if output_format != "msgpack":
+        return Response(content.model_dump_json(), media_type="application/json", headers=headers)
+    document = content.model_dump(exclude={"earthquakes", "clusters"}) | {
+        "earthquakes": encode_columns(content.earthquakes, EarthquakeMapPoint),
+        "clusters": encode_columns(content.clusters, EarthquakeCluster),
+    }
+    return Response(to_msgpack(document), media_type=MSGPACK_MEDIA_TYPE, headers=headers)
+
+
+@visualization_router.get(
+    "/map", response_model=EarthquakeMapResponse, responses={200: {"content": {MSGPACK_MEDIA_TYPE: {}}}}
+)
+async def get_earthquake_map_data(
     request: Request,
     start_time: str = Query(description="Start time in YYYY-MM-DD format"),
     end_time: str = Query(description="End time in YYYY-MM-DD format"),
     min_magnitude: float = Query(default=0.0, description="Minimum magnitude filter"),
     max_magnitude: float = Query(default=10.0, description="Maximum magnitude filter"),
     fetch_new_data: bool = Query(default=True, description="Whether to fetch new data from USGS API"),
+    zoom: int | None = Query(
+        default=None, ge=0, le=MAX_ZOOM, description="Map zoom level, earthquakes are clustered below zoom 9"
+    ),
+    bbox: str | None = Query(default=None, description="Visible area as west,south,east,north in degrees"),
+    output_format: Literal["json", "msgpack"] | None = Query(
+        default=None,
+        alias="format",
+        description="Response body format: JSON or MessagePack columns (default: from the Accept header, else JSON)",
+    ),
 ):
     """
     Get earthquake data optimized for map visualization.
 
+    With a zoom level below POINTS_MIN_ZOOM, earthquakes are aggregated by the database into clusters of
+    CLUSTER_CELL_PIXELS square pixels on screen, so the response size depends on the visible area and not on
+    the number of earthquakes in the date range.
+
+    Responses carry an ETag derived from the version of the date range, so a request with a matching
+    `If-None-Match` header is answered with 304 Not Modified before any earthquake is loaded.
+
     Args:
         request: FastAPI request object
         start_time: Start date in YYYY-MM-DD format
@@ -26,35 +74,166 @@ def get_earthquake_map_data(
         min_magnitude: Minimum magnitude to include
         max_magnitude: Maximum magnitude to include
         fetch_new_data: Whether to fetch new data from USGS API or use existing database data
+        zoom: Map zoom level; clusters are returned below POINTS_MIN_ZOOM, every point without a zoom level
+        bbox: Only include earthquakes in this west,south,east,north bounding box
+        output_format: Response body format, "json" or "msgpack"
 
     Returns:
-        JSON response with earthquake data optimized for mapping
+        JSON (or MessagePack) response with earthquake data optimized for mapping
     """
+    output_format = negotiate_format(request, output_format, ["json", "msgpack"])
+    ranges: dict[str, tuple[Any, Any]] = {"mag": (min_magnitude, max_magnitude)}
+    if bbox:
+        west, south, east, north = parse_bbox(bbox)
+        ranges["latitude"] = (south, north)
+        # A box crossing the antimeridian is only filtered by latitude.
+        if west <= east:
+            ranges["longitude"] = (west, east)
+
     earthquake_service = EarthquakeService(request)
-    map_points = earthquake_service.get_earthquake_data(
-        start_time=start_time, end_time=end_time, response_model=EarthquakeMapPoint, fetch_new_data=fetch_new_data
-    )
+    version = await earthquake_service.get_data_version(start_time, end_time, fetch_new_data)
+    headers = cache_headers(request, version, output_format, end_time)
+    not_modified_response = not_modified(request, headers)
+    if not_modified_response is not None:
+        return not_modified_response
 
-    filtered_map_points = [
-        point
-        for point in map_points
-        if (
-            point.latitude is not None
-            and point.longitude is not None
-            and point.mag is not None
-            and min_magnitude <= point.mag <= max_magnitude
+    if zoom is not None and zoom < POINTS_MIN_ZOOM:
+        clusters = await earthquake_service.get_earthquake_clusters(
+            start_time=start_time,
+            end_time=end_time,
+            response_model=EarthquakeCluster,
+            cells=2**zoom * TILE_PIXELS // CLUSTER_CELL_PIXELS,
+            fetch_new_data=False,
+            ranges=ranges,
+        )
+        return map_response(
+            EarthquakeMapResponse(
+                earthquakes=[],
+                clusters=clusters,
+                total_count=sum(cluster.count for cluster in clusters),
+                date_range={"start": start_time, "end": end_time},
+                zoom=zoom,
+            ),
+            output_format,
+            headers,
         )
-    ]
 
-    return EarthquakeMapResponse(
-        earthquakes=filtered_map_points,
-        total_count=len(filtered_map_points),
-        date_range={"start": start_time, "end": end_time},
+    # Only the map columns of the features with coordinates and a magnitude in range leave the database.
+    filtered_map_points = await earthquake_service.get_earthquake_data(
+        start_time=start_time,
+        end_time=end_time,
+        response_model=EarthquakeMapPoint,
+        fetch_new_data=False,
+        ranges=ranges,
+        not_null=["latitude", "longitude"],
     )
 
+    return map_response(
+        EarthquakeMapResponse(
+            earthquakes=filtered_map_points,
+            total_count=len(filtered_map_points),
+            date_range={"start": start_time, "end": end_time},
+            zoom=zoom,
+        ),
+        output_format,
+        headers,
+    )
+
+
+@visualization_router.get("/tiles/{z}/{x}/{y}.mvt", response_class=Response)
+async def get_earthquake_tile(
+    request: Request,
+    z: int = Path(ge=0, le=MAX_ZOOM, description="Zoom level"),
+    x: int = Path(ge=0, description="Tile column"),
+    y: int = Path(ge=0, description="Tile row, counted from the north"),
+    start_time: str = Query(description="Start time in YYYY-MM-DD format"),
+    end_time: str = Query(description="End time in YYYY-MM-DD format"),
+    min_magnitude: float = Query(default=0.0, description="Minimum magnitude filter"),
+    max_magnitude: float = Query(default=10.0, description="Maximum magnitude filter"),
+    fetch_new_data: bool = Query(default=False, description="Whether to fetch new data from USGS API"),
+):
+    """
+    Get the earthquakes of a map tile as a Mapbox Vector Tile with a single `earthquakes` point layer.
+
+    Below POINTS_MIN_ZOOM the points are clusters with `count` and `max_mag` properties, otherwise they are
+    earthquakes with the properties of the map points. Tiles are served from the tile cache, which drops the
+    tiles of a date range whenever the ETL writes features in it.
+
+    Args:
+        request: FastAPI request object
+        z: Zoom level
+        x: Tile column
+        y: Tile row, counted from the north
+        start_time: Start date in YYYY-MM-DD format
+        end_time: End date in YYYY-MM-DD format
+        min_magnitude: Minimum magnitude to include
+        max_magnitude: Maximum magnitude to include
+        fetch_new_data: Whether to fetch new data from USGS API before rendering the tile
+
+    Returns:
+        Protobuf-encoded vector tile
+    """
+    if x >= 2**z or y >= 2**z:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tile not found")
+    validate_date_format(start_time, end_time)
+
+    earthquake_service = EarthquakeService(request)
+    await earthquake_service.refresh_data(start_time, end_time, fetch_new_data)
+
+    tile_cache = request.app.state.tile_cache
+    key = TileKey(z, x, y, start_time, end_time, min_magnitude, max_magnitude)
+    tile = await tile_cache.get(key)
+    if tile is not None:
+        return Response(content=tile, media_type=mvt.MEDIA_TYPE, headers={"X-Cache": "HIT"})
+
+    generation = await tile_cache.generation()
+    if z < POINTS_MIN_ZOOM:
+        # Cluster cells are aligned on the tile edges, so every cluster belongs to a single tile.
+        west, south, east, north = mvt.tile_bounds(z, x, y)
+        clusters = await earthquake_service.get_earthquake_clusters(
+            start_time=start_time,
+            end_time=end_time,
+            response_model=EarthquakeCluster,
+            cells=2**z * TILE_PIXELS // TILE_CLUSTER_CELL_PIXELS,
+            fetch_new_data=False,
+            ranges={"mag": (min_magnitude, max_magnitude), "latitude": (south, north), "longitude": (west, east)},
+            # Rendered tiles have their own cache, the rows of a single tile are not worth keeping.
+            use_cache=False,
+        )
+        # Earthquakes on a tile edge are also selected by the tile west or north of theirs, drop them there.
+        points = [
+            (cluster.longitude, cluster.latitude, {"count": cluster.count, "max_mag": cluster.max_mag})
+            for cluster in clusters
+            if mvt.contains(z, x, y, cluster.longitude, cluster.latitude)
+        ]
+    else:
+        # Markers crossing a tile edge are drawn by both tiles.
+        west, south, east, north = mvt.tile_bounds(z, x, y, buffer=TILE_BUFFER)
+        earthquakes = await earthquake_service.get_earthquake_data(
+            start_time=start_time,
+            end_time=end_time,
+            response_model=EarthquakeMapPoint,
+            fetch_new_data=False,
+            ranges={"mag": (min_magnitude, max_magnitude), "latitude": (south, north), "longitude": (west, east)},
+            not_null=["latitude", "longitude"],
+            use_cache=False,
+        )
+        points = [
+            (
+                earthquake.longitude,
+                earthquake.latitude,
+                earthquake.model_dump(mode="json", exclude={"id", "latitude", "longitude"}),
+            )
+            for earthquake in earthquakes
+        ]
+
+    tile = mvt.encode_tile(TILE_LAYER, points, z, x, y)
+    await tile_cache.set(key, tile, generation)
+    return Response(content=tile, media_type=mvt.MEDIA_TYPE, headers={"X-Cache": "MISS"})
+
 
 @visualization_router.get("/map-view", response_class=HTMLResponse)
-def get_earthquake_map_view(request: Request):
+async def get_earthquake_map_view(request: Request):
     """
     Serve the interactive earthquake map visualization page.
 
@@ -188,6 +367,14 @@ def get_earthquake_map_view(request: Request):
                 border-left: 4px solid #c62828;
             }
             
+            .cluster-label {
+                background: transparent;
+                border: none;
+                box-shadow: none;
+                font-weight: bold;
+                color: #222;
+            }
+
             .legend {
                 background: white;
                 padding: 1rem;
@@ -259,6 +446,14 @@ def get_earthquake_map_view(request: Request):
                 </select>
             </div>
             
+            <div class="control-group">
+                <label for="displayMode">Display</label>
+                <select id="displayMode">
+                    <option value="json">Clusters (JSON)</option>
+                    <option value="tiles">Vector Tiles</option>
+                </select>
+            </div>
+
             <button class="btn" onclick="loadEarthquakeData()">Load Earthquakes</button>
         </div>
         
@@ -308,9 +503,12 @@ def get_earthquake_map_view(request: Request):
         <div id="map"></div>
         
         <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
+        <script src="https://unpkg.com/leaflet.vectorgrid@1.3.0/dist/Leaflet.VectorGrid.bundled.js"></script>
         <script>
             let map;
             let earthquakeMarkers = [];
+            let dataLoaded = false;
+            let tileLayer = null;
             
             // Initialize map
             function initMap() {
@@ -319,6 +517,14 @@ def get_earthquake_map_view(request: Request):
                 L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
                     attribution: '© OpenStreetMap contributors'
                 }).addTo(map);
+
+                // Reload the visible area from the database when the map is zoomed or panned
+                map.on('moveend', () => {
+                    // Vector tiles fetch the visible tiles by themselves
+                    if (dataLoaded && !tileLayer) {
+                        loadEarthquakeData('false');
+                    }
+                });
             }
             
             // Get color based on magnitude
@@ -343,15 +549,126 @@ def get_earthquake_map_view(request: Request):
             function clearMarkers() {
                 earthquakeMarkers.forEach(marker => map.removeLayer(marker));
                 earthquakeMarkers = [];
+                if (tileLayer) {
+                    map.removeLayer(tileLayer);
+                    tileLayer = null;
+                }
             }
             
-            // Load earthquake data
-            async function loadEarthquakeData() {
+            // Show the earthquakes as vector tiles, which the server caches per tile
+            function showTiles(query) {
+                tileLayer = L.vectorGrid.protobuf(`/visualization/tiles/{z}/{x}/{y}.mvt?${query}`, {
+                    interactive: true,
+                    maxNativeZoom: 22,
+                    vectorTileLayerStyles: {
+                        earthquakes: properties => properties.count > 1 ? {
+                            radius: getClusterSize(properties.count),
+                            fill: true,
+                            fillColor: getMagnitudeColor(properties.max_mag || 0),
+                            fillOpacity: 0.6,
+                            color: '#333',
+                            weight: 2
+                        } : {
+                            radius: getMarkerSize(properties.mag ?? properties.max_mag ?? 0),
+                            fill: true,
+                            fillColor: getMagnitudeColor(properties.mag ?? properties.max_mag ?? 0),
+                            fillOpacity: 0.7,
+                            color: '#333',
+                            weight: 1
+                        }
+                    }
+                });
+                tileLayer.on('click', event => {
+                    const properties = event.layer.properties;
+                    const content = properties.count > 1
+                        ? `<strong>${properties.count} earthquakes</strong><br>Max magnitude: ${properties.max_mag ?? 'N/A'}`
+                        : `<strong>${properties.place || 'Unknown Location'}</strong><br>Magnitude: ${properties.mag ?? properties.max_mag ?? 'N/A'}`
+                            + (properties.time ? `<br>Time: ${new Date(properties.time).toLocaleString()}` : '');
+                    L.popup().setLatLng(event.latlng).setContent(content).openOn(map);
+                });
+                tileLayer.addTo(map);
+            }
+
+            // Visible area as west,south,east,north, longitudes wrapped into [-180, 180]
+            function getBbox() {
+                const bounds = map.getBounds();
+                const wrap = lng => ((lng + 180) % 360 + 360) % 360 - 180;
+                let west = -180, east = 180;
+                if (bounds.getEast() - bounds.getWest() < 360) {
+                    west = wrap(bounds.getWest());
+                    east = wrap(bounds.getEast());
+                }
+                const south = Math.max(-90, bounds.getSouth());
+                const north = Math.min(90, bounds.getNorth());
+                return [west, south, east, north].map(value => value.toFixed(4)).join(',');
+            }
+
+            // Get cluster marker size based on the number of earthquakes
+            function getClusterSize(count) {
+                return Math.min(30, 8 + 3 * Math.log2(count));
+            }
+
+            function addPointMarker(earthquake) {
+                const color = getMagnitudeColor(earthquake.mag || 0);
+                const size = getMarkerSize(earthquake.mag || 0);
+
+                const marker = L.circleMarker([earthquake.latitude, earthquake.longitude], {
+                    radius: size,
+                    fillColor: color,
+                    color: '#333',
+                    weight: 1,
+                    opacity: 1,
+                    fillOpacity: 0.7
+                });
+
+                const popupContent = `
+                    <div style="min-width: 200px;">
+                        <h3 style="margin: 0 0 10px 0; color: #333;">${earthquake.place || 'Unknown Location'}</h3>
+                        <p style="margin: 5px 0;"><strong>Magnitude:</strong> ${earthquake.mag || 'N/A'}</p>
+                        <p style="margin: 5px 0;"><strong>Time:</strong> ${earthquake.time ? new Date(earthquake.time).toLocaleString() : 'N/A'}</p>
+                        <p style="margin: 5px 0;"><strong>Depth:</strong> ${earthquake.depth ? earthquake.depth + ' km' : 'N/A'}</p>
+                        <p style="margin: 5px 0;"><strong>Coordinates:</strong> ${earthquake.latitude.toFixed(4)}, ${earthquake.longitude.toFixed(4)}</p>
+                        ${earthquake.tsunami ? '<p style="margin: 5px 0; color: #F44336;"><strong>⚠️ Tsunami Alert</strong></p>' : ''}
+                        ${earthquake.alert ? `<p style="margin: 5px 0; color: #FF9800;"><strong>Alert:</strong> ${earthquake.alert}</p>` : ''}
+                    </div>
+                `;
+
+                marker.bindPopup(popupContent);
+                marker.addTo(map);
+                earthquakeMarkers.push(marker);
+            }
+
+            function addClusterMarker(cluster) {
+                if (cluster.count === 1) {
+                    addPointMarker({...cluster, mag: cluster.max_mag});
+                    return;
+                }
+                const marker = L.circleMarker([cluster.latitude, cluster.longitude], {
+                    radius: getClusterSize(cluster.count),
+                    fillColor: getMagnitudeColor(cluster.max_mag || 0),
+                    color: '#333',
+                    weight: 2,
+                    opacity: 1,
+                    fillOpacity: 0.6
+                });
+                marker.bindTooltip(String(cluster.count), {permanent: true, direction: 'center', className: 'cluster-label'});
+                marker.bindPopup(`<strong>${cluster.count} earthquakes</strong><br>Max magnitude: ${cluster.max_mag ?? 'N/A'}`);
+                // Zoom into the cluster on click
+                marker.on('click', () => map.setView(marker.getLatLng(), map.getZoom() + 2));
+                marker.addTo(map);
+                earthquakeMarkers.push(marker);
+            }
+
+            // Load earthquake data of the visible area, clustered by the server at low zoom levels
+            async function loadEarthquakeData(fetchNewData) {
                 const startDate = document.getElementById('startDate').value;
                 const endDate = document.getElementById('endDate').value;
                 const minMag = document.getElementById('minMag').value;
                 const maxMag = document.getElementById('maxMag').value;
-                const fetchNewData = document.getElementById('fetchNewData').value;
+                if (fetchNewData === undefined) {
+                    fetchNewData = document.getElementById('fetchNewData').value;
+                }
+                const useTiles = document.getElementById('displayMode').value === 'tiles';
                 
                 if (!startDate || !endDate) {
                     alert('Please select both start and end dates');
@@ -364,7 +681,10 @@ def get_earthquake_map_view(request: Request):
                 
                 let response;
                 try {
-                    response = await fetch(`/visualization/map?start_time=${startDate}&end_time=${endDate}&min_magnitude=${minMag}&max_magnitude=${maxMag}&fetch_new_data=${fetchNewData}`);
+                    const query = `start_time=${startDate}&end_time=${endDate}&min_magnitude=${minMag}&max_magnitude=${maxMag}`;
+                    // With vector tiles, a single world cluster request refreshes the range and gives the statistics
+                    const view = useTiles ? 'zoom=0' : `zoom=${map.getZoom()}&bbox=${getBbox()}`;
+                    response = await fetch(`/visualization/map?${query}&fetch_new_data=${fetchNewData}&${view}`);
                     
                     if (!response.ok) {
                         // Try to get error details from response
@@ -381,51 +701,22 @@ def get_earthquake_map_view(request: Request):
                     }
                     
                     const data = await response.json();
-                    console.log('Received earthquake data:', data);
-                    console.log('First few earthquakes:', data.earthquakes.slice(0, 3));
+                    console.log(`Received ${data.clusters.length} clusters and ${data.earthquakes.length} earthquakes`);
                     
                     // Clear existing markers
                     clearMarkers();
                     
                     // Add new markers
-                    data.earthquakes.forEach(earthquake => {
-                        const color = getMagnitudeColor(earthquake.mag || 0);
-                        const size = getMarkerSize(earthquake.mag || 0);
-                        
-                        const marker = L.circleMarker([earthquake.latitude, earthquake.longitude], {
-                            radius: size,
-                            fillColor: color,
-                            color: '#333',
-                            weight: 1,
-                            opacity: 1,
-                            fillOpacity: 0.7
-                        });
-                        
-                        const popupContent = `
-                            <div style="min-width: 200px;">
-                                <h3 style="margin: 0 0 10px 0; color: #333;">${earthquake.place || 'Unknown Location'}</h3>
-                                <p style="margin: 5px 0;"><strong>Magnitude:</strong> ${earthquake.mag || 'N/A'}</p>
-                                <p style="margin: 5px 0;"><strong>Time:</strong> ${earthquake.time ? new Date(earthquake.time).toLocaleString() : 'N/A'}</p>
-                                <p style="margin: 5px 0;"><strong>Depth:</strong> ${earthquake.depth ? earthquake.depth + ' km' : 'N/A'}</p>
-                                <p style="margin: 5px 0;"><strong>Coordinates:</strong> ${earthquake.latitude.toFixed(4)}, ${earthquake.longitude.toFixed(4)}</p>
-                                ${earthquake.tsunami ? '<p style="margin: 5px 0; color: #F44336;"><strong>⚠️ Tsunami Alert</strong></p>' : ''}
-                                ${earthquake.alert ? `<p style="margin: 5px 0; color: #FF9800;"><strong>Alert:</strong> ${earthquake.alert}</p>` : ''}
-                            </div>
-                        `;
-                        
-                        marker.bindPopup(popupContent);
-                        marker.addTo(map);
-                        earthquakeMarkers.push(marker);
-                    });
+                    if (useTiles) {
+                        showTiles(query);
+                    } else {
+                        data.clusters.forEach(addClusterMarker);
+                        data.earthquakes.forEach(addPointMarker);
+                    }
                     
                     // Update stats
                     updateStats(data);
-                    
-                    // Fit map to show all markers
-                    if (data.earthquakes.length > 0) {
-                        const group = new L.featureGroup(earthquakeMarkers);
-                        map.fitBounds(group.getBounds().pad(0.1));
-                    }
+                    dataLoaded = true;
                     
                 } catch (error) {
                     console.error('Error loading earthquake data:', error);
@@ -446,7 +737,7 @@ def get_earthquake_map_view(request: Request):
                 
                 totalCount.textContent = data.total_count;
                 
-                const maxMag = Math.max(...data.earthquakes.map(e => e.mag || 0));
+                const maxMag = Math.max(0, ...data.earthquakes.map(e => e.mag || 0), ...data.clusters.map(c => c.max_mag || 0));
                 maxMagnitude.textContent = maxMag.toFixed(1);
                 
                 dateRange.textContent = `${data.date_range.start} to ${data.date_range.end}`;
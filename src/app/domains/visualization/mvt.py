@@ -0,0 +1,144 @@
+"""
+Minimal Mapbox Vector Tile (MVT 2.1) encoder for point layers, and Web Mercator tile arithmetic.
+
+Only what the earthquake map needs is implemented: point geometries with scalar properties, encoded
+directly as protobuf without a schema compiler.
+"""
+
+import math
+import struct
+from collections.abc import Iterable
+from typing import Any
+
+MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+EXTENT = 4096
+MERCATOR_MAX_LATITUDE = 85.05112878
+
+_POINT = 1
+_MOVE_TO = 1
+
+
+def tile_bounds(z: int, x: int, y: int, buffer: float = 0.0) -> tuple[float, float, float, float]:
+    """
+    Compute the geographic bounds of a tile.
+
+    Args:
+        z: Zoom level
+        x: Tile column
+        y: Tile row, counted from the north
+        buffer: Margin added around the tile, as a fraction of its size
+
+    Returns:
+        (west, south, east, north) bounds in degrees; the top and bottom rows extend to the poles
+    """
+    tiles = 2**z
+
+    def latitude(row: float) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / tiles))))
+
+    west = max(-180.0, (x - buffer) / tiles * 360 - 180)
+    east = min(180.0, (x + 1 + buffer) / tiles * 360 - 180)
+    north = latitude(y - buffer) if y - buffer > 0 else 90.0
+    south = latitude(y + 1 + buffer) if y + 1 + buffer < tiles else -90.0
+    return west, south, east, north
+
+
+def contains(z: int, x: int, y: int, longitude: float, latitude: float) -> bool:
+    """Whether a coordinate falls in a tile, points on an edge belonging to the tile east or south of it."""
+    world_x, world_y = _project(z, longitude, latitude)
+    return math.floor(world_x) == x and math.floor(world_y) == y
+
+
+def _project(z: int, longitude: float, latitude: float) -> tuple[float, float]:
+    """Project a coordinate to Web Mercator, in tiles of zoom level `z` from the north-west corner."""
+    tiles = 2**z
+    phi = math.radians(max(-MERCATOR_MAX_LATITUDE, min(MERCATOR_MAX_LATITUDE, latitude)))
+    world_x = (longitude + 180) / 360 * tiles
+    world_y = (1 - math.log(math.tan(phi) + 1 / math.cos(phi)) / math.pi) / 2 * tiles
+    return world_x, world_y
+
+
+def _varint(value: int) -> bytes:
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _bytes_field(number: int, payload: bytes) -> bytes:
+    return _varint(number << 3 | 2) + _varint(len(payload)) + payload
+
+
+def _uint_field(number: int, value: int) -> bytes:
+    return _varint(number << 3) + _varint(value)
+
+
+def _packed_field(number: int, values: Iterable[int]) -> bytes:
+    return _bytes_field(number, b"".join(_varint(value) for value in values))
+
+
+def _value(value: Any) -> bytes:
+    """Encode a property value as a Tile.Value message."""
+    if isinstance(value, bool):
+        return _uint_field(7, int(value))
+    if isinstance(value, int):
+        return _uint_field(5, value) if value >= 0 else _uint_field(6, _zigzag(value))
+    if isinstance(value, float):
+        return _varint(3 << 3 | 1) + struct.pack("<d", value)
+    return _bytes_field(1, str(value).encode())
+
+
+def encode_tile(
+    layer: str,
+    points: Iterable[tuple[float, float, dict[str, Any]]],
+    z: int,
+    x: int,
+    y: int,
+    extent: int = EXTENT,
+) -> bytes:
+    """
+    Encode points as a vector tile with a single layer.
+
+    Args:
+        layer: Name of the layer
+        points: (longitude, latitude, properties) of each point; None properties are omitted
+        z: Zoom level of the tile
+        x: Column of the tile
+        y: Row of the tile
+        extent: Size of the tile grid
+
+    Returns:
+        Protobuf-encoded tile
+    """
+    keys: dict[str, int] = {}
+    values: dict[tuple[type, Any], int] = {}
+    features = []
+    for longitude, latitude, properties in points:
+        tags = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            tags.append(keys.setdefault(key, len(keys)))
+            # Keyed by type as well, so that 1, 1.0 and True stay distinct values.
+            tags.append(values.setdefault((type(value), value), len(values)))
+
+        world_x, world_y = _project(z, longitude, latitude)
+        point_x, point_y = round((world_x - x) * extent), round((world_y - y) * extent)
+        geometry = [_MOVE_TO | 1 << 3, _zigzag(point_x), _zigzag(point_y)]
+        features.append(_packed_field(2, tags) + _uint_field(3, _POINT) + _packed_field(4, geometry))
+
+    encoded_layer = (
+        _uint_field(15, 2)
+        + _bytes_field(1, layer.encode())
+        + b"".join(_bytes_field(2, feature) for feature in features)
+        + b"".join(_bytes_field(3, key.encode()) for key in keys)
+        + b"".join(_bytes_field(4, _value(value)) for _, value in values)
+        + _uint_field(5, extent)
+    )
+    return _bytes_field(3, encoded_layer)
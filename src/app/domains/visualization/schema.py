@@ -22,9 +22,23 @@ class EarthquakeMapPoint(BaseModel):
         from_attributes = True
 
 
+class EarthquakeCluster(BaseModel):
+    """Pydantic model for the earthquakes of one map grid cell"""
+
+    latitude: float
+    longitude: float
+    count: int
+    max_mag: float | None = None
+
+    class Config:
+        from_attributes = True
+
+
 class EarthquakeMapResponse(BaseModel):
     """Response model for earthquake map data"""
 
     earthquakes: list[EarthquakeMapPoint]
+    clusters: list[EarthquakeCluster] = []
     total_count: int
     date_range: dict[str, str]
+    zoom: int | None = None
@@ -0,0 +1,256 @@
+"""
+Two-level cache of encoded map tiles: an in-memory LRU in front of a directory on disk.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+
+from starlette.concurrency import run_in_threadpool
+
+from src.app.config import Environment
+from src.logger import Logger
+
+
+@dataclass(frozen=True)
+class TileKey:
+    """Parameters a tile is rendered from."""
+
+    z: int
+    x: int
+    y: int
+    start_time: str
+    end_time: str
+    min_magnitude: float
+    max_magnitude: float
+
+    @property
+    def date_range(self) -> tuple[datetime, datetime]:
+        return datetime.strptime(self.start_time, "%Y-%m-%d"), datetime.strptime(self.end_time, "%Y-%m-%d")
+
+    @property
+    def range_directory(self) -> str:
+        """Directory of the tiles of the date range, removed at once when the range is invalidated."""
+        return f"{self.start_time}_{self.end_time}"
+
+    @property
+    def relative_path(self) -> Path:
+        return (
+            Path(self.range_directory)
+            / f"{self.min_magnitude}_{self.max_magnitude}"
+            / str(self.z)
+            / str(self.x)
+            / f"{self.y}.mvt"
+        )
+
+
+@dataclass
+class TileCacheStats:
+    """Counters of a TileCache since it was created."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    entries: int = 0
+
+
+class TileCache:
+    """
+    Cache of encoded tiles keyed by TileKey.
+
+    Tiles are looked up in memory first, then on disk, where they survive restarts and are shared by the
+    workers of the host and by the processes ingesting outside the API. `invalidate` drops every tile whose
+    date range overlaps an ingested time span, from memory and disk, and bumps an epoch file on disk so tiles
+    rendered from data read before it, in any process, are not written. Memory entries expire after `ttl`
+    seconds and disk entries after `disk_ttl` seconds, which bounds staleness when an invalidation is missed.
+    """
+
+    logger = Logger(__name__)
+    EPOCH_FILE = ".epoch"
+
+    def __init__(
+        self,
+        max_entries: int = Environment.TILE_CACHE_MAX_ENTRIES,
+        ttl: float = Environment.TILE_CACHE_TTL,
+        directory: str | None = Environment.TILE_CACHE_DIR or None,
+        disk_ttl: float = Environment.TILE_CACHE_DISK_TTL,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of tiles kept in memory, the least recently used are evicted first
+            ttl: Seconds a tile is served from memory
+            directory: Directory of the disk cache, None to keep tiles in memory only
+            disk_ttl: Seconds a tile is served from disk after it was written
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = Path(directory) if directory else None
+        self.disk_ttl = disk_ttl
+        # Tiles with the monotonic time they expire at.
+        self._entries: OrderedDict[TileKey, tuple[float, bytes]] = OrderedDict()
+        # The ETL invalidates from worker threads while requests read on the event loop.
+        self._lock = Lock()
+        self._stats = TileCacheStats()
+        # Incremented by every invalidation of this process, so tiles rendered from data read before it are not
+        # cached; the epoch file plays the same role for the invalidations of the other processes.
+        self._generation = 0
+
+    def stats(self) -> TileCacheStats:
+        with self._lock:
+            return replace(self._stats, entries=len(self._entries))
+
+    async def generation(self) -> tuple[int, str]:
+        """Return the current generation, to pass to `set` with a tile rendered from data read after this call."""
+        epoch = await run_in_threadpool(self._read_epoch) if self.directory else ""
+        with self._lock:
+            return self._generation, epoch
+
+    async def get(self, key: TileKey) -> bytes | None:
+        """Return the cached tile of `key`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                self._entries.move_to_end(key)
+                self._stats.memory_hits += 1
+                return entry[1]
+
+        cached = await run_in_threadpool(self._read, key) if self.directory else None
+        with self._lock:
+            if cached is None:
+                self._stats.misses += 1
+                return None
+            self._stats.disk_hits += 1
+        tile, age = cached
+        # A tile read from disk is not kept in memory longer than it may still be served from disk.
+        self._remember(key, tile, ttl=min(self.ttl, self.disk_ttl - age))
+        return tile
+
+    async def set(self, key: TileKey, tile: bytes, generation: tuple[int, str]) -> None:
+        """
+        Cache the tile of `key` in memory and on disk.
+
+        Args:
+            key: Parameters of the tile
+            tile: Encoded tile
+            generation: Value of `generation()` before the data of the tile was read; the tile is not cached
+                if an invalidation happened since
+        """
+        memory_generation, epoch = generation
+        if self.directory and not await run_in_threadpool(self._write, key, tile, epoch):
+            return
+        self._remember(key, tile, generation=memory_generation)
+
+    def invalidate(self, start_time: datetime, end_time: datetime) -> None:
+        """
+        Drop the tiles of every date range overlapping [start_time, end_time].
+
+        Args:
+            start_time: Start of the time span whose features changed (inclusive)
+            end_time: End of the time span whose features changed (inclusive)
+        """
+
+        def overlaps(range_start: datetime, range_end: datetime) -> bool:
+            return range_start <= end_time and start_time <= range_end
+
+        with self._lock:
+            stale_keys = [key for key in self._entries if overlaps(*key.date_range)]
+            for key in stale_keys:
+                del self._entries[key]
+            self._stats.invalidations += 1
+            self._generation += 1
+
+        removed_directories = 0
+        if self.directory:
+            # Bump the epoch first, so tiles being rendered right now are not written after the removal.
+            self._bump_epoch()
+            for range_directory in self.directory.iterdir():
+                try:
+                    range_start, range_end = (datetime.strptime(d, "%Y-%m-%d") for d in range_directory.name.split("_"))
+                except ValueError:
+                    continue
+                if overlaps(range_start, range_end):
+                    shutil.rmtree(range_directory, ignore_errors=True)
+                    removed_directories += 1
+
+        self.logger.info(
+            f"Invalidated tiles between {start_time} and {end_time}: {len(stale_keys)} in memory, "
+            f"{removed_directories} date ranges on disk"
+        )
+
+    def _remember(self, key: TileKey, tile: bytes, generation: int | None = None, ttl: float | None = None) -> bool:
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            ttl = min(self.ttl, self.disk_ttl) if ttl is None else ttl
+            self._entries[key] = (time.monotonic() + ttl, tile)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def _read(self, key: TileKey) -> tuple[bytes, float] | None:
+        """Return the tile of `key` on disk with its age in seconds, or None if it is missing or expired."""
+        path = self.directory / key.relative_path  # type: ignore
+        try:
+            age = time.time() - path.stat().st_mtime
+            if age >= self.disk_ttl:
+                return None
+            return path.read_bytes(), age
+        except FileNotFoundError:
+            return None
+
+    def _read_epoch(self) -> str:
+        try:
+            return (self.directory / self.EPOCH_FILE).read_text()  # type: ignore
+        except FileNotFoundError:
+            return ""
+
+    def _bump_epoch(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)  # type: ignore
+        self._replace(self.directory / self.EPOCH_FILE, uuid.uuid4().hex.encode())  # type: ignore
+
+    def _write(self, key: TileKey, tile: bytes, epoch: str) -> bool:
+        """Write the tile of `key` to disk, returning False if an invalidation happened since `epoch`."""
+        path = self.directory / key.relative_path  # type: ignore
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            return self._replace(path, tile, epoch)
+        except OSError as e:
+            # A concurrent invalidation may remove the directory while the tile is written.
+            self.logger.warning(f"Could not write tile {key} to the disk cache: {e}")
+            return False
+
+    def _replace(self, path: Path, content: bytes, epoch: str | None = None) -> bool:
+        """
+        Atomically replace the content of `path`.
+
+        Args:
+            path: File to write
+            content: New content
+            epoch: Epoch the content was read at, the file is left unchanged if an invalidation happened since
+
+        Returns:
+            Whether the file was replaced
+        """
+        # Write to a temporary file first, so concurrent readers never see a partial file.
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(content)
+            if epoch is not None and epoch != self._read_epoch():
+                return False
+            os.replace(temporary_path, path)
+            return True
+        finally:
+            if os.path.exists(temporary_path):
+                os.unlink(temporary_path)
@@ -1,20 +1,85 @@
+from contextlib import asynccontextmanager
+
+from anyio.from_thread import BlockingPortal
 from fastapi import FastAPI, responses
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.api.clients import AsyncUSGSEarthquakeClient
+from src.api.sync_facade import SyncClientFacade
+from src.app.config import Environment
+from src.app.database.config import async_engine
 from src.app.domains.features.endpoints import features_router
+from src.app.domains.jobs.endpoints import jobs_router
+from src.app.domains.metrics.endpoints import metrics_router
+from src.app.domains.result_cache import create_result_cache
+from src.app.domains.search.endpoints import search_router
+from src.app.domains.single_flight import SingleFlight
 from src.app.domains.visualization.endpoints import visualization_router
+from src.app.domains.visualization.tile_cache import TileCache
 from src.app.middlewares.authentication import AuthenticationMiddleware
 from src.app.middlewares.database_session import DatabaseSessionMiddleware
 from src.app.middlewares.execution_logs import ExecutionLogsMiddleware
+from src.app.middlewares.execution_logs_writer import ExecutionLogsWriter
+from src.data_integration.invalidation import ingestion_invalidations
+from src.data_integration.jobs import IngestJobRunner
+from src.data_integration.poller import EarthquakeUSGSPoller
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Own the pooled USGS client and its fetch coalescer, the execution logs writer, the tile and result caches and
+    the async database pool for the application lifetime, along with the ingestion job runner and the USGS poller
+    when it is enabled.
+    """
+    async with (
+        AsyncUSGSEarthquakeClient(
+            max_connections=Environment.USGS_MAX_CONNECTIONS, http2=Environment.USGS_HTTP2
+        ) as client,
+        BlockingPortal() as portal,
+    ):
+        # Endpoints run the ETL in worker threads, which reach the client through the portal of this event loop.
+        app.state.usgs_client = SyncClientFacade(client, portal)
+        app.state.usgs_fetches = SingleFlight("USGS fetch")
+        app.state.execution_logs_writer = ExecutionLogsWriter()
+        await app.state.execution_logs_writer.start()
+        # Tiles of the time spans the ETL writes to are dropped as soon as the features are upserted.
+        app.state.tile_cache = TileCache()
+        ingestion_invalidations.subscribe(app.state.tile_cache.invalidate)
+        app.state.result_cache = create_result_cache()
+        ingestion_invalidations.subscribe(app.state.result_cache.invalidate)
+        # Chunks of the ingestion jobs left pending by a previous run are resumed.
+        app.state.ingest_jobs = IngestJobRunner(client=app.state.usgs_client)
+        await app.state.ingest_jobs.start()
+        app.state.usgs_poller = None
+        if Environment.USGS_POLL_INTERVAL > 0:
+            app.state.usgs_poller = EarthquakeUSGSPoller(client=app.state.usgs_client)
+            await app.state.usgs_poller.start()
+        try:
+            yield
+        finally:
+            if app.state.usgs_poller is not None:
+                await app.state.usgs_poller.stop()
+            await app.state.ingest_jobs.stop()
+            ingestion_invalidations.unsubscribe(app.state.result_cache.invalidate)
+            await app.state.result_cache.close()
+            ingestion_invalidations.unsubscribe(app.state.tile_cache.invalidate)
+            await app.state.execution_logs_writer.stop()
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title="Earthquake API ETL Service",
+    lifespan=lifespan,
     redoc_url="/redoc",
     docs_url="/docs",
 )
 
 app.include_router(features_router)
 app.include_router(visualization_router)
+app.include_router(search_router)
+app.include_router(metrics_router)
+app.include_router(jobs_router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -1,15 +1,15 @@
 import base64
 
 from fastapi import status
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from fastapi.responses import JSONResponse
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from src.app.config.config import Environment
 from src.app.middlewares.constants import ENDPOINTS_TO_BYPASS
 
 
-class AuthenticationMiddleware(BaseHTTPMiddleware):
+class AuthenticationMiddleware:
     """
     Basic Authentication middleware for API routes.
 
@@ -18,44 +18,52 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
     environment variables.
     """
 
-    def __init__(self, app, realm: str | None = None):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, realm: str | None = None):
+        self.app = app
         self.realm = realm or Environment.API_REALM
         self.username = Environment.API_USERNAME
         self.password = Environment.API_PASSWORD
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = HTTPConnection(scope)
         if request.url.path in ENDPOINTS_TO_BYPASS:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         auth_header = request.headers.get("Authorization")
 
         if not auth_header:
-            return self._create_unauthorized_response("Missing Authorization header")
+            await self._create_unauthorized_response("Missing Authorization header")(scope, receive, send)
+            return
 
         if not auth_header.startswith("Basic "):
-            return self._create_unauthorized_response("Invalid authorization scheme")
+            await self._create_unauthorized_response("Invalid authorization scheme")(scope, receive, send)
+            return
 
         try:
             encoded_credentials = auth_header[6:]
             decoded_credentials = base64.b64decode(encoded_credentials).decode("utf-8")
             username, password = decoded_credentials.split(":", 1)
         except (ValueError, UnicodeDecodeError):
-            return self._create_unauthorized_response("Invalid authorization header format")
+            await self._create_unauthorized_response("Invalid authorization header format")(scope, receive, send)
+            return
 
         if username != self.username or password != self.password:
-            return self._create_unauthorized_response("Invalid credentials")
+            await self._create_unauthorized_response("Invalid credentials")(scope, receive, send)
+            return
 
         request.state.authenticated_user = username
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
-    def _create_unauthorized_response(self, detail: str) -> Response:
+    def _create_unauthorized_response(self, detail: str) -> JSONResponse:
         """
         Create a 401 Unauthorized response with WWW-Authenticate header.
         """
-        from fastapi.responses import JSONResponse
-
         response = JSONResponse(status_code=status.HTTP_401_UNAUTHORIZED, content={"detail": detail})
         response.headers["WWW-Authenticate"] = f'Basic realm="{self.realm}"'
         return response
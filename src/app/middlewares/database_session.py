@@ -1,21 +1,43 @@
-from fastapi import status
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from src.app.database.config import SessionLocal
-from src.app.middlewares.constants import ENDPOINTS_TO_BYPASS
+from src.app.database.config import AsyncSessionLocal
 
 
-class DatabaseSessionMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        if request.url.path in ENDPOINTS_TO_BYPASS:
-            return await call_next(request)
+def get_db_session(request: HTTPConnection) -> AsyncSession:
+    """
+    Return the database session of the request, creating it the first time it is needed.
+
+    Usable directly or as a FastAPI dependency (`Depends(get_db_session)`). The session is stored in
+    `request.state.db_session` and closed by DatabaseSessionMiddleware once the request is done; like any
+    AsyncSession, it only checks a connection out of the pool when its first statement is executed.
+    """
+    session = getattr(request.state, "db_session", None)
+    if session is None:
+        session = AsyncSessionLocal()
+        request.state.db_session = session
+    return session
+
+
+class DatabaseSessionMiddleware:
+    """
+    Close the database session of a request at its end, if a handler or middleware opened one.
+
+    Requests that never query (documentation, the static map page) neither create a session nor touch the pool.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        response = Response("Internal server error", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
         try:
-            request.state.db_session = SessionLocal()
-            response = await call_next(request)
+            await self.app(scope, receive, send)
         finally:
-            request.state.db_session.close()
-        return response
+            session = scope.get("state", {}).get("db_session")
+            if session is not None:
+                await session.close()
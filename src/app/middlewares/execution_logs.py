@@ -1,38 +1,46 @@
 import time
+from datetime import datetime
 
-from sqlalchemy.orm import Session
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from src.app.database.models import ExecutionLogs
 from src.app.middlewares.constants import ENDPOINTS_TO_BYPASS
-from src.app.repositories.database_repository import DatabaseRepository
-from src.logger import Logger
+from src.app.middlewares.execution_logs_writer import ExecutionLogsWriter
 
 
-class ExecutionLogsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        logger = Logger(__name__)
+class ExecutionLogsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = HTTPConnection(scope)
         start_time = time.time()
         request.state.metadata_id = None
-        response: Response = await call_next(request)
-        execution_time = time.time() - start_time
-        if request.url.path not in ENDPOINTS_TO_BYPASS:
-            db: Session = request.state.db_session
-            data = ExecutionLogs(
-                endpoint_name=request.url.path,
-                execution_time=round(execution_time, 2),
-                status_code=int(response.status_code),
-                parameters=dict(request.query_params),
-                metadata_id=request.state.metadata_id,
-            )
+        response_start: dict = {}
 
-            repository = DatabaseRepository(model=ExecutionLogs, session=db)
-            try:
-                repository.create(data)
-            except Exception as e:
-                logger.error(f"Failed to log execution data: {e}")
-                raise e
+        async def send_wrapper(message: Message) -> None:
+            # The execution time is measured up to the response headers, the body may still be streaming.
+            if message["type"] == "http.response.start":
+                response_start["status_code"] = message["status"]
+                response_start["execution_time"] = time.time() - start_time
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_wrapper)
+
+        if request.url.path not in ENDPOINTS_TO_BYPASS and response_start:
+            # Written in batches by the application-wide writer, off the request path.
+            writer: ExecutionLogsWriter = scope["app"].state.execution_logs_writer
+            writer.submit(
+                {
+                    "endpoint_name": request.url.path,
+                    "execution_time": round(response_start["execution_time"], 2),
+                    "status_code": int(response_start["status_code"]),
+                    "parameters": dict(request.query_params),
+                    "metadata_id": request.state.metadata_id,
+                    "created_at": datetime.now(),
+                }
+            )
@@ -0,0 +1,129 @@
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from src.app.config import Environment
+from src.app.database.config import AsyncSessionLocal
+from src.app.database.models import ExecutionLogs
+from src.app.repositories.async_database_repository import AsyncDatabaseRepository
+from src.logger import Logger
+
+
+@dataclass
+class ExecutionLogsWriterStats:
+    """Counters of the execution logs writer since the application started."""
+
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    failed: int = 0
+    flushes: int = 0
+    queued: int = 0
+
+
+class ExecutionLogsWriter:
+    """
+    Buffered writer of execution logs.
+
+    Requests only push their log record onto a bounded in-process queue; a background task inserts the
+    queued records in batches, as soon as `batch_size` records are waiting or `flush_interval` seconds after
+    the first one arrived. When the queue is full new records are dropped and counted rather than slowing
+    requests down, and a database failure loses the batch instead of failing the request that produced it.
+    """
+
+    logger = Logger(__name__)
+
+    def __init__(
+        self,
+        max_queue_size: int = Environment.EXECUTION_LOGS_QUEUE_SIZE,
+        batch_size: int = Environment.EXECUTION_LOGS_BATCH_SIZE,
+        flush_interval: float = Environment.EXECUTION_LOGS_FLUSH_INTERVAL,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            max_queue_size: Maximum number of records waiting to be written, bounding memory
+            batch_size: Maximum number of records inserted per flush
+            flush_interval: Maximum seconds a record waits before being flushed
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(maxsize=max_queue_size)
+        self.counters = ExecutionLogsWriterStats()
+        self._task: asyncio.Task | None = None
+
+    def submit(self, record: dict[str, Any]) -> bool:
+        """Queue a record without waiting, returning False if it was dropped because the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.counters.dropped += 1
+            if self.counters.dropped % 1000 == 1:
+                self.logger.warning(f"Execution logs queue is full, {self.counters.dropped} record(s) dropped so far")
+            return False
+        self.counters.enqueued += 1
+        return True
+
+    def stats(self) -> ExecutionLogsWriterStats:
+        return ExecutionLogsWriterStats(**{**asdict(self.counters), "queued": self.queue.qsize()})
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush every record still queued and stop the background task."""
+        if self._task is not None:
+            # The sentinel is queued behind the pending records, so the task writes them all before returning.
+            await self.queue.put(None)
+            await self._task
+            self._task = None
+        while not self.queue.empty():
+            await self.flush(self._take_batch())
+
+    def _take_batch(self) -> list[dict[str, Any]]:
+        batch = []
+        while len(batch) < self.batch_size and not self.queue.empty():
+            record = self.queue.get_nowait()
+            if record is not None:
+                batch.append(record)
+        return batch
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            record = await self.queue.get()
+            if record is None:
+                return
+            batch = [record]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if self.queue.empty():
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        record = await asyncio.wait_for(self.queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    record = self.queue.get_nowait()
+                if record is None:
+                    stopping = True
+                    break
+                batch.append(record)
+            await self.flush(batch)
+
+    async def flush(self, batch: list[dict[str, Any]]) -> None:
+        """Insert a batch of records, counting it as failed if the database rejects it."""
+        if not batch:
+            return
+        try:
+            async with AsyncSessionLocal() as session:
+                await AsyncDatabaseRepository(ExecutionLogs, session).bulk_insert(batch)
+            self.counters.written += len(batch)
+            self.counters.flushes += 1
+        except Exception as e:
+            self.counters.failed += len(batch)
+            self.logger.error(f"Failed to write {len(batch)} execution log(s): {e}")
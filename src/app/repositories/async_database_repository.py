@@ -0,0 +1,451 @@
+import math
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any, Literal, TypeVar
+
+from sqlalchemy import Float, cast, func, insert, or_, select, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+from src.app.database.models.base import BaseModel
+from src.data_integration.geohash import EARTH_RADIUS_KM
+from src.logger import Logger
+
+b_model = TypeVar("b_model", bound=BaseModel)
+
+MERCATOR_MAX_LATITUDE = 85.05112878
+
+
+class AsyncDatabaseRepository:
+    """
+    Asyncio counterpart of DatabaseRepository, used by request handlers on the event loop.
+
+    Bulk loading stays in the sync DatabaseRepository, which is used by the ETL in worker threads.
+    """
+
+    logger = Logger(__name__)
+
+    def __init__(self, model: type[b_model], session: AsyncSession):
+        self.model = model
+        self.session = session
+
+    async def create(self, instance: b_model) -> b_model | None:
+        try:
+            self.session.add(instance)
+            await self.session.commit()
+            await self.session.refresh(instance)
+            return instance
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            self.logger.error(f"Error creating record: {instance}, error: {e}")
+            raise e
+
+    async def bulk_insert(self, records: list[dict[str, Any]]) -> int:
+        """
+        Insert records in a single round trip with a multi-row INSERT.
+
+        Args:
+            records: Dictionaries keyed by column name; missing columns take their defaults
+
+        Returns:
+            Number of records inserted
+        """
+        if not records:
+            return 0
+        try:
+            await self.session.execute(insert(self.model), records)
+            await self.session.commit()
+            return len(records)
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            self.logger.error(f"Error inserting {len(records)} records, error: {e}")
+            raise e
+
+    async def get_by_date_range(
+        self,
+        date_column: str,
+        start_time: datetime,
+        end_time: datetime,
+        order_by: str | None = None,
+        order: Literal["asc", "desc"] = "desc",
+        limit: int | None = None,
+        columns: list[str] | None = None,
+        ranges: dict[str, tuple[Any, Any]] | None = None,
+        not_null: list[str] | None = None,
+        **kwargs,
+    ) -> list[Any]:
+        """
+        Filter records by date range between start_time and end_time.
+
+        Args:
+            date_column: Name of the date/timestamp column to filter by
+            start_time: Start datetime (inclusive)
+            end_time: End datetime (inclusive)
+            order_by: Column name to order by
+            order: Sort order ('asc' or 'desc')
+            limit: Maximum number of records to return
+            columns: Column names to select; rows with only these attributes are returned instead of
+                model instances, so unused columns never leave the database
+            ranges: Column name to (minimum, maximum) inclusive bounds, rows with NULL values excluded
+            not_null: Column names that must not be NULL
+            **kwargs: Additional filters to apply
+
+        Returns:
+            List of records matching the criteria
+        """
+        try:
+            if columns:
+                query = select(*(getattr(self.model, column) for column in columns))
+            else:
+                query = select(self.model)
+
+            date_column_attr = getattr(self.model, date_column)
+            query = query.filter(date_column_attr >= start_time, date_column_attr <= end_time)
+
+            for column, (minimum, maximum) in (ranges or {}).items():
+                query = query.filter(getattr(self.model, column).between(minimum, maximum))
+
+            for column in not_null or []:
+                query = query.filter(getattr(self.model, column).is_not(None))
+
+            if kwargs:
+                query = query.filter_by(**kwargs)
+
+            if order_by:
+                query = query.order_by(text(f"{order_by} {order}"))
+
+            if limit:
+                query = query.limit(limit)
+
+            result = await self.session.execute(query)
+            results = result.all() if columns else result.scalars().all()
+            self.logger.info(f"Found {len(results)} records between {start_time} and {end_time}")
+            return list(results)
+
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error filtering records by date range: {e}")
+            raise e
+
+    async def stream_by_date_range(
+        self,
+        date_column: str,
+        start_time: datetime,
+        end_time: datetime,
+        order_by: str | None = None,
+        order: Literal["asc", "desc"] = "desc",
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[BaseModel]]:
+        """
+        Stream records in a date range from a server-side cursor, in batches of `batch_size`.
+
+        Only one batch is held in memory at a time, however many records match. The connection stays
+        checked out until the iteration is finished or closed.
+
+        Args:
+            date_column: Name of the date/timestamp column to filter by
+            start_time: Start datetime (inclusive)
+            end_time: End datetime (inclusive)
+            order_by: Column name to order by
+            order: Sort order ('asc' or 'desc')
+            batch_size: Number of records fetched from the cursor at a time
+
+        Yields:
+            Lists of at most `batch_size` records
+        """
+        try:
+            date_column_attr = getattr(self.model, date_column)
+            query = select(self.model).filter(date_column_attr >= start_time, date_column_attr <= end_time)
+
+            if order_by:
+                query = query.order_by(text(f"{order_by} {order}"))
+
+            results = await self.session.stream_scalars(query.execution_options(yield_per=batch_size))
+            async for batch in results.partitions():
+                yield list(batch)
+
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error streaming records by date range: {e}")
+            raise e
+
+    async def get_page_by_date_range(
+        self,
+        date_column: str,
+        start_time: datetime,
+        end_time: datetime,
+        limit: int,
+        after: tuple[datetime, uuid.UUID] | None = None,
+        order: Literal["asc", "desc"] = "desc",
+    ) -> list[BaseModel]:
+        """
+        Fetch one page of records in a date range with keyset pagination on (date_column, id).
+
+        The page starts right after the `after` key instead of skipping rows with OFFSET, so with an
+        index on (date_column, id) every page costs the same as the first one.
+
+        Args:
+            date_column: Name of the date/timestamp column to filter and paginate by
+            start_time: Start datetime (inclusive)
+            end_time: End datetime (inclusive)
+            limit: Maximum number of records to return
+            after: (date_column, id) key of the last record of the previous page
+            order: Sort order ('asc' or 'desc')
+
+        Returns:
+            List of records of the page
+        """
+        try:
+            date_column_attr = getattr(self.model, date_column)
+            key = tuple_(date_column_attr, self.model.id)
+            query = select(self.model).filter(date_column_attr >= start_time, date_column_attr <= end_time)
+
+            if after:
+                query = query.filter(key < tuple_(*after) if order == "desc" else key > tuple_(*after))
+
+            if order == "desc":
+                query = query.order_by(date_column_attr.desc(), self.model.id.desc())
+            else:
+                query = query.order_by(date_column_attr.asc(), self.model.id.asc())
+
+            results = (await self.session.scalars(query.limit(limit))).all()
+            self.logger.info(f"Found {len(results)} records between {start_time} and {end_time} after {after}")
+            return list(results)
+
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error paginating records by date range: {e}")
+            raise e
+
+    async def get_grid_clusters(
+        self,
+        date_column: str,
+        start_time: datetime,
+        end_time: datetime,
+        latitude_column: str,
+        longitude_column: str,
+        value_column: str,
+        cells: int,
+        ranges: dict[str, tuple[Any, Any]] | None = None,
+    ) -> list[Any]:
+        """
+        Aggregate the records of a date range into the cells of a Web Mercator grid, in the database.
+
+        The grid splits the world map into `cells` x `cells` squares, so the cells have the same size on
+        screen whatever their latitude and the result never holds more than one row per cell.
+
+        Args:
+            date_column: Name of the date/timestamp column to filter by
+            start_time: Start datetime (inclusive)
+            end_time: End datetime (inclusive)
+            latitude_column: Name of the latitude column, in degrees
+            longitude_column: Name of the longitude column, in degrees
+            value_column: Name of the column whose maximum is reported per cell
+            cells: Number of cells along each axis of the world map
+            ranges: Column name to (minimum, maximum) inclusive bounds, rows with NULL values excluded
+
+        Returns:
+            Rows with the centroid (latitude, longitude), the number of records (count) and the maximum
+            value (max_<value_column>) of each non-empty cell
+        """
+        try:
+            latitude_column_attr = getattr(self.model, latitude_column)
+            longitude_column_attr = getattr(self.model, longitude_column)
+            latitude = cast(latitude_column_attr, Float)
+            longitude = cast(longitude_column_attr, Float)
+            # Web Mercator is undefined at the poles, points beyond its latitude limit fall in the edge cells.
+            phi = func.radians(func.least(func.greatest(latitude, -MERCATOR_MAX_LATITUDE), MERCATOR_MAX_LATITUDE))
+            # Cell indexes are clamped to the grid: longitude 180 is its far edge, and the latitude limit, rounded
+            # up, projects just outside it.
+            x = func.least(func.floor((longitude + 180) / 360 * cells), cells - 1)
+            y = func.least(
+                func.greatest(func.floor((1 - func.ln(func.tan(phi) + 1 / func.cos(phi)) / math.pi) / 2 * cells), 0),
+                cells - 1,
+            )
+
+            date_column_attr = getattr(self.model, date_column)
+            query = (
+                select(
+                    func.avg(latitude).label("latitude"),
+                    func.avg(longitude).label("longitude"),
+                    func.count().label("count"),
+                    func.max(getattr(self.model, value_column)).label(f"max_{value_column}"),
+                )
+                .filter(date_column_attr >= start_time, date_column_attr <= end_time)
+                .filter(latitude_column_attr.is_not(None), longitude_column_attr.is_not(None))
+                .group_by(x, y)
+            )
+            for column, (minimum, maximum) in (ranges or {}).items():
+                query = query.filter(getattr(self.model, column).between(minimum, maximum))
+
+            results = (await self.session.execute(query)).all()
+            self.logger.info(f"Aggregated records between {start_time} and {end_time} into {len(results)} cells")
+            return list(results)
+
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error aggregating records into grid cells: {e}")
+            raise e
+
+    async def get_by_distance(
+        self,
+        latitude_column: str,
+        longitude_column: str,
+        geohash_column: str,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        prefixes: list[str],
+        columns: list[str],
+        limit: int | None = None,
+        ranges: dict[str, tuple[Any, Any]] | None = None,
+    ) -> list[Any]:
+        """
+        Fetch records within a great-circle distance of a point, nearest first.
+
+        Candidates are selected with one prefix range scan per geohash prefix, then the exact haversine
+        distance is computed for the candidates only and rows further than `radius_km` are discarded.
+
+        Args:
+            latitude_column: Name of the latitude column, in degrees
+            longitude_column: Name of the longitude column, in degrees
+            geohash_column: Name of the geohash column, indexed with varchar_pattern_ops
+            latitude: Latitude of the center in degrees
+            longitude: Longitude of the center in degrees
+            radius_km: Maximum distance in kilometers
+            prefixes: Geohash prefixes whose cells contain the circle
+            columns: Column names to select, a `distance_km` column is added
+            limit: Maximum number of records to return
+            ranges: Column name to (minimum, maximum) inclusive bounds, rows with NULL values excluded
+
+        Returns:
+            Rows with the selected columns and their distance, ordered by distance
+        """
+        try:
+            phi = func.radians(cast(getattr(self.model, latitude_column), Float))
+            d_phi = phi - math.radians(latitude)
+            d_lambda = func.radians(cast(getattr(self.model, longitude_column), Float)) - math.radians(longitude)
+            haversine = func.power(func.sin(d_phi / 2), 2) + math.cos(math.radians(latitude)) * func.cos(
+                phi
+            ) * func.power(func.sin(d_lambda / 2), 2)
+            distance = (2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(haversine)))).label("distance_km")
+
+            geohash_column_attr = getattr(self.model, geohash_column)
+            candidates = select(*(getattr(self.model, column) for column in columns), distance).filter(
+                or_(*(geohash_column_attr.startswith(prefix, autoescape=True) for prefix in prefixes))
+            )
+            for column, (minimum, maximum) in (ranges or {}).items():
+                candidates = candidates.filter(getattr(self.model, column).between(minimum, maximum))
+
+            candidates = candidates.subquery()
+            query = (
+                select(candidates)
+                .filter(candidates.c.distance_km <= radius_km)
+                .order_by(candidates.c.distance_km)
+                .limit(limit)
+            )
+
+            results = (await self.session.execute(query)).all()
+            self.logger.info(
+                f"Found {len(results)} records within {radius_km} km of ({latitude}, {longitude}) "
+                f"in {len(prefixes)} geohash cells"
+            )
+            return list(results)
+
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error filtering records by distance: {e}")
+            raise e
+
+    async def get_version_by_date_range(
+        self, date_column: str, start_time: datetime, end_time: datetime, version_column: str
+    ) -> tuple[int, datetime | None, float | None]:
+        """
+        Summarize the records of a date range, without loading them, to tell whether any changed.
+
+        Args:
+            date_column: Name of the date/timestamp column to filter by
+            start_time: Start datetime (inclusive)
+            end_time: End datetime (inclusive)
+            version_column: Timestamp column set whenever a record changes
+
+        Returns:
+            Number of records in the range, their latest `version_column` value and the sum of their
+            `version_column` epochs, which also changes when a record other than the latest is updated
+        """
+        try:
+            date_column_attr = getattr(self.model, date_column)
+            version_column_attr = getattr(self.model, version_column)
+            query = select(
+                func.count(), func.max(version_column_attr), func.sum(func.extract("epoch", version_column_attr))
+            ).filter(date_column_attr >= start_time, date_column_attr <= end_time)
+            count, latest_version, version_checksum = (await self.session.execute(query)).one()
+            return count, latest_version, version_checksum
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error summarizing records by date range: {e}")
+            raise e
+
+    async def get_overlapping(
+        self, start_column: str, end_column: str, start_time: datetime, end_time: datetime
+    ) -> list[BaseModel]:
+        """
+        Filter records whose [start_column, end_column) interval overlaps [start_time, end_time).
+
+        Args:
+            start_column: Name of the column holding the interval start
+            end_column: Name of the column holding the interval end
+            start_time: Start datetime of the requested interval
+            end_time: End datetime of the requested interval
+
+        Returns:
+            List of overlapping records
+        """
+        try:
+            start_column_attr = getattr(self.model, start_column)
+            end_column_attr = getattr(self.model, end_column)
+            query = select(self.model).filter(start_column_attr < end_time, end_column_attr > start_time)
+            return list((await self.session.scalars(query)).all())
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error filtering overlapping records: {e}")
+            raise e
+
+    async def get_by_id(self, id: uuid.UUID) -> BaseModel | None:
+        try:
+            return await self.session.get(self.model, id)
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error fetching record by id: {id}, error: {e}")
+            raise e
+
+    async def get_all_by(self, order_by: str | None = None, **kwargs: Any) -> list[BaseModel]:
+        """
+        Filter records by column values.
+
+        Args:
+            order_by: Name of the column to sort the records by
+            **kwargs: Column values records must be equal to
+
+        Returns:
+            List of matching records
+        """
+        try:
+            query = select(self.model).filter_by(**kwargs)
+            if order_by:
+                query = query.order_by(getattr(self.model, order_by))
+            return list((await self.session.scalars(query)).all())
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error filtering records by {kwargs}, error: {e}")
+            raise e
+
+    async def update(self, id: uuid.UUID | None, **kwargs: Any) -> BaseModel | None:
+        if not id:
+            raise ValueError("id is required")
+        try:
+            instance = await self.get_by_id(id)
+            if instance:
+                for key, value in kwargs.items():
+                    setattr(instance, key, value)
+                await self.session.commit()
+                await self.session.refresh(instance)
+                return instance
+            return None
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            self.logger.error(f"Error updating record id: {id}, error: {e}")
+            raise e
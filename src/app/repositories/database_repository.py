@@ -1,7 +1,14 @@
+import json
+import time
 import uuid
-from datetime import datetime
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
 from typing import Any, Literal, TypeVar
 
+import numpy as np
+from psycopg2 import DatabaseError
+from sqlalchemy import delete
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
@@ -13,6 +20,85 @@ from src.logger import Logger
 b_model = TypeVar("b_model", bound=BaseModel)
 
 
+@dataclass
+class BulkLoadStats:
+    """Outcome of a bulk load."""
+
+    rows: int
+    elapsed: float
+    inserted: int = 0
+    updated: int = 0
+    # (minimum, maximum) of the span column over the inserted and updated records, None if none was written.
+    written_span: tuple[Any, Any] | None = None
+
+    @property
+    def unchanged(self) -> int:
+        return self.rows - self.inserted - self.updated
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def _copy_value(value: Any) -> str:
+    """Encode a value as a CSV field for COPY, where an unquoted empty field is NULL."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    else:
+        value = str(value)
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _copy_column(values: Iterable[Any]) -> list[str]:
+    """Encode a column of values as CSV fields for COPY, with fast paths for the most common types."""
+    return [
+        '"' + value.replace('"', '""') + '"'
+        if type(value) is str
+        else str(value)
+        if type(value) is int or type(value) is float
+        else _copy_value(value)
+        for value in values
+    ]
+
+
+def _copy_numbers(values: np.ndarray) -> list[str]:
+    """Encode a numeric NumPy array as CSV fields for COPY, NULL where values are NaN or masked."""
+    data = np.ma.getdata(values)
+    missing = np.ma.getmaskarray(values)
+    if data.dtype.kind == "f":
+        missing = missing | np.isnan(data)
+    fields = data.astype(str)
+    fields[missing] = ""
+    return fields.tolist()
+
+
+class _CopyStream:
+    """Read-only file object producing COPY lines lazily, so rows are never all held in memory."""
+
+    def __init__(self, lines: Iterator[str]):
+        self.lines = lines
+        self.buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self.buffer) < size:
+            line = next(self.lines, None)
+            if line is None:
+                break
+            self.buffer += line
+        if size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    readline = read
+
+
 class DatabaseRepository:
     logger = Logger(__name__)
 
@@ -31,13 +117,36 @@ class DatabaseRepository:
             self.logger.error(f"Error creating record: {instance}, error: {e}")
             raise e
 
-    def bulk_upsert(self, instances: list[b_model], conflict_column: str) -> int:
+    def bulk_insert(self, records: list[dict[str, Any]]) -> int:
+        """
+        Insert records in a single round trip with a multi-row INSERT.
+
+        Args:
+            records: Dictionaries keyed by column name; missing columns take their defaults
+
+        Returns:
+            Number of records inserted
+        """
+        if not records:
+            return 0
+        try:
+            self.session.execute(insert(self.model), records)
+            self.session.commit()
+            return len(records)
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            self.logger.error(f"Error inserting {len(records)} records, error: {e}")
+            raise e
+
+    def bulk_upsert(self, instances: list[b_model], conflict_column: str, change_column: str | None = None) -> int:
         """
-        Bulk upsert records using PostgreSQL's INSERT ... ON CONFLICT ... DO UPDATE.
+        Bulk upsert model instances, see bulk_copy_upsert.
 
         Args:
             instances: List of model instances to upsert
             conflict_column: The column name to check for conflicts (e.g., 'event_id')
+            change_column: Optional version column (e.g., 'updated'); existing records are only rewritten
+                when the incoming value is newer, leaving unchanged rows untouched
 
         Returns:
             Number of records processed
@@ -45,44 +154,183 @@ class DatabaseRepository:
         if not instances:
             self.logger.warning("No instances to upsert")
             return 0
+        return self.bulk_copy_upsert(instances, conflict_column, change_column).rows
 
-        try:
-            # Convert instances to dictionaries, excluding None values for auto-generated columns
-            records = []
-            for instance in instances:
-                record = {}
-                for c in instance.__table__.columns:
-                    value = getattr(instance, c.name)
-                    # Skip None values for columns with defaults (id, created_at, etc.)
-                    if value is not None or not (c.default or c.server_default):
-                        record[c.name] = value
-                records.append(record)
-
-            # Create insert statement
-            stmt = insert(self.model).values(records)
-
-            # Get all columns except the conflict column and primary key for update
-            update_cols = {
-                c.name: stmt.excluded[c.name]
-                for c in self.model.__table__.columns
-                if c.name not in [conflict_column, "id", "created_at"]
-            }
-
-            # Create upsert statement
-            upsert_stmt = stmt.on_conflict_do_update(index_elements=[conflict_column], set_=update_cols)
-
-            # Execute the upsert
-            self.session.execute(upsert_stmt)
-            self.session.commit()
+    def _to_record(self, instance: b_model) -> dict[str, Any]:
+        """Convert an instance to a dictionary, excluding None values for auto-generated columns."""
+        record = {}
+        for c in instance.__table__.columns:
+            value = getattr(instance, c.name)
+            # Skip None values for columns with defaults (id, created_at, etc.)
+            if value is not None or not (c.default or c.server_default):
+                record[c.name] = value
+        return record
 
-            self.logger.info(f"Successfully upserted {len(records)} records")
-            return len(records)
+    def _update_columns(self, conflict_column: str) -> list[str]:
+        """Columns overwritten when an upsert hits an existing record."""
+        return [c.name for c in self.model.__table__.columns if c.name not in [conflict_column, "id", "created_at"]]
 
-        except SQLAlchemyError as e:
+    def _copy_lines(self, records: Iterable[b_model | Mapping[str, Any]], counter: list[int]) -> Iterator[str]:
+        """Render records as COPY CSV lines, filling client-side column defaults such as generated ids."""
+        columns = list(self.model.__table__.columns)
+        for record in records:
+            if not isinstance(record, Mapping):
+                record = self._to_record(record)
+            values = []
+            for c in columns:
+                value = record.get(c.name)
+                if value is None and c.name not in record and c.default is not None:
+                    value = c.default.arg(None) if c.default.is_callable else c.default.arg
+                values.append(_copy_value(value))
+            counter[0] += 1
+            yield ",".join(values) + "\n"
+
+    def _copy_columns(self, columns: Mapping[str, Sequence[Any] | np.ndarray], counter: list[int]) -> Iterator[str]:
+        """Render column arrays as COPY CSV lines, encoding one column at a time."""
+        rows = len(next(iter(columns.values()))) if columns else 0
+        encoded = []
+        for c in self.model.__table__.columns:
+            values = columns.get(c.name)
+            if values is None:
+                if c.default is None:
+                    values = [None] * rows
+                elif c.default.is_callable:
+                    values = [c.default.arg(None) for _ in range(rows)]
+                else:
+                    values = [c.default.arg] * rows
+            if isinstance(values, np.ndarray) and values.dtype.kind == "M":
+                # Timestamps are formatted in a single vectorized call instead of one isoformat() per value.
+                encoded.append(['"' + value + '"' for value in np.datetime_as_string(values, unit="us")])
+            elif isinstance(values, np.ndarray) and values.dtype.kind in "fiu":
+                encoded.append(_copy_numbers(values))
+            else:
+                encoded.append(_copy_column(values))
+        counter[0] += rows
+        for values in zip(*encoded, strict=True):
+            yield ",".join(values) + "\n"
+
+    def bulk_copy_upsert(
+        self,
+        records: Iterable[b_model | Mapping[str, Any]],
+        conflict_column: str,
+        change_column: str | None = None,
+        span_column: str | None = None,
+    ) -> BulkLoadStats:
+        """
+        Bulk upsert records by streaming them with COPY into a temporary staging table, then merging
+        them with INSERT ... SELECT ... ON CONFLICT ... DO UPDATE.
+
+        No bind parameters are used, so the number of records is not bounded by PostgreSQL's parameter
+        limit, and records are consumed lazily from the iterable.
+
+        Args:
+            records: Model instances or dictionaries keyed by column name
+            conflict_column: The column name to check for conflicts (e.g., 'event_id')
+            change_column: Optional version column (e.g., 'updated'); existing records are only rewritten
+                when the incoming value is newer, so unchanged rows produce no dead tuples or WAL
+            span_column: Optional column (e.g., 'time') whose range over the written records is returned
+
+        Returns:
+            Number of records loaded, inserted and updated, and elapsed time
+        """
+        counter = [0]
+        return self._copy_merge(
+            self._copy_lines(records, counter), counter, conflict_column, change_column, span_column
+        )
+
+    def bulk_copy_upsert_columns(
+        self,
+        columns: Mapping[str, Sequence[Any] | np.ndarray],
+        conflict_column: str,
+        change_column: str | None = None,
+        span_column: str | None = None,
+    ) -> BulkLoadStats:
+        """
+        Columnar variant of bulk_copy_upsert, loading records given as one array per column.
+
+        Columns missing from the mapping take their client-side default (e.g. generated ids) or NULL.
+        datetime64 and numeric NumPy arrays are supported and formatted without converting each value to a
+        Python object; NaN and masked values are loaded as NULL.
+
+        Args:
+            columns: Column name to a list or NumPy array of values, all of the same length
+            conflict_column: The column name to check for conflicts (e.g., 'event_id')
+            change_column: Optional version column (e.g., 'updated'), see bulk_copy_upsert
+            span_column: Optional column (e.g., 'time'), see bulk_copy_upsert
+
+        Returns:
+            Number of records loaded, inserted and updated, and elapsed time
+        """
+        counter = [0]
+        return self._copy_merge(
+            self._copy_columns(columns, counter), counter, conflict_column, change_column, span_column
+        )
+
+    def _copy_merge(
+        self,
+        lines: Iterator[str],
+        counter: list[int],
+        conflict_column: str,
+        change_column: str | None,
+        span_column: str | None = None,
+    ) -> BulkLoadStats:
+        """COPY the CSV lines into a temporary staging table and merge it into the table."""
+        preparer = self.session.get_bind().dialect.identifier_preparer
+        table = preparer.quote(self.model.__tablename__)
+        staging_table = preparer.quote(f"{self.model.__tablename__}_staging")
+        conflict = preparer.quote(conflict_column)
+        columns = ", ".join(preparer.quote(c.name) for c in self.model.__table__.columns)
+        update_columns = ", ".join(
+            f"{preparer.quote(name)} = EXCLUDED.{preparer.quote(name)}"
+            for name in self._update_columns(conflict_column)
+        )
+        order_by = conflict
+        update_where = ""
+        if change_column:
+            change = preparer.quote(change_column)
+            order_by = f"{conflict}, {change} DESC NULLS LAST"
+            update_where = f" WHERE {table}.{change} IS NULL OR EXCLUDED.{change} > {table}.{change}"
+        span = preparer.quote(span_column) if span_column else "NULL"
+
+        start_time = time.perf_counter()
+        try:
+            with self.session.connection().connection.cursor() as cursor:
+                cursor.execute(f"CREATE TEMP TABLE {staging_table} (LIKE {table}) ON COMMIT DROP")
+                cursor.copy_expert(
+                    f"COPY {staging_table} ({columns}) FROM STDIN WITH (FORMAT csv)",
+                    _CopyStream(lines),
+                )
+                # DISTINCT ON keeps a single row per key (the newest one), ON CONFLICT cannot update the same row twice.
+                # Inserted rows are told apart from updated ones by xmax, which is 0 for freshly inserted tuples.
+                cursor.execute(
+                    f"WITH upserted AS ("
+                    f"INSERT INTO {table} ({columns}) "
+                    f"SELECT DISTINCT ON ({conflict}) {columns} FROM {staging_table} ORDER BY {order_by} "
+                    f"ON CONFLICT ({conflict}) DO UPDATE SET {update_columns}{update_where} "
+                    f"RETURNING (xmax = 0) AS inserted, {span} AS span) "
+                    f"SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted), "
+                    f"min(span), max(span) FROM upserted"
+                )
+                inserted, updated, span_start, span_end = cursor.fetchone()
+            self.session.commit()
+        except (SQLAlchemyError, DatabaseError) as e:
             self.session.rollback()
-            self.logger.error(f"Error upserting records: {e}")
+            self.logger.error(f"Error bulk loading records: {e}")
             raise e
 
+        stats = BulkLoadStats(
+            rows=counter[0],
+            elapsed=time.perf_counter() - start_time,
+            inserted=inserted,
+            updated=updated,
+            written_span=(span_start, span_end) if span_start is not None else None,
+        )
+        self.logger.info(
+            f"Successfully bulk loaded {stats.rows} records in {stats.elapsed:.2f}s ({stats.rows_per_second:.0f} rows/s): "
+            f"{stats.inserted} inserted, {stats.updated} updated, {stats.unchanged} unchanged"
+        )
+        return stats
+
     def get_by_date_range(
         self,
         date_column: str,
@@ -131,6 +379,30 @@ class DatabaseRepository:
             self.logger.error(f"Error filtering records by date range: {e}")
             raise e
 
+    def get_overlapping(
+        self, start_column: str, end_column: str, start_time: datetime, end_time: datetime
+    ) -> list[BaseModel]:
+        """
+        Filter records whose [start_column, end_column) interval overlaps [start_time, end_time).
+
+        Args:
+            start_column: Name of the column holding the interval start
+            end_column: Name of the column holding the interval end
+            start_time: Start datetime of the requested interval
+            end_time: End datetime of the requested interval
+
+        Returns:
+            List of overlapping records
+        """
+        try:
+            start_column_attr = getattr(self.model, start_column)
+            end_column_attr = getattr(self.model, end_column)
+            query = self.session.query(self.model).filter(start_column_attr < end_time, end_column_attr > start_time)
+            return list(query.all())
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error filtering overlapping records: {e}")
+            raise e
+
     def get_by_id(self, id: uuid.UUID) -> BaseModel | None:
         try:
             return self.session.query(self.model).filter(self.model.id == id).first()
@@ -138,6 +410,30 @@ class DatabaseRepository:
             self.logger.error(f"Error fetching record by id: {id}, error: {e}")
             raise e
 
+    def get_by(self, **kwargs: Any) -> BaseModel | None:
+        try:
+            return self.session.query(self.model).filter_by(**kwargs).first()
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error fetching record by {kwargs}, error: {e}")
+            raise e
+
+    def get_all_by(self, *criteria: Any, **kwargs: Any) -> list[BaseModel]:
+        """
+        Filter records by column values and SQL expressions.
+
+        Args:
+            *criteria: SQLAlchemy filter expressions (e.g., `Model.time < value`)
+            **kwargs: Column values records must be equal to
+
+        Returns:
+            List of matching records
+        """
+        try:
+            return list(self.session.query(self.model).filter(*criteria).filter_by(**kwargs).all())
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error filtering records by {kwargs}, error: {e}")
+            raise e
+
     def update(self, id: uuid.UUID | None, **kwargs: Any) -> BaseModel | None:
         if not id:
             raise ValueError("id is required")
@@ -154,3 +450,70 @@ class DatabaseRepository:
             self.session.rollback()
             self.logger.error(f"Error updating record id: {id}, error: {e}")
             raise e
+
+    def update_where(self, id: uuid.UUID, condition: Any, **kwargs: Any) -> bool:
+        """
+        Update a record only if it still matches `condition`, in a single statement.
+
+        Concurrent callers can use it as a compare-and-set, e.g. to claim a pending task exactly once.
+
+        Args:
+            id: ID of the record
+            condition: SQLAlchemy filter expression the record must match
+            **kwargs: Column values to set
+
+        Returns:
+            Whether the record was updated
+        """
+        try:
+            updated = (
+                self.session.query(self.model)
+                .filter(self.model.id == id, condition)
+                .update(kwargs, synchronize_session=False)
+            )
+            self.session.commit()
+            return updated == 1
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            self.logger.error(f"Error updating record id: {id}, error: {e}")
+            raise e
+
+    def delete_by_ids(self, ids: list[uuid.UUID]) -> int:
+        if not ids:
+            return 0
+        try:
+            deleted = self.session.query(self.model).filter(self.model.id.in_(ids)).delete(synchronize_session=False)
+            self.session.commit()
+            return deleted
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            self.logger.error(f"Error deleting records: {ids}, error: {e}")
+            raise e
+
+    def delete_by_values(self, column: str, values: list[Any], returning_column: str) -> list[Any]:
+        """
+        Delete the records whose `column` is one of `values`.
+
+        Args:
+            column: Name of the column to match (e.g., 'event_id')
+            values: Values of the records to delete
+            returning_column: Name of the column returned for each deleted record (e.g., 'time')
+
+        Returns:
+            `returning_column` values of the deleted records
+        """
+        if not values:
+            return []
+        try:
+            query = (
+                delete(self.model)
+                .where(getattr(self.model, column).in_(values))
+                .returning(getattr(self.model, returning_column))
+            )
+            deleted = list(self.session.scalars(query).all())
+            self.session.commit()
+            return deleted
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            self.logger.error(f"Error deleting records by {column}, error: {e}")
+            raise e
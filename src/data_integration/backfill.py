@@ -0,0 +1,260 @@
+"""
+Resumable backfill of the USGS catalog over a long date range, e.g. years of history:
+
+    python -m src.data_integration.backfill --start 2015-01-01 --end 2025-01-01 --chunk-days 7 --concurrency 4
+
+The range is split into chunks checkpointed in the ingestion job tables, then run by a pool of threads sharing
+one pooled USGS client, each thread reusing its ETL and bulk loader for all its chunks. Throughput is printed
+while the chunks run and a summary at the end.
+
+Running the same command again resumes the last unfinished backfill of the range: succeeded chunks are skipped
+and failed ones retried. Windows already ingested and still fresh in the coverage ledger are not downloaded
+again either. The job can also be followed with GET /jobs/{job_id}.
+
+The tiles on disk and, with a Redis RESULT_CACHE_URL, the cached results of the windows written are dropped, so
+the API does not keep serving them; the in-memory caches of its workers expire after their time to live.
+"""
+
+import argparse
+import logging
+import sys
+import time
+import uuid
+from concurrent.futures import wait
+from datetime import datetime, timedelta
+
+from src.api.clients.async_usgs_earthquake_client import AsyncUSGSEarthquakeClient
+from src.api.sync_facade import SyncClientFacade
+from src.app.config import Environment
+from src.app.database.config import SessionLocal
+from src.app.database.models import IngestionJobChunks, IngestionJobs
+from src.app.repositories.database_repository import DatabaseRepository
+from src.data_integration.invalidation import shared_cache_invalidation
+from src.data_integration.jobs import (
+    BACKFILL_ORIGIN,
+    FAILED,
+    PENDING,
+    RUNNING,
+    SUCCEEDED,
+    IngestJobRunner,
+    IngestJobRunnerStats,
+    job_progress,
+    plan_chunks,
+)
+
+MEGABYTE = 1_000_000
+
+
+def _date(value: str) -> datetime:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r}, expected YYYY-MM-DD")
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"{value!r} must be positive")
+    return number
+
+
+def _positive_float(value: str) -> float:
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number {value!r}")
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"{value!r} must be positive")
+    return number
+
+
+def _duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def prepare_job(
+    db_session, start_time: datetime, end_time: datetime, chunk_days: int, rerun_running: bool
+) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    """
+    Resume the last unfinished backfill job of the range, or create a new one.
+
+    Failed chunks of a resumed job are reset to pending. Chunks marked running are only reset with
+    `rerun_running`, since another backfill may still be running them; otherwise they are retried once
+    CHUNK_TIMEOUT has passed.
+
+    Args:
+        db_session: Database session
+        start_time: Start of the range (inclusive)
+        end_time: End of the range (exclusive)
+        chunk_days: Number of days per chunk of a new job
+        rerun_running: Whether to reset the chunks marked running
+
+    Returns:
+        Tuple of the job id and the ids of its chunks left to run, most recent first
+    """
+    jobs_repository = DatabaseRepository(IngestionJobs, db_session)
+    chunks_repository = DatabaseRepository(IngestionJobChunks, db_session)
+
+    jobs = jobs_repository.get_all_by(origin=BACKFILL_ORIGIN, start_time=start_time, end_time=end_time)
+    for job in sorted(jobs, key=lambda job: job.created_at, reverse=True):  # type: ignore
+        chunks = chunks_repository.get_all_by(job_id=job.id)
+        remaining = [chunk for chunk in chunks if chunk.status != SUCCEEDED]
+        if not remaining:
+            continue
+
+        job_id = job.id
+        remaining.sort(key=lambda chunk: chunk.start_time, reverse=True)  # type: ignore
+        resettable = (FAILED, RUNNING) if rerun_running else (FAILED,)
+        resets = [(chunk.id, chunk.status) for chunk in remaining if chunk.status in resettable]
+        remaining_ids = [chunk.id for chunk in remaining]
+        for chunk_id, chunk_status in resets:
+            chunks_repository.update_where(
+                chunk_id,  # type: ignore
+                IngestionJobChunks.status == chunk_status,
+                status=PENDING,
+                error=None,
+            )
+        print(f"Resuming backfill job {job_id}: {len(remaining_ids)} of {len(chunks)} chunks left")
+        return job_id, remaining_ids  # type: ignore
+
+    job = jobs_repository.create(IngestionJobs(start_time=start_time, end_time=end_time, origin=BACKFILL_ORIGIN))
+    chunks = [
+        {"id": uuid.uuid4(), "job_id": job.id, "start_time": chunk_start, "end_time": chunk_end, "status": PENDING}
+        for chunk_start, chunk_end in reversed(plan_chunks(start_time, end_time, timedelta(days=chunk_days)))
+    ]
+    chunk_ids = [chunk["id"] for chunk in chunks]
+    chunks_repository.bulk_insert(chunks)
+    print(f"Created backfill job {job.id}: {len(chunk_ids)} chunks of {chunk_days} day(s)")  # type: ignore
+    return job.id, chunk_ids  # type: ignore
+
+
+def format_progress(
+    stats: IngestJobRunnerStats, previous: IngestJobRunnerStats, interval: float, total: int, elapsed: float
+) -> str:
+    """Format a progress line with the throughput since the previous line and the overall average."""
+    done = stats.chunks_succeeded + stats.chunks_failed
+    events_per_second = (stats.rows_upserted - previous.rows_upserted) / interval
+    megabytes_per_second = (stats.bytes_downloaded - previous.bytes_downloaded) / MEGABYTE / interval
+    average = stats.rows_upserted / elapsed if elapsed else 0.0
+    remaining = (total - done) * elapsed / done if done else None
+    return (
+        f"[{done:>{len(str(total))}}/{total} chunks, {stats.chunks_failed} failed] "
+        f"{stats.rows_upserted} events | {events_per_second:8.0f} events/s (avg {average:.0f}) | "
+        f"{megabytes_per_second:6.2f} MB/s | elapsed {_duration(elapsed)}"
+        + (f" | ETA {_duration(remaining)}" if remaining is not None else "")
+    )
+
+
+def main(
+    start_time: datetime,
+    end_time: datetime,
+    chunk_days: int,
+    concurrency: int,
+    progress_interval: float,
+    rerun_running: bool,
+) -> int:
+    """
+    Backfill a date range, printing the progress, and return the exit status of the command.
+    """
+    if start_time >= end_time:
+        print("--start must be before --end", file=sys.stderr)
+        return 2
+
+    db_session = SessionLocal()
+    try:
+        job_id, chunk_ids = prepare_job(db_session, start_time, end_time, chunk_days, rerun_running)
+    finally:
+        db_session.close()
+
+    client = SyncClientFacade(
+        AsyncUSGSEarthquakeClient(max_connections=Environment.USGS_MAX_CONNECTIONS, http2=Environment.USGS_HTTP2)
+    )
+    runner = IngestJobRunner(client=client, max_workers=concurrency)
+    started = time.monotonic()
+    interrupted = False
+    with shared_cache_invalidation():
+        try:
+            futures = runner.enqueue(chunk_ids)
+            previous, previous_time = runner.stats(), started
+            pending = set(futures)
+            while pending:
+                _, pending = wait(pending, timeout=progress_interval)
+                now = time.monotonic()
+                stats = runner.stats()
+                print(format_progress(stats, previous, now - previous_time, len(chunk_ids), now - started), flush=True)
+                previous, previous_time = stats, now
+        except KeyboardInterrupt:
+            interrupted = True
+            print("Interrupted, waiting for the running chunks; the others stay pending for the next run", flush=True)
+        finally:
+            runner.shutdown(cancel_pending=True)
+            client.close()
+
+    elapsed = time.monotonic() - started
+    stats = runner.stats()
+    db_session = SessionLocal()
+    try:
+        chunks = DatabaseRepository(IngestionJobChunks, db_session).get_all_by(job_id=job_id)
+    finally:
+        db_session.close()
+    progress = job_progress(chunks)  # type: ignore
+
+    print(
+        f"\nBackfill job {job_id} ({start_time:%Y-%m-%d} to {end_time:%Y-%m-%d}): "
+        f"{'interrupted' if interrupted else progress.status}\n"
+        f"  this run:  {stats.chunks_succeeded} chunks succeeded, {stats.chunks_failed} failed, "
+        f"{stats.rows_upserted} events, {stats.bytes_downloaded / MEGABYTE:.1f} MB in {_duration(elapsed)} "
+        f"({stats.rows_upserted / elapsed if elapsed else 0:.0f} events/s, "
+        f"{stats.bytes_downloaded / MEGABYTE / elapsed if elapsed else 0:.2f} MB/s)\n"
+        f"  whole job: {progress.chunks_succeeded}/{progress.chunks_total} chunks succeeded, "
+        f"{progress.chunks_failed} failed, {progress.chunks_pending + progress.chunks_running} left, "
+        f"{progress.rows_upserted} events"
+    )
+    failed_chunks = sorted(
+        (chunk for chunk in chunks if chunk.status == FAILED),
+        key=lambda chunk: chunk.start_time,  # type: ignore
+    )
+    for chunk in failed_chunks[:10]:
+        print(f"  failed {chunk.start_time:%Y-%m-%d} to {chunk.end_time:%Y-%m-%d}: {chunk.error}")
+    if len(failed_chunks) > 10:
+        print(f"  ... and {len(failed_chunks) - 10} more failed chunks")
+    if progress.status != SUCCEEDED:
+        print("Run the same command again to resume the job")
+
+    if interrupted:
+        return 130
+    return 0 if progress.status == SUCCEEDED else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=_date, required=True, help="Start date (YYYY-MM-DD, inclusive)")
+    parser.add_argument("--end", type=_date, required=True, help="End date (YYYY-MM-DD, exclusive)")
+    parser.add_argument("--chunk-days", type=_positive_int, default=1, help="Days per checkpointed chunk of a new job")
+    parser.add_argument("--concurrency", type=_positive_int, default=4, help="Chunks run concurrently")
+    parser.add_argument("--progress-interval", type=_positive_float, default=5.0, help="Seconds between progress lines")
+    parser.add_argument(
+        "--rerun-running",
+        action="store_true",
+        help="Also rerun the chunks marked running, left by a backfill that was killed",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Keep the INFO logs of the ETL")
+    arguments = parser.parse_args()
+    if not arguments.verbose:
+        logging.disable(logging.INFO)
+    sys.exit(
+        main(
+            arguments.start,
+            arguments.end,
+            arguments.chunk_days,
+            arguments.concurrency,
+            arguments.progress_interval,
+            arguments.rerun_running,
+        )
+    )
@@ -0,0 +1,138 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.app.database.models import IngestionCoverages
+from src.app.repositories.async_database_repository import AsyncDatabaseRepository
+from src.app.repositories.database_repository import DatabaseRepository
+from src.logger import Logger
+
+# (maximum window age, time to live) pairs, checked in order. The age of a window is measured from its end,
+# so recent windows, which USGS still revises, expire quickly while old history is almost never refetched.
+FRESHNESS_POLICY: list[tuple[timedelta, timedelta]] = [
+    (timedelta(days=1), timedelta(minutes=5)),
+    (timedelta(days=7), timedelta(hours=1)),
+    (timedelta(days=30), timedelta(hours=12)),
+]
+HISTORICAL_TTL = timedelta(days=30)
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def freshness_ttl(window_end: datetime, now: datetime) -> timedelta:
+    """Return how long an ingested window ending at `window_end` stays fresh."""
+    age = now - window_end
+    for max_age, ttl in FRESHNESS_POLICY:
+        if age < max_age:
+            return ttl
+    return HISTORICAL_TTL
+
+
+def find_stale_intervals(
+    start_time: datetime,
+    end_time: datetime,
+    coverages: list[tuple[datetime, datetime, datetime]],
+    now: datetime,
+) -> list[tuple[datetime, datetime]]:
+    """
+    Compute the sub-intervals of [start_time, end_time) that are not covered by a fresh ingestion.
+
+    The range is split at every coverage boundary and every freshness policy boundary, so each elementary
+    segment has a single time to live and is either fully covered by a ledger entry or not at all.
+
+    Args:
+        start_time: Start of the requested range (inclusive)
+        end_time: End of the requested range (exclusive)
+        coverages: (start_time, end_time, fetched_at) tuples of the ledger entries overlapping the range
+        now: Reference time used to evaluate freshness
+
+    Returns:
+        Sorted, merged list of (start_time, end_time) intervals that must be fetched
+    """
+    if start_time >= end_time:
+        return []
+
+    boundaries = {start_time, end_time}
+    boundaries.update(point for coverage in coverages for point in coverage[:2] if start_time < point < end_time)
+    boundaries.update(now - max_age for max_age, _ in FRESHNESS_POLICY if start_time < now - max_age < end_time)
+    points = sorted(boundaries)
+
+    stale_intervals: list[tuple[datetime, datetime]] = []
+    for segment_start, segment_end in zip(points[:-1], points[1:], strict=True):
+        fresh_after = now - freshness_ttl(segment_end, now)
+        is_fresh = any(
+            coverage_start <= segment_start and coverage_end >= segment_end and fetched_at >= fresh_after
+            for coverage_start, coverage_end, fetched_at in coverages
+        )
+        if is_fresh:
+            continue
+        if stale_intervals and stale_intervals[-1][1] == segment_start:
+            stale_intervals[-1] = (stale_intervals[-1][0], segment_end)
+        else:
+            stale_intervals.append((segment_start, segment_end))
+
+    return stale_intervals
+
+
+class CoverageLedger:
+    """
+    Persisted interval index of the time windows already ingested from the USGS API.
+    """
+
+    logger = Logger(__name__)
+
+    def __init__(self, session: Session):
+        self.repository = DatabaseRepository(IngestionCoverages, session)
+
+    def stale_intervals(
+        self, start_time: datetime, end_time: datetime, now: datetime | None = None
+    ) -> list[tuple[datetime, datetime]]:
+        """Return the sub-intervals of [start_time, end_time) that are missing or stale in the ledger."""
+        now = now or utc_now()
+        coverages = [
+            (coverage.start_time, coverage.end_time, coverage.fetched_at)
+            for coverage in self.repository.get_overlapping("start_time", "end_time", start_time, end_time)
+        ]
+        stale_intervals = find_stale_intervals(start_time, end_time, coverages, now)  # type: ignore
+        self.logger.info(f"{len(stale_intervals)} stale interval(s) between {start_time} and {end_time}")
+        return stale_intervals
+
+    def record(
+        self, start_time: datetime, end_time: datetime, fetched_at: datetime, metadata_id: uuid.UUID | None
+    ) -> None:
+        """Record an ingested window, dropping older entries it fully supersedes."""
+        superseded_ids = [
+            coverage.id
+            for coverage in self.repository.get_overlapping("start_time", "end_time", start_time, end_time)
+            if coverage.start_time >= start_time  # type: ignore
+            and coverage.end_time <= end_time  # type: ignore
+            and coverage.fetched_at <= fetched_at  # type: ignore
+        ]
+        self.repository.create(
+            IngestionCoverages(start_time=start_time, end_time=end_time, fetched_at=fetched_at, metadata_id=metadata_id)
+        )
+        self.repository.delete_by_ids(superseded_ids)  # type: ignore
+
+
+class AsyncCoverageLedger:
+    """
+    Read-only view of the coverage ledger for request handlers, checking freshness without leaving the event loop.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.repository = AsyncDatabaseRepository(IngestionCoverages, session)
+
+    async def stale_intervals(
+        self, start_time: datetime, end_time: datetime, now: datetime | None = None
+    ) -> list[tuple[datetime, datetime]]:
+        """Return the sub-intervals of [start_time, end_time) that are missing or stale in the ledger."""
+        now = now or utc_now()
+        coverages = [
+            (coverage.start_time, coverage.end_time, coverage.fetched_at)
+            for coverage in await self.repository.get_overlapping("start_time", "end_time", start_time, end_time)
+        ]
+        return find_stale_intervals(start_time, end_time, coverages, now)  # type: ignore
@@ -1,82 +1,278 @@
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from queue import Full, Queue
+from threading import Event
 
 from fastapi import HTTPException, status
 
+from src.api.base_api import APIResponseError
 from src.api.clients.usgs_earthquake_client import USGSEarthquakeClient
+from src.api.sync_facade import SyncClientFacade
+from src.app.config import Environment
 from src.app.database.config import SessionLocal
 from src.app.database.models import Features, Metadatas
 from src.app.repositories.database_repository import DatabaseRepository
-from src.data_integration.helpers import create_feature, create_metadata
+from src.data_integration.coverage import CoverageLedger, utc_now
+from src.data_integration.geojson_stream import FeatureCollectionStream
+from src.data_integration.helpers import create_feature_columns, create_metadata
+from src.data_integration.invalidation import ingestion_invalidations
 from src.logger import Logger
 
+SEARCH_LIMIT = 20000
+MIN_WINDOW = timedelta(minutes=1)
+BATCH_SIZE = 1000
+
+
+@dataclass
+class WindowBatch:
+    """Batch of features streamed from one time window; `features` is None on the last message of the window."""
+
+    window: tuple[datetime, datetime]
+    metadata: dict
+    features: list[dict] | None
+    error: Exception | None = None
+    # Bytes of the response body read since the previous batch of the window.
+    size: int = 0
+
 
 class EarthquakeUSGSETL:
     logger = Logger(__name__)
 
-    def __init__(self):
-        self.client = USGSEarthquakeClient()
+    def __init__(
+        self,
+        client: USGSEarthquakeClient | SyncClientFacade | None = None,
+        max_workers: int = Environment.USGS_MAX_WORKERS,
+        batch_size: int = BATCH_SIZE,
+    ):
+        # A client handed in by the caller (e.g. the application-wide pooled one) is shared and not closed here.
+        self.owns_client = client is None
+        self.client = client or USGSEarthquakeClient()
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        # The session and repositories are reused by every run of the instance, e.g. by a backfill worker.
         self.db_session = SessionLocal()
+        self.metadata_repository = DatabaseRepository(Metadatas, self.db_session)
+        self.features_repository = DatabaseRepository(Features, self.db_session)
+        self.coverage_ledger = CoverageLedger(self.db_session)
+        # (earliest, latest) times of the features written or deleted by this run, announced to caches at the end.
+        self.written_spans: list[tuple[datetime, datetime]] = []
+        # Counters over every run of the instance.
+        self.rows_upserted = 0
+        self.bytes_downloaded = 0
+        # Windows of the last run whose download failed; they are left out of the coverage ledger.
+        self.failed_windows: list[tuple[datetime, datetime]] = []
 
     def ingest_metadata(self, metadata: dict) -> uuid.UUID:
         metadata_db = create_metadata(metadata)
-        metadata_repository = DatabaseRepository(Metadatas, self.db_session)
         try:
-            metadata_repository.create(metadata_db)
+            self.metadata_repository.create(metadata_db)
             return metadata_db.id  # type: ignore
         except Exception as e:
             self.logger.error(f"Error ingesting metadata: {e}")
             raise e
 
     def ingest_features(self, features: list[dict], metadata_id: uuid.UUID) -> None:
-        """Upsert features to database, updating existing records based on event_id."""
+        """Upsert features to database, updating existing records based on event_id when their `updated` moved."""
         if not features:
             self.logger.warning("No features to ingest")
             return
 
-        features_db_list = []
-        for feature in features:
-            feature_db = create_feature(feature, metadata_id)
-            features_db_list.append(feature_db)
+        feature_columns = create_feature_columns(features, metadata_id)
 
-        features_repository = DatabaseRepository(Features, self.db_session)
         try:
-            upserted_count = features_repository.bulk_upsert(features_db_list, conflict_column="event_id")
-            self.logger.info(f"Successfully upserted {upserted_count} features")
+            load_stats = self.features_repository.bulk_copy_upsert_columns(
+                feature_columns, conflict_column="event_id", change_column="updated", span_column="time"
+            )
+            self.logger.info(
+                f"Successfully upserted {load_stats.rows} features ({load_stats.rows_per_second:.0f} rows/s): "
+                f"{load_stats.inserted} inserted, {load_stats.updated} updated, {load_stats.unchanged} unchanged"
+            )
+            self.rows_upserted += load_stats.rows
+            if load_stats.written_span is not None:
+                self.add_written_span(*load_stats.written_span)
         except Exception as e:
             self.logger.error(f"Error upserting features: {e}")
             raise e
 
+    def delete_features(self, event_ids: list[str]) -> int:
+        """Delete the features of events removed from the USGS catalog, returning how many were found."""
+        deleted_times = self.features_repository.delete_by_values("event_id", event_ids, returning_column="time")
+        for deleted_time in deleted_times:
+            if deleted_time is not None:
+                self.add_written_span(deleted_time, deleted_time)
+        self.logger.info(f"Deleted {len(deleted_times)} of {len(event_ids)} features removed from the USGS catalog")
+        return len(deleted_times)
+
+    def add_written_span(self, start_time: datetime, end_time: datetime) -> None:
+        """
+        Record that features between start_time and end_time (inclusive) were written.
+
+        Overlapping spans are merged, while disjoint ones are kept apart, so that caches only drop the data of
+        the time spans the run actually wrote to, not of everything between them.
+        """
+        spans = sorted([*self.written_spans, (start_time, end_time)])
+        self.written_spans = [spans[0]]
+        for span_start, span_end in spans[1:]:
+            last_start, last_end = self.written_spans[-1]
+            if span_start <= last_end:
+                self.written_spans[-1] = (last_start, max(last_end, span_end))
+            else:
+                self.written_spans.append((span_start, span_end))
+
+    def count_window(self, start_time: datetime, end_time: datetime) -> int:
+        """Count the events of a time window using the USGS count endpoint."""
+        response = self.client.count_earthquakes(start_time=start_time, end_time=end_time)
+        response.raise_for_status()
+        return int(response.json().get("count", 0))
+
+    def plan_windows(self, start_time: datetime, end_time: datetime) -> list[tuple[datetime, datetime, int]]:
+        """
+        Split a time range recursively until every window fits under the USGS search limit.
+
+        Returns:
+            List of (start_time, end_time, count) windows covering the range
+        """
+        count = self.count_window(start_time, end_time)
+        if count <= SEARCH_LIMIT or end_time - start_time <= MIN_WINDOW:
+            return [(start_time, end_time, count)]
+
+        # The API only accepts whole seconds, so the split point must not carry microseconds.
+        middle_time = start_time + timedelta(seconds=(end_time - start_time).total_seconds() // 2)
+        self.logger.info(f"{count} events between {start_time} and {end_time}, splitting at {middle_time}")
+        return self.plan_windows(start_time, middle_time) + self.plan_windows(middle_time, end_time)
+
+    @staticmethod
+    def _put(batches: Queue, batch: WindowBatch, cancelled: Event) -> bool:
+        """Put a batch on the bounded queue, giving up once the consumer has been cancelled."""
+        while not cancelled.is_set():
+            try:
+                batches.put(batch, timeout=1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def stream_window(self, start_time: datetime, end_time: datetime, batches: Queue, cancelled: Event) -> None:
+        """Stream a single time window from the USGS API into the batch queue, one batch at a time."""
+        window = (start_time, end_time)
+        chunks = self.client.stream_earthquakes(start_time=start_time, end_time=end_time, format_type="geojson")
+        stream = FeatureCollectionStream(chunks, batch_size=self.batch_size)
+        error = None
+        reported_size = 0
+        try:
+            for features in stream.iter_batches():
+                size, reported_size = stream.bytes_read - reported_size, stream.bytes_read
+                if not self._put(batches, WindowBatch(window, stream.metadata, features, size=size), cancelled):
+                    return
+        except Exception as e:
+            error = e
+        finally:
+            chunks.close()
+        size = stream.bytes_read - reported_size
+        self._put(batches, WindowBatch(window, stream.metadata, None, error, size), cancelled)
+
+    def handle_window_error(self, error: Exception) -> None:
+        """Log a failed window, raising for the errors the caller must see."""
+        if not isinstance(error, APIResponseError):
+            raise error
+
+        self.logger.error(f"Error: {error.status_code} - {error.text}")
+        if "matching events exceeds search limit of 20000" in error.text:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Matching events exceeds search limit of 20000, choose a minor range of dates",
+            )
+
     def main(self, start_time: str, end_time: str):
-        """Main function ingesting USGS Earthquake API data to database."""
+        """
+        Main function ingesting USGS Earthquake API data to database.
+
+        Only the sub-intervals of the range that are missing or stale in the coverage ledger are fetched,
+        so repeated requests for an already ingested range are served from the database alone. Intervals
+        above the USGS search limit are split into windows that are fetched concurrently and ingested
+        as a single run sharing one metadata record.
+
+        Responses are parsed while they are downloaded and handed over in batches of `batch_size` features
+        through a bounded queue, so memory stays flat however many events the range holds.
+        """
 
         try:
-            response = self.client.query_earthquakes(start_time=start_time, end_time=end_time, format_type="geojson")
-
-            if response.status_code == 200:
-                data = response.json()
-                features = data.get("features", [])
-                self.logger.info(f"Total earthquakes found: {data.get('metadata', {}).get('count', 0)}")
-
-                metadata_id = self.ingest_metadata(data.get("metadata", {}))
-                self.logger.info(f"Metadata ingested with ID: {metadata_id}")
-
-                if features:
-                    self.ingest_features(features, metadata_id)
-                    self.logger.info(f"Successfully processed {len(features)} earthquake features")
-                else:
-                    self.logger.warning("No features found in the response")
-                return metadata_id
+            start_time_fmt = datetime.strptime(start_time, "%Y-%m-%d")
+            end_time_fmt = datetime.strptime(end_time, "%Y-%m-%d")
+
+            stale_intervals = self.coverage_ledger.stale_intervals(start_time_fmt, end_time_fmt)
+            if not stale_intervals:
+                self.logger.info(f"Range {start_time} to {end_time} already ingested and fresh, skipping fetch")
+                return None
+
+            fetched_at = utc_now()
+            windows = [window for interval in stale_intervals for window in self.plan_windows(*interval)]
+            total_count = sum(count for _, _, count in windows)
+            self.logger.info(f"Total earthquakes found: {total_count} in {len(windows)} window(s)")
+
+            metadata_id = None
+            processed_count = 0
+            self.failed_windows = []
+            workers = max(1, min(self.max_workers, len(windows)))
+            batches: Queue = Queue(maxsize=workers * 2)
+            cancelled = Event()
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for window_start, window_end, _ in windows:
+                    executor.submit(self.stream_window, window_start, window_end, batches, cancelled)
+
+                try:
+                    pending_windows = len(windows)
+                    while pending_windows:
+                        batch = batches.get()
+                        self.bytes_downloaded += batch.size
+
+                        if metadata_id is None and batch.error is None:
+                            metadata_id = self.ingest_metadata({**batch.metadata, "count": total_count})
+                            self.logger.info(f"Metadata ingested with ID: {metadata_id}")
+
+                        if batch.features is not None:
+                            self.ingest_features(batch.features, metadata_id)  # type: ignore
+                            processed_count += len(batch.features)
+                            continue
+
+                        pending_windows -= 1
+                        if batch.error is not None:
+                            self.failed_windows.append(batch.window)
+                            self.handle_window_error(batch.error)
+                except BaseException:
+                    cancelled.set()
+                    raise
+
+            if metadata_id is None:
+                return None
+
+            if processed_count:
+                self.logger.info(f"Successfully processed {processed_count} earthquake features")
             else:
-                self.logger.error(f"Error: {response.status_code} - {response.text}")
-                if "matching events exceeds search limit of 20000" in response.text:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Matching events exceeds search limit of 20000, choose a minor range of dates",
-                    )
+                self.logger.warning("No features found in the response")
+
+            for interval_start, interval_end in stale_intervals:
+                if any(
+                    interval_start <= window_start and window_end <= interval_end
+                    for window_start, window_end in self.failed_windows
+                ):
+                    continue
+                self.coverage_ledger.record(interval_start, interval_end, fetched_at, metadata_id)
+            return metadata_id
 
         finally:
+            self.close()
+
+    def close(self) -> None:
+        """Announce the written time spans to the caches and release the database session and owned client."""
+        for written_start, written_end in self.written_spans:
+            ingestion_invalidations.notify(written_start, written_end)
+        self.written_spans = []
+        if self.owns_client:
             self.client.close()
-            self.db_session.close()
+        self.db_session.close()
 
 
 if __name__ == "__main__":
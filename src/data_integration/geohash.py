@@ -0,0 +1,136 @@
+"""
+Geohash encoding and great-circle helpers backing the spatial search on features.
+
+A geohash interleaves longitude and latitude bits into a base32 string, so points close to each other
+share a prefix and a B-tree index on the string answers "all points inside this cell" as a prefix range scan.
+"""
+
+import math
+from collections.abc import Sequence
+
+import numpy as np
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 8
+EARTH_RADIUS_KM = 6371.0088
+# Half of the equator: no two points on Earth are further apart along a great circle.
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+_BASE32_CHARACTERS = np.array(list(BASE32))
+
+
+def _bits(precision: int) -> tuple[int, int]:
+    """Number of (latitude, longitude) bits of a geohash of `precision` characters."""
+    return 5 * precision // 2, (5 * precision + 1) // 2
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """Height and width in degrees of a geohash cell of `precision` characters."""
+    lat_bits, lon_bits = _bits(precision)
+    return 180.0 / 2**lat_bits, 360.0 / 2**lon_bits
+
+
+def encode_many(
+    latitudes: Sequence[float | None], longitudes: Sequence[float | None], precision: int = PRECISION
+) -> list[str | None]:
+    """
+    Encode coordinates as geohashes, vectorized with NumPy.
+
+    Args:
+        latitudes: Latitudes in degrees, None for unknown
+        longitudes: Longitudes in degrees, None for unknown
+        precision: Number of characters of the geohashes
+
+    Returns:
+        Geohashes, None where a coordinate is unknown
+    """
+    lat = np.array(latitudes, dtype=np.float64)
+    lon = np.array(longitudes, dtype=np.float64)
+    missing = np.isnan(lat) | np.isnan(lon)
+    lat_bits, lon_bits = _bits(precision)
+
+    # Quantize each coordinate to its cell index, then interleave the bits starting with longitude.
+    lat_index = np.clip(np.floor((np.nan_to_num(lat) + 90.0) / 180.0 * 2**lat_bits), 0, 2**lat_bits - 1)
+    lon_index = np.clip(np.floor((np.nan_to_num(lon) + 180.0) / 360.0 * 2**lon_bits), 0, 2**lon_bits - 1)
+    lat_index, lon_index = lat_index.astype(np.int64), lon_index.astype(np.int64)
+
+    code = np.zeros(len(lat), dtype=np.int64)
+    for bit in range(5 * precision):
+        if bit % 2 == 0:
+            lon_bits -= 1
+            code = (code << 1) | ((lon_index >> lon_bits) & 1)
+        else:
+            lat_bits -= 1
+            code = (code << 1) | ((lat_index >> lat_bits) & 1)
+
+    shifts = np.arange(precision - 1, -1, -1, dtype=np.int64) * 5
+    characters = _BASE32_CHARACTERS[(code[:, None] >> shifts) & 31]
+    geohashes = ["".join(row) for row in characters.tolist()]
+    return [None if is_missing else geohash for geohash, is_missing in zip(geohashes, missing.tolist(), strict=True)]
+
+
+def encode(latitude: float | None, longitude: float | None, precision: int = PRECISION) -> str | None:
+    """Encode a single coordinate as a geohash, None if it is unknown."""
+    return encode_many([latitude], [longitude], precision)[0]
+
+
+def haversine_km(latitude_1: float, longitude_1: float, latitude_2: float, longitude_2: float) -> float:
+    """Great-circle distance in kilometers between two points."""
+    phi_1, phi_2 = math.radians(latitude_1), math.radians(latitude_2)
+    d_phi = phi_2 - phi_1
+    d_lambda = math.radians(longitude_2 - longitude_1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi_1) * math.cos(phi_2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def cover(latitude: float, longitude: float, radius_km: float, max_cells: int = 32) -> list[str]:
+    """
+    Compute geohash prefixes whose cells together contain the circle of `radius_km` around a point.
+
+    The longest prefix length for which the bounding box of the circle needs at most `max_cells` cells
+    is used, so candidates are fetched with few index range scans and few points outside the circle.
+
+    Args:
+        latitude: Latitude of the center in degrees
+        longitude: Longitude of the center in degrees
+        radius_km: Radius of the circle in kilometers
+        max_cells: Maximum number of prefixes to return
+
+    Returns:
+        Sorted geohash prefixes; [""] (every point) when the circle is too large to be covered
+    """
+    radius_degrees = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - radius_degrees, latitude + radius_degrees
+    if radius_km >= MAX_DISTANCE_KM / 2 or min_lat <= -90.0 or max_lat >= 90.0:
+        # Circles this large, or containing a pole, span every longitude.
+        min_lon, max_lon = -180.0, 180.0
+        min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+    else:
+        # Widest longitude span of the circle, reached at the latitude where it touches its bounding meridians.
+        lon_degrees = math.degrees(
+            math.asin(min(1.0, math.sin(math.radians(radius_degrees)) / math.cos(math.radians(latitude))))
+        )
+        min_lon, max_lon = longitude - lon_degrees, longitude + lon_degrees
+
+    for precision in range(PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = math.floor((max_lat + 90.0) / height) - math.floor((min_lat + 90.0) / height) + 1
+        columns = min(
+            math.floor((max_lon + 180.0) / width) - math.floor((min_lon + 180.0) / width) + 1, 2 ** _bits(precision)[1]
+        )
+        if rows * columns > max_cells:
+            continue
+
+        latitudes, longitudes = [], []
+        first_row = math.floor((max(min_lat, -90.0) + 90.0) / height)
+        first_column = math.floor((min_lon + 180.0) / width)
+        for row in range(rows):
+            cell_lat = min(-90.0 + (first_row + row + 0.5) * height, 90.0 - height / 2)
+            for column in range(columns):
+                # Wrap around the antimeridian.
+                cell_lon = (first_column + column + 0.5) * width % 360.0 - 180.0
+                latitudes.append(cell_lat)
+                longitudes.append(cell_lon)
+        return sorted(set(encode_many(latitudes, longitudes, precision)))  # type: ignore
+
+    return [""]
@@ -0,0 +1,116 @@
+import codecs
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+_NUMBER_CHARACTERS = "0123456789+-.eE"
+
+
+class FeatureCollectionStream:
+    """
+    Incremental parser of a GeoJSON FeatureCollection.
+
+    The body is read chunk by chunk and the "features" array is yielded in fixed-size batches, so only
+    the current batch and a small read buffer are held in memory however large the collection is.
+    Every other top-level member is decoded whole; "metadata" is exposed through the `metadata`
+    attribute as soon as it has been read, which for USGS responses is before the first feature.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], batch_size: int = 1000):
+        self.chunks = iter(chunks)
+        self.batch_size = batch_size
+        self.metadata: dict[str, Any] = {}
+        self.bytes_read = 0
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, returning False once the body is exhausted."""
+        if self._eof:
+            return False
+        # Drop the consumed prefix so the buffer only grows with the value being decoded.
+        self._buffer = self._buffer[self._position :]
+        self._position = 0
+        for chunk in self.chunks:
+            self.bytes_read += len(chunk)
+            text = self._text_decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        self._eof = True
+        return False
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in " \t\n\r":
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                raise ValueError("Unexpected end of GeoJSON document")
+
+    def _expect(self, *characters: str) -> str:
+        character = self._peek()
+        if character not in characters:
+            raise ValueError(f"Invalid GeoJSON document: expected {' or '.join(characters)}, found {character!r}")
+        self._position += 1
+        return character
+
+    def _decode_value(self) -> Any:
+        """Decode the next complete JSON value, reading more chunks until it is available."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+                # A number followed only by characters that may continue it, e.g. "6." or nothing at all, may be
+                # truncated by the end of the buffer, confirm with more data.
+                if self._eof or (
+                    end < len(self._buffer)
+                    and (self._buffer[end] not in _NUMBER_CHARACTERS or self._buffer[end:].strip(_NUMBER_CHARACTERS))
+                ):
+                    self._position = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def iter_batches(self) -> Iterator[list[dict[str, Any]]]:
+        """Yield the features of the collection in lists of at most `batch_size` items."""
+        self._expect("{")
+        if self._peek() == "}":
+            return
+
+        while True:
+            key = self._decode_value()
+            self._expect(":")
+            if key == "features":
+                yield from self._iter_feature_batches()
+            elif key == "metadata":
+                self.metadata = self._decode_value()
+            else:
+                self._decode_value()
+            if self._expect(",", "}") == "}":
+                return
+
+    def _iter_feature_batches(self) -> Iterator[list[dict[str, Any]]]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._position += 1
+            return
+
+        batch = []
+        while True:
+            batch.append(self._decode_value())
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+            if self._expect(",", "]") == "]":
+                break
+        if batch:
+            yield batch
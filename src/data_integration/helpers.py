@@ -1,7 +1,13 @@
 import uuid
-from datetime import datetime
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+from sqlalchemy import Integer, Numeric
 
 from src.app.database.models import Features, Metadatas
+from src.data_integration import geohash
 
 
 def unix_timestamp_to_datetime(unix_timestamp: int) -> datetime:
@@ -55,7 +61,128 @@ def create_feature(feature: dict, metadata_id: uuid.UUID) -> Features:
         latitude=coordinates[1] if len(coordinates) > 1 else 0,  # latitude
         longitude=coordinates[0] if len(coordinates) > 0 else 0,  # longitude
         depth=coordinates[2] if len(coordinates) > 2 else 0,  # depth
+        geohash=geohash.encode(
+            coordinates[1] if len(coordinates) > 1 else 0, coordinates[0] if len(coordinates) > 0 else 0
+        ),
         event_id=feature.get("id", ""),
         metadata_id=metadata_id,
     )
     return feature_db
+
+
+# Features column -> (GeoJSON property, default when the property is missing), mirroring create_feature.
+FEATURE_PROPERTY_COLUMNS: dict[str, tuple[str, Any]] = {
+    "mag": ("mag", 0),
+    "place": ("place", ""),
+    "tz": ("tz", 0),
+    "url": ("url", ""),
+    "detail": ("detail", ""),
+    "felt": ("felt", 0),
+    "cdi": ("cdi", 0),
+    "mmi": ("mmi", 0),
+    "alert": ("alert", ""),
+    "status": ("status", ""),
+    "tsunami": ("tsunami", 0),
+    "sig": ("sig", 0),
+    "net": ("net", ""),
+    "code": ("code", ""),
+    "ids": ("ids", ""),
+    "sources": ("sources", ""),
+    "types": ("types", ""),
+    "nst": ("nst", 0),
+    "dmin": ("dmin", 0),
+    "rms": ("rms", 0),
+    "gap": ("gap", 0),
+    "mag_type": ("magType", ""),
+}
+
+
+def _utc_offset_seconds(timestamp: int) -> int:
+    """Offset of the local timezone at a UNIX timestamp, as applied by datetime.fromtimestamp."""
+    return int(
+        (
+            datetime.fromtimestamp(timestamp) - datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+        ).total_seconds()
+    )
+
+
+def unix_timestamps_to_datetimes(unix_timestamps: Sequence[float]) -> np.ndarray:
+    """
+    Vectorized unix_timestamp_to_datetime: convert epoch milliseconds to naive local datetimes.
+
+    The local timezone offset is looked up once per distinct hour instead of once per value; hours
+    containing an offset transition fall back to datetime.fromtimestamp for their values.
+
+    Args:
+        unix_timestamps: Epoch timestamps in milliseconds
+
+    Returns:
+        datetime64[us] array of naive local times
+    """
+    milliseconds = np.asarray(unix_timestamps, dtype=np.float64)
+    if np.isnan(milliseconds).any():
+        raise TypeError("Timestamps must not be null")
+    microseconds = np.rint(milliseconds * 1000).astype(np.int64)
+
+    hours, hour_index = np.unique(np.floor_divide(microseconds, 3_600_000_000), return_inverse=True)
+    offsets = np.empty(len(hours), dtype=np.int64)
+    uniform = np.ones(len(hours), dtype=bool)
+    for i, hour in enumerate(hours.tolist()):
+        offsets[i] = _utc_offset_seconds(hour * 3600)
+        uniform[i] = offsets[i] == _utc_offset_seconds(hour * 3600 + 3599)
+
+    local_times = (microseconds + offsets[hour_index] * 1_000_000).astype("datetime64[us]")
+    for i in np.flatnonzero(~uniform[hour_index]).tolist():
+        local_times[i] = unix_timestamp_to_datetime(milliseconds[i].item())
+    return local_times
+
+
+def _float_array(values: Sequence[float | None]) -> np.ndarray:
+    """float64 array of the values, NaN where they are null."""
+    return np.array(values, dtype=np.float64)
+
+
+def _integer_array(values: Sequence[int | None]) -> np.ma.MaskedArray:
+    """int64 masked array of the values, masked where they are null."""
+    floats = np.array(values, dtype=np.float64)
+    missing = np.isnan(floats)
+    return np.ma.MaskedArray(np.where(missing, 0, floats).astype(np.int64), mask=missing)
+
+
+def create_feature_columns(features: list[dict], metadata_id: uuid.UUID) -> dict[str, Any]:
+    """
+    Columnar counterpart of create_feature: transform a batch of GeoJSON features into column arrays.
+
+    Column values follow create_feature exactly (same defaults for missing properties, explicit nulls
+    kept as nulls), without building a Features instance per event. Timestamps are datetime64 arrays,
+    decimal columns float64 arrays with NaN for nulls and integer columns int64 masked arrays.
+
+    Args:
+        features: GeoJSON features
+        metadata_id: ID of the metadata record the features belong to
+
+    Returns:
+        Dictionary of Features column name to a list or NumPy array of values, one per feature
+    """
+    properties = [feature.get("properties", {}) for feature in features]
+    coordinates = [feature.get("geometry", {}).get("coordinates", [0, 0, 0]) for feature in features]
+
+    columns: dict[str, Any] = {}
+    for column, (key, default) in FEATURE_PROPERTY_COLUMNS.items():
+        values = [feature_properties.get(key, default) for feature_properties in properties]
+        column_type = Features.__table__.c[column].type
+        if isinstance(column_type, Integer):
+            columns[column] = _integer_array(values)
+        elif isinstance(column_type, Numeric):
+            columns[column] = _float_array(values)
+        else:
+            columns[column] = values
+    columns["time"] = unix_timestamps_to_datetimes([p.get("time", 0) for p in properties])
+    columns["updated"] = unix_timestamps_to_datetimes([p.get("updated", 0) for p in properties])
+    columns["latitude"] = _float_array([c[1] if len(c) > 1 else 0 for c in coordinates])
+    columns["longitude"] = _float_array([c[0] if len(c) > 0 else 0 for c in coordinates])
+    columns["depth"] = _float_array([c[2] if len(c) > 2 else 0 for c in coordinates])
+    columns["geohash"] = geohash.encode_many(columns["latitude"], columns["longitude"])
+    columns["event_id"] = [feature.get("id", "") for feature in features]
+    columns["metadata_id"] = [metadata_id] * len(features)
+    return columns
@@ -0,0 +1,85 @@
+"""
+Notifications of the time windows whose features were written by the ETL, for caches of derived data.
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from threading import Lock
+
+from src.app.domains.result_cache import RedisResultCache, create_result_cache
+from src.app.domains.visualization.tile_cache import TileCache
+from src.logger import Logger
+
+Listener = Callable[[datetime, datetime], None]
+
+
+class InvalidationRegistry:
+    """
+    Registry of listeners called with the (start, end) time span of the features each ETL run wrote.
+
+    Listeners are called synchronously from the thread running the ETL, so they must be thread-safe and
+    quick; an exception raised by a listener is logged and does not fail the ingestion.
+    """
+
+    logger = Logger(__name__)
+
+    def __init__(self):
+        self._listeners: list[Listener] = []
+        self._lock = Lock()
+
+    def subscribe(self, listener: Listener) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def notify(self, start_time: datetime, end_time: datetime) -> None:
+        """
+        Call every listener with a time span whose features were inserted or updated.
+
+        Args:
+            start_time: Time of the earliest written feature (inclusive)
+            end_time: Time of the latest written feature (inclusive)
+        """
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(start_time, end_time)
+            except Exception as e:
+                self.logger.error(f"Error invalidating {start_time} to {end_time} in {listener}: {e}")
+
+
+ingestion_invalidations = InvalidationRegistry()
+
+
+@contextmanager
+def shared_cache_invalidation() -> Iterator[None]:
+    """
+    Invalidate the caches the API shares between processes while the context is open, for ingestions run
+    outside of the API process.
+
+    The disk tile cache and, with a Redis RESULT_CACHE_URL, the result cache are dropped for the time spans
+    written. The in-memory caches of the API workers cannot be reached and expire after their time to live.
+    """
+    listeners = []
+    tile_cache = TileCache()
+    if tile_cache.directory:
+        listeners.append(tile_cache.invalidate)
+    result_cache = create_result_cache()
+    if isinstance(result_cache, RedisResultCache):
+        listeners.append(result_cache.invalidate)
+
+    for listener in listeners:
+        ingestion_invalidations.subscribe(listener)
+    try:
+        yield
+    finally:
+        for listener in listeners:
+            ingestion_invalidations.unsubscribe(listener)
+        if isinstance(result_cache, RedisResultCache):
+            result_cache.sync_client.close()
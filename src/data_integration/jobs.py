@@ -0,0 +1,284 @@
+"""
+Background ingestion of large date ranges: a job is split into day-sized chunks, persisted in PostgreSQL and run
+by a local thread pool, without an external broker.
+"""
+
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, select
+from starlette.concurrency import run_in_threadpool
+
+from src.api.clients.usgs_earthquake_client import USGSEarthquakeClient
+from src.api.sync_facade import SyncClientFacade
+from src.app.config import Environment
+from src.app.database.config import SessionLocal
+from src.app.database.models import IngestionJobChunks, IngestionJobs
+from src.app.repositories.database_repository import DatabaseRepository
+from src.data_integration.coverage import utc_now
+from src.data_integration.earthquake_usgs import EarthquakeUSGSETL
+from src.logger import Logger
+
+CHUNK_SIZE = timedelta(days=1)
+# A chunk still running after this long was interrupted (e.g. its worker process died) and may be run again.
+CHUNK_TIMEOUT = timedelta(hours=1)
+
+# Jobs submitted to the API are resumed by the API, backfill jobs by the backfill CLI.
+API_ORIGIN = "api"
+BACKFILL_ORIGIN = "backfill"
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def plan_chunks(
+    start_time: datetime, end_time: datetime, chunk_size: timedelta = CHUNK_SIZE
+) -> list[tuple[datetime, datetime]]:
+    """Split [start_time, end_time) into consecutive chunks of `chunk_size`, the last one possibly shorter."""
+    if chunk_size <= timedelta(0):
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    chunks = []
+    chunk_start = start_time
+    while chunk_start < end_time:
+        chunk_end = min(chunk_start + chunk_size, end_time)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end
+    return chunks
+
+
+@dataclass
+class IngestJobProgress:
+    """Progress of a job, aggregated from its chunks."""
+
+    status: str
+    chunks_total: int = 0
+    chunks_pending: int = 0
+    chunks_running: int = 0
+    chunks_succeeded: int = 0
+    chunks_failed: int = 0
+    rows_upserted: int = 0
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    metadata_ids: list[uuid.UUID] = field(default_factory=list)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the first chunk started, up to the end of the job once it finished."""
+        if self.started_at is None:
+            return 0.0
+        return ((self.finished_at or utc_now()) - self.started_at).total_seconds()
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_upserted / self.elapsed if self.elapsed else 0.0
+
+
+def job_progress(chunks: list[IngestionJobChunks]) -> IngestJobProgress:
+    """
+    Aggregate the chunks of a job.
+
+    A job is pending until a chunk starts, running while chunks are left, then failed if any chunk failed and
+    succeeded otherwise.
+    """
+    counts = dict.fromkeys((PENDING, RUNNING, SUCCEEDED, FAILED), 0)
+    for chunk in chunks:
+        counts[chunk.status] += 1  # type: ignore
+
+    if counts[PENDING] == len(chunks):
+        status = PENDING
+    elif counts[PENDING] or counts[RUNNING]:
+        status = RUNNING
+    elif counts[FAILED]:
+        status = FAILED
+    else:
+        status = SUCCEEDED
+
+    started = [chunk.started_at for chunk in chunks if chunk.started_at is not None]
+    finished = [chunk.finished_at for chunk in chunks if chunk.finished_at is not None]
+    return IngestJobProgress(
+        status=status,
+        chunks_total=len(chunks),
+        chunks_pending=counts[PENDING],
+        chunks_running=counts[RUNNING],
+        chunks_succeeded=counts[SUCCEEDED],
+        chunks_failed=counts[FAILED],
+        rows_upserted=sum(chunk.rows_upserted or 0 for chunk in chunks),  # type: ignore
+        started_at=min(started, default=None),  # type: ignore
+        finished_at=max(finished, default=None) if status in (SUCCEEDED, FAILED) else None,  # type: ignore
+        metadata_ids=[chunk.metadata_id for chunk in chunks if chunk.metadata_id is not None],  # type: ignore
+    )
+
+
+@dataclass
+class IngestJobRunnerStats:
+    """Counters of an IngestJobRunner since it was created."""
+
+    chunks_succeeded: int = 0
+    chunks_failed: int = 0
+    rows_upserted: int = 0
+    bytes_downloaded: int = 0
+
+
+class IngestJobRunner:
+    """
+    Thread pool running the pending chunks of the ingestion jobs with the regular ETL.
+
+    Chunk states live in the `ingestion_job_chunks` table and a chunk is claimed with a conditional update
+    before it runs, so every API worker can run its own pool: a chunk is never run twice at once, and the
+    chunks left pending by a stopped worker are resumed by the next one to start.
+
+    Each thread of the pool keeps its own ETL, whose database session and bulk loader are reused by every chunk
+    the thread runs.
+    """
+
+    logger = Logger(__name__)
+
+    def __init__(
+        self,
+        client: USGSEarthquakeClient | SyncClientFacade | None = None,
+        max_workers: int = Environment.INGEST_JOB_WORKERS,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            client: USGS client, shared with the caller and not closed; None to own a new one
+            max_workers: Number of chunks run concurrently
+        """
+        self.owns_client = client is None
+        self.client = client or USGSEarthquakeClient()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest-job")
+        self._local = threading.local()
+        self._etls: list[EarthquakeUSGSETL] = []
+        self._lock = threading.Lock()
+        self.counters = IngestJobRunnerStats()
+
+    def stats(self) -> IngestJobRunnerStats:
+        """Return the counters, with the rows and bytes of the chunks still running."""
+        with self._lock:
+            return replace(
+                self.counters,
+                rows_upserted=sum(etl.rows_upserted for etl in self._etls),
+                bytes_downloaded=sum(etl.bytes_downloaded for etl in self._etls),
+            )
+
+    def _etl(self) -> EarthquakeUSGSETL:
+        """Return the ETL of the current thread."""
+        etl = getattr(self._local, "etl", None)
+        if etl is None:
+            etl = EarthquakeUSGSETL(client=self.client)
+            self._local.etl = etl
+            with self._lock:
+                self._etls.append(etl)
+        return etl
+
+    def enqueue(self, chunk_ids: list[uuid.UUID]) -> list[Future]:
+        """Queue chunks to run, in order, returning the futures of their `run_chunk` calls."""
+        return [self.executor.submit(self.run_chunk, chunk_id) for chunk_id in chunk_ids]
+
+    def resume(self) -> int:
+        """
+        Queue the chunks of API jobs left pending, or running for longer than CHUNK_TIMEOUT, by previous runs.
+
+        Returns:
+            Number of chunks queued
+        """
+        db_session = SessionLocal()
+        try:
+            chunks = DatabaseRepository(IngestionJobChunks, db_session).get_all_by(
+                self._claimable(utc_now()),
+                IngestionJobChunks.job_id.in_(select(IngestionJobs.id).where(IngestionJobs.origin == API_ORIGIN)),
+            )
+        finally:
+            db_session.close()
+        chunks.sort(key=lambda chunk: (chunk.job_id, chunk.start_time))  # type: ignore
+        self.enqueue([chunk.id for chunk in chunks])  # type: ignore
+        if chunks:
+            self.logger.info(f"Resumed {len(chunks)} ingestion job chunk(s)")
+        return len(chunks)
+
+    @staticmethod
+    def _claimable(now: datetime):
+        return or_(
+            IngestionJobChunks.status == PENDING,
+            and_(IngestionJobChunks.status == RUNNING, IngestionJobChunks.started_at < now - CHUNK_TIMEOUT),
+        )
+
+    def run_chunk(self, chunk_id: uuid.UUID) -> bool:
+        """
+        Claim a chunk and ingest its date range.
+
+        Args:
+            chunk_id: ID of the chunk
+
+        Returns:
+            Whether the chunk was run, False when another worker claimed it first
+        """
+        db_session = SessionLocal()
+        repository = DatabaseRepository(IngestionJobChunks, db_session)
+        try:
+            started_at = utc_now()
+            if not repository.update_where(
+                chunk_id, self._claimable(started_at), status=RUNNING, started_at=started_at, error=None
+            ):
+                return False
+
+            chunk = repository.get_by_id(chunk_id)
+            etl = self._etl()
+            rows_before = etl.rows_upserted
+            try:
+                metadata_id = etl.main(
+                    start_time=chunk.start_time.strftime("%Y-%m-%d"),  # type: ignore
+                    end_time=chunk.end_time.strftime("%Y-%m-%d"),  # type: ignore
+                )
+                if etl.failed_windows:
+                    raise RuntimeError(f"{len(etl.failed_windows)} window(s) could not be downloaded from USGS")
+            except Exception as e:
+                self.logger.error(f"Error running ingestion job chunk {chunk_id}: {e}")
+                rows_upserted = etl.rows_upserted - rows_before
+                repository.update(
+                    chunk_id, status=FAILED, finished_at=utc_now(), rows_upserted=rows_upserted, error=str(e)
+                )
+                with self._lock:
+                    self.counters.chunks_failed += 1
+                return True
+
+            repository.update(
+                chunk_id,
+                status=SUCCEEDED,
+                finished_at=utc_now(),
+                rows_upserted=etl.rows_upserted - rows_before,
+                metadata_id=metadata_id,
+            )
+            with self._lock:
+                self.counters.chunks_succeeded += 1
+            return True
+        except Exception as e:
+            # The chunk stays claimed and is run again once CHUNK_TIMEOUT has passed.
+            self.logger.error(f"Error updating ingestion job chunk {chunk_id}: {e}")
+            return False
+        finally:
+            db_session.close()
+
+    def shutdown(self, cancel_pending: bool = True) -> None:
+        """
+        Wait for the running chunks to finish and release the pool.
+
+        Args:
+            cancel_pending: Whether to drop the queued chunks, which stay pending, instead of running them first
+        """
+        self.executor.shutdown(wait=True, cancel_futures=cancel_pending)
+        if self.owns_client:
+            self.client.close()
+
+    async def start(self) -> None:
+        await run_in_threadpool(self.resume)
+
+    async def stop(self) -> None:
+        """Drop the queued chunks, which stay pending, and wait for the running ones to finish."""
+        await run_in_threadpool(self.shutdown)
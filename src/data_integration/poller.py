@@ -0,0 +1,239 @@
+"""
+Incremental ingestion of the USGS events changed since the previous poll, using the `updatedafter` filter.
+
+Run it in the API process by setting USGS_POLL_INTERVAL, or on its own with `python -m src.data_integration.poller`.
+"""
+
+import asyncio
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+
+from starlette.concurrency import run_in_threadpool
+
+from src.api.clients.usgs_earthquake_client import USGSEarthquakeClient
+from src.api.sync_facade import SyncClientFacade
+from src.app.config import Environment
+from src.app.database.config import SessionLocal
+from src.app.database.models import IngestionCoverages, IngestionWatermarks
+from src.app.repositories.database_repository import DatabaseRepository
+from src.data_integration.coverage import utc_now
+from src.data_integration.earthquake_usgs import BATCH_SIZE, SEARCH_LIMIT, EarthquakeUSGSETL
+from src.data_integration.geojson_stream import FeatureCollectionStream
+from src.data_integration.invalidation import shared_cache_invalidation
+from src.logger import Logger
+
+FEED_NAME = "usgs_updated"
+# USGS may publish a change a little after its `updated` time, so every poll looks back a bit before the
+# watermark; events seen twice are not rewritten since their `updated` did not move.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+def _midnight(value: datetime) -> datetime:
+    return datetime(value.year, value.month, value.day)
+
+
+class EarthquakeUSGSPoller:
+    """
+    Keep the features of the last `horizon_days` days up to date with the USGS catalog.
+
+    The first poll ingests the whole horizon with the regular ETL. Every following poll moves the start of the
+    window to `horizon_days` days before its own day and only downloads the events updated since the watermark,
+    deleted ones included: changed events are upserted and deleted ones removed. The polled window is then
+    recorded in the coverage ledger, so requests in it are served from the
+    database without calling USGS as long as polls run more often than the freshness policy requires.
+    """
+
+    logger = Logger(__name__)
+
+    def __init__(
+        self,
+        client: USGSEarthquakeClient | SyncClientFacade | None = None,
+        interval: float = Environment.USGS_POLL_INTERVAL,
+        horizon_days: int = Environment.USGS_POLL_HORIZON_DAYS,
+        batch_size: int = BATCH_SIZE,
+    ):
+        """
+        Initialize the poller.
+
+        Args:
+            client: USGS client, shared with the caller and not closed; None to own a new one
+            interval: Seconds between the start of two polls
+            horizon_days: Number of days before each poll kept up to date
+            batch_size: Number of features upserted at once
+        """
+        self.owns_client = client is None
+        self.client = client or USGSEarthquakeClient()
+        self.interval = interval
+        self.horizon_days = horizon_days
+        self.batch_size = batch_size
+        self._task: asyncio.Task | None = None
+
+    def poll(self) -> int:
+        """
+        Apply the changes of the USGS catalog since the previous poll.
+
+        Returns:
+            Number of changed or deleted events downloaded
+        """
+        polled_at = utc_now()
+        # Up to the end of the next day, so requests for "today" are covered whatever the time zone of the caller.
+        end_time = _midnight(polled_at) + timedelta(days=2)
+
+        db_session = SessionLocal()
+        repository = DatabaseRepository(IngestionWatermarks, db_session)
+        try:
+            watermark = repository.get_by(name=FEED_NAME)
+            if watermark is None:
+                self.bootstrap(repository, polled_at, end_time)
+                return 0
+
+            previous_watermark = watermark.watermark
+            # The window slides with the horizon, older events are left to the regular freshness policy.
+            start_time = max(watermark.start_time, _midnight(polled_at) - timedelta(days=self.horizon_days))  # type: ignore
+            etl = EarthquakeUSGSETL(client=self.client, batch_size=self.batch_size)
+            metadata_id = None
+            changed = deleted = latest_update = 0
+            try:
+                batches = self.fetch_changes(
+                    start_time,
+                    end_time,
+                    previous_watermark - WATERMARK_OVERLAP,  # type: ignore
+                )
+                for metadata, features in batches:
+                    deleted_ids = [
+                        f.get("id", "") for f in features if f.get("properties", {}).get("status") == "deleted"
+                    ]
+                    changed_features = [f for f in features if f.get("properties", {}).get("status") != "deleted"]
+                    if changed_features:
+                        if metadata_id is None:
+                            metadata_id = etl.ingest_metadata(metadata)
+                        etl.ingest_features(changed_features, metadata_id)
+                    if deleted_ids:
+                        etl.delete_features(deleted_ids)
+                    changed += len(changed_features)
+                    deleted += len(deleted_ids)
+                    latest_update = max(
+                        [latest_update, *(f.get("properties", {}).get("updated") or 0 for f in features)]
+                    )
+                if metadata_id is not None:
+                    etl.metadata_repository.update(metadata_id, count=changed)
+
+                latest_update_time = datetime.fromtimestamp(latest_update / 1000, timezone.utc).replace(tzinfo=None)
+                new_watermark = max(previous_watermark, latest_update_time)  # type: ignore
+                repository.update(
+                    watermark.id,  # type: ignore
+                    start_time=start_time,
+                    watermark=new_watermark,
+                    polled_at=polled_at,
+                )
+                etl.coverage_ledger.record(start_time, end_time, polled_at, metadata_id)
+            finally:
+                etl.close()
+
+            self.logger.info(
+                f"Polled {changed + deleted} event(s) updated since {previous_watermark}: {changed} changed, "
+                f"{deleted} deleted"
+            )
+            return changed + deleted
+        finally:
+            db_session.close()
+
+    def bootstrap(self, repository: DatabaseRepository, polled_at: datetime, end_time: datetime) -> None:
+        """Ingest the whole horizon with the ETL and create the watermark of the feed."""
+        start_time = _midnight(polled_at) - timedelta(days=self.horizon_days)
+        self.logger.info(f"Bootstrapping the {FEED_NAME} feed from {start_time} to {end_time}")
+        EarthquakeUSGSETL(client=self.client, batch_size=self.batch_size).main(
+            start_time=start_time.strftime("%Y-%m-%d"), end_time=end_time.strftime("%Y-%m-%d")
+        )
+        # Windows the ETL skipped because they were still fresh only hold the changes up to their last fetch.
+        coverages = DatabaseRepository(IngestionCoverages, repository.session).get_overlapping(
+            "start_time", "end_time", start_time, end_time
+        )
+        watermark = min((coverage.fetched_at for coverage in coverages), default=polled_at)
+        repository.create(
+            IngestionWatermarks(name=FEED_NAME, start_time=start_time, watermark=watermark, polled_at=polled_at)
+        )
+
+    def fetch_changes(
+        self, start_time: datetime, end_time: datetime, updated_after: datetime
+    ) -> Iterator[tuple[dict, list[dict]]]:
+        """
+        Download the events of [start_time, end_time) updated after `updated_after`, deleted ones included.
+
+        Responses are parsed while they are downloaded and results above the USGS search limit are fetched page
+        by page, so memory stays flat however many events changed.
+
+        Yields:
+            Tuples of the metadata of the page and a batch of at most `batch_size` of its GeoJSON features
+        """
+        offset = 1
+        while True:
+            chunks = self.client.stream_earthquakes(
+                start_time=start_time,
+                end_time=end_time,
+                format_type="geojson",
+                updatedafter=updated_after.strftime("%Y-%m-%dT%H:%M:%S"),
+                includedeleted="true",
+                orderby="time-asc",
+                limit=SEARCH_LIMIT,
+                offset=offset,
+            )
+            stream = FeatureCollectionStream(chunks, batch_size=self.batch_size)
+            page_size = 0
+            try:
+                for features in stream.iter_batches():
+                    page_size += len(features)
+                    yield stream.metadata, features
+            finally:
+                chunks.close()
+            if page_size < SEARCH_LIMIT:
+                return
+            offset += SEARCH_LIMIT
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling, after the poll in progress if any: worker threads cannot be interrupted."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                await run_in_threadpool(self.poll)
+            except Exception as e:
+                self.logger.error(f"Error polling the USGS API: {e}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def run_forever(self) -> None:
+        """
+        Poll every `interval` seconds until interrupted, for a standalone process.
+
+        The caches shared with the API, on disk and in Redis, are invalidated for the windows each poll writes.
+        """
+        try:
+            with shared_cache_invalidation():
+                while True:
+                    started = time.monotonic()
+                    try:
+                        self.poll()
+                    except Exception as e:
+                        self.logger.error(f"Error polling the USGS API: {e}")
+                    time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if self.owns_client:
+                self.client.close()
+
+
+if __name__ == "__main__":
+    EarthquakeUSGSPoller(interval=Environment.USGS_POLL_INTERVAL or 60).run_forever()
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.data_integration.coverage import HISTORICAL_TTL, find_stale_intervals, freshness_ttl
+
+NOW = datetime(2025, 6, 15, 12, 0)
+DAY = timedelta(days=1)
+
+
+def at(days_ago: float) -> datetime:
+    return NOW - days_ago * DAY
+
+
+@pytest.mark.parametrize(
+    ("days_ago", "ttl"),
+    [
+        (0, timedelta(minutes=5)),
+        (-1, timedelta(minutes=5)),
+        (2, timedelta(hours=1)),
+        (10, timedelta(hours=12)),
+        (30, HISTORICAL_TTL),
+        (3650, HISTORICAL_TTL),
+    ],
+)
+def test_freshness_ttl_by_window_age(days_ago, ttl):
+    assert freshness_ttl(at(days_ago), NOW) == ttl
+
+
+def test_uncovered_range_is_stale():
+    assert find_stale_intervals(at(100), at(90), [], NOW) == [(at(100), at(90))]
+
+
+def test_empty_range():
+    assert find_stale_intervals(at(90), at(90), [], NOW) == []
+    assert find_stale_intervals(at(90), at(100), [], NOW) == []
+
+
+def test_fresh_historical_coverage_skips_the_range():
+    coverages = [(at(120), at(60), at(29))]
+    assert find_stale_intervals(at(100), at(90), coverages, NOW) == []
+
+
+def test_expired_historical_coverage_is_refetched():
+    coverages = [(at(120), at(60), at(31))]
+    assert find_stale_intervals(at(100), at(90), coverages, NOW) == [(at(100), at(90))]
+
+
+def test_only_the_gaps_between_coverages_are_stale():
+    coverages = [(at(100), at(95), at(1)), (at(93), at(90), at(1))]
+    assert find_stale_intervals(at(100), at(88), coverages, NOW) == [(at(95), at(93)), (at(90), at(88))]
+
+
+def test_partial_coverage_of_a_segment_does_not_count():
+    coverages = [(at(99), at(91), at(1))]
+    assert find_stale_intervals(at(100), at(90), coverages, NOW) == [(at(100), at(99)), (at(91), at(90))]
+
+
+def test_recent_part_of_a_coverage_expires_first():
+    # Fetched 2 hours ago: still fresh where the 12 hour time to live applies, stale where it is 5 minutes or 1 hour.
+    coverages = [(at(20), at(0), NOW - timedelta(hours=2))]
+    assert find_stale_intervals(at(20), at(0), coverages, NOW) == [(at(7), at(0))]
+
+
+def test_adjacent_stale_segments_are_merged():
+    coverages = [(at(20), at(10), at(40)), (at(10), at(5), at(40))]
+    assert find_stale_intervals(at(20), at(5), coverages, NOW) == [(at(20), at(5))]
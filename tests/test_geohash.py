@@ -0,0 +1,94 @@
+import math
+import random
+
+import pytest
+
+from src.data_integration import geohash
+
+
+@pytest.mark.parametrize(
+    ("latitude", "longitude", "precision", "expected"),
+    [
+        (57.64911, 10.40744, 11, "u4pruydqqvj"),
+        (37.7749, -122.4194, 8, "9q8yyk8y"),
+        (-90.0, -180.0, 8, "00000000"),
+        (90.0, 180.0, 8, "zzzzzzzz"),
+        (0.0, 0.0, 1, "s"),
+    ],
+)
+def test_encode_known_geohashes(latitude, longitude, precision, expected):
+    assert geohash.encode(latitude, longitude, precision) == expected
+
+
+def test_encode_many_matches_encode_and_keeps_unknown_coordinates_null():
+    random.seed(7)
+    latitudes = [random.uniform(-90, 90) for _ in range(500)] + [None, 10.0, None]
+    longitudes = [random.uniform(-180, 180) for _ in range(500)] + [10.0, None, None]
+    encoded = geohash.encode_many(latitudes, longitudes)
+    assert encoded == [geohash.encode(lat, lon) for lat, lon in zip(latitudes, longitudes, strict=True)]
+    assert encoded[-3:] == [None, None, None]
+    assert all(len(value) == geohash.PRECISION for value in encoded[:-3])
+
+
+def test_encode_many_empty():
+    assert geohash.encode_many([], []) == []
+
+
+def test_cell_size():
+    assert geohash.cell_size(1) == (45.0, 45.0)
+    assert geohash.cell_size(2) == (5.625, 11.25)
+
+
+def test_haversine():
+    assert geohash.haversine_km(10.0, 20.0, 10.0, 20.0) == 0.0
+    assert geohash.haversine_km(0.0, 0.0, 0.0, 180.0) == pytest.approx(geohash.MAX_DISTANCE_KM)
+    assert geohash.haversine_km(0.0, 179.5, 0.0, -179.5) == pytest.approx(geohash.haversine_km(0.0, 0.0, 0.0, 1.0))
+
+
+def points_in_circle(latitude: float, longitude: float, radius_km: float, count: int) -> list[tuple[float, float]]:
+    """Random points of the circle, sampled in a box around it that is wider than the circle at any latitude."""
+    radius_degrees = math.degrees(radius_km / geohash.EARTH_RADIUS_KM)
+    max_lat = min(90.0, abs(latitude) + radius_degrees)
+    half_width = min(180.0, radius_degrees / math.cos(math.radians(max_lat)) if max_lat < 90.0 else 180.0)
+    points = []
+    while len(points) < count:
+        point_lat = random.uniform(max(-90.0, latitude - radius_degrees), min(90.0, latitude + radius_degrees))
+        point_lon = (longitude + random.uniform(-half_width, half_width) + 180.0) % 360.0 - 180.0
+        if geohash.haversine_km(latitude, longitude, point_lat, point_lon) <= radius_km:
+            points.append((point_lat, point_lon))
+    return points
+
+
+@pytest.mark.parametrize(
+    ("latitude", "longitude", "radius_km"),
+    [
+        (37.7749, -122.4194, 0.5),
+        (37.7749, -122.4194, 50.0),
+        (-33.9, 151.2, 300.0),
+        (0.0, 179.95, 20.0),
+        (0.0, -179.95, 20.0),
+        (65.0, -20.0, 800.0),
+        (89.5, 0.0, 100.0),
+        (-89.9, 45.0, 30.0),
+    ],
+)
+def test_cover_contains_every_point_of_the_circle(latitude, longitude, radius_km):
+    random.seed(11)
+    prefixes = geohash.cover(latitude, longitude, radius_km)
+    assert 0 < len(prefixes) <= 32
+    assert prefixes == sorted(set(prefixes))
+    for point_lat, point_lon in points_in_circle(latitude, longitude, radius_km, 300):
+        assert geohash.encode(point_lat, point_lon).startswith(tuple(prefixes)), (point_lat, point_lon)
+
+
+def test_cover_uses_long_prefixes_for_small_circles():
+    assert all(len(prefix) >= 6 for prefix in geohash.cover(37.7749, -122.4194, 0.5))
+
+
+def test_cover_falls_back_to_every_point_for_huge_circles():
+    assert geohash.cover(0.0, 0.0, geohash.MAX_DISTANCE_KM) == [""]
+
+
+def test_cover_respects_max_cells():
+    for max_cells in (1, 4, 9):
+        assert len(geohash.cover(48.85, 2.35, 100.0, max_cells=max_cells)) <= max_cells
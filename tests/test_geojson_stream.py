@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from src.data_integration.geojson_stream import FeatureCollectionStream
+
+
+def feature(i: int) -> dict:
+    return {
+        "type": "Feature",
+        "id": f"us{i}",
+        "properties": {"mag": 1.25 + i, "time": 1_700_000_000_000 + i, "place": f"{i} km N of Säo Tomé 🌋", "tz": None},
+        "geometry": {"type": "Point", "coordinates": [-122.4 + i, 37.7, 10]},
+    }
+
+
+def collection(count: int, metadata_first: bool = True) -> bytes:
+    metadata = {"generated": 1_700_000_000_000, "count": count, "title": "USGS Earthquakes"}
+    members = {"type": "FeatureCollection", "metadata": metadata, "features": [feature(i) for i in range(count)]}
+    if not metadata_first:
+        members = {"type": "FeatureCollection", "features": members["features"], "metadata": metadata, "bbox": [1, 2]}
+    return json.dumps(members, ensure_ascii=False, indent=1).encode()
+
+
+def chunked(body: bytes, size: int) -> list[bytes]:
+    return [body[start : start + size] for start in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1_000_000])
+@pytest.mark.parametrize("batch_size", [1, 4, 10, 100])
+def test_features_are_yielded_in_batches_whatever_the_chunking(chunk_size, batch_size):
+    body = collection(10)
+    stream = FeatureCollectionStream(chunked(body, chunk_size), batch_size=batch_size)
+    batches = list(stream.iter_batches())
+
+    assert [len(batch) for batch in batches] == [min(batch_size, 10 - start) for start in range(0, 10, batch_size)]
+    assert [f for batch in batches for f in batch] == [feature(i) for i in range(10)]
+    assert stream.metadata["count"] == 10
+    assert stream.bytes_read == len(body)
+
+
+def test_metadata_is_read_before_the_first_batch():
+    stream = FeatureCollectionStream(chunked(collection(5), 16), batch_size=2)
+    for _ in stream.iter_batches():
+        assert stream.metadata["title"] == "USGS Earthquakes"
+
+
+def test_members_after_the_features_are_read():
+    stream = FeatureCollectionStream(chunked(collection(3, metadata_first=False), 5))
+    assert [f["id"] for batch in stream.iter_batches() for f in batch] == ["us0", "us1", "us2"]
+    assert stream.metadata["count"] == 3
+
+
+@pytest.mark.parametrize("body", [b"{}", b' { "type" : "FeatureCollection", "features" : [ ] } ', collection(0)])
+def test_empty_collections(body):
+    assert list(FeatureCollectionStream(chunked(body, 2)).iter_batches()) == []
+
+
+def test_numbers_split_across_chunks_are_not_truncated():
+    body = b'{"features": [12345, 6.75e-3]}'
+    for split in range(len(body)):
+        stream = FeatureCollectionStream([body[:split], body[split:]])
+        assert list(stream.iter_batches()) == [[12345, 6.75e-3]]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [collection(3)[:-10], b'{"features": [1, 2', b'{"features" 1}', b'["not an object"]', b'{"features": [1 2]}', b""],
+)
+def test_malformed_documents_raise(body):
+    with pytest.raises(ValueError):
+        list(FeatureCollectionStream(chunked(body, 4)).iter_batches())
@@ -0,0 +1,123 @@
+import math
+import time
+import uuid
+
+import numpy as np
+import pytest
+
+from src.data_integration.helpers import create_feature, create_feature_columns
+
+METADATA_ID = uuid.uuid4()
+
+COLUMNS = [
+    "mag", "place", "time", "updated", "tz", "url", "detail", "felt", "cdi", "mmi", "alert", "status", "tsunami",
+    "sig", "net", "code", "ids", "sources", "types", "nst", "dmin", "rms", "gap", "mag_type", "latitude",
+    "longitude", "depth", "geohash", "event_id", "metadata_id",
+]  # fmt: skip
+
+
+def usgs_feature(event_id: str, time_ms: int, **properties) -> dict:
+    return {
+        "type": "Feature",
+        "id": event_id,
+        "properties": {
+            "mag": 4.2,
+            "place": "10 km N of Somewhere",
+            "time": time_ms,
+            "updated": time_ms + 60_000,
+            "tz": None,
+            "felt": 3,
+            "cdi": 2.7,
+            "mmi": None,
+            "alert": None,
+            "status": "reviewed",
+            "tsunami": 0,
+            "sig": 271,
+            "net": "us",
+            "magType": "mb",
+            **properties,
+        },
+        "geometry": {"type": "Point", "coordinates": [-122.4194, 37.7749, 10.5]},
+    }
+
+
+def to_list(values) -> list:
+    """Column values as Python objects, None where a NumPy column is NaN or masked."""
+    if isinstance(values, np.ndarray) and values.dtype.kind == "f":
+        return [None if math.isnan(value) else value for value in values.tolist()]
+    return values.tolist() if isinstance(values, np.ndarray) else values
+
+
+def rows(columns: dict) -> list[dict]:
+    values = {column: to_list(v) for column, v in columns.items()}
+    return [dict(zip(values, row, strict=True)) for row in zip(*values.values(), strict=True)]
+
+
+def assert_same_rows(features: list[dict]) -> None:
+    columns = create_feature_columns(features, METADATA_ID)
+    assert sorted(columns) == sorted(COLUMNS)
+    for feature, row in zip(features, rows(columns), strict=True):
+        instance = create_feature(feature, METADATA_ID)
+        assert row == {column: getattr(instance, column) for column in COLUMNS}
+
+
+@pytest.fixture(params=["UTC", "America/New_York", "Australia/Lord_Howe"])
+def local_timezone(request, monkeypatch):
+    """Run under a local time zone, since both transformations return naive local times."""
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.usefixtures("local_timezone")
+def test_columns_match_create_feature():
+    features = [usgs_feature(f"us{i}", 1_700_000_000_000 + i * 3_600_123) for i in range(50)]
+    assert_same_rows(features)
+
+
+@pytest.mark.usefixtures("local_timezone")
+def test_columns_match_create_feature_around_offset_transitions():
+    # New York springs forward on 2024-03-10 07:00 UTC and falls back on 2024-11-03 06:00 UTC. Lord Howe moves by
+    # 30 minutes on 2024-04-06 15:00 UTC and on 2024-10-05 15:30 UTC, in the middle of an hour.
+    transitions = [1_710_054_000_000, 1_730_613_600_000, 1_712_415_600_000, 1_728_142_200_000]
+    times = [t + offset for t in transitions for offset in range(-3_600_000, 3_600_001, 599_999)]
+    assert_same_rows([usgs_feature(f"us{i}", t) for i, t in enumerate(times)])
+
+
+@pytest.mark.usefixtures("local_timezone")
+def test_columns_match_create_feature_with_missing_and_null_values():
+    features = [
+        usgs_feature("explicit_nulls", 1_700_000_000_000, mag=None, place=None, felt=None, magType=None, nst=None),
+        {"id": "no_geometry", "properties": {"time": 1_700_000_000_000, "updated": 1_700_000_000_000}},
+        {"properties": {"time": 0, "updated": 0}, "geometry": {"coordinates": [1.5]}},
+        {**usgs_feature("null_coordinates", 1_700_000_000_000), "geometry": {"coordinates": [None, None, None]}},
+        {**usgs_feature("two_coordinates", 1_700_000_000_000), "geometry": {"coordinates": [179.9, -89.9]}},
+        {},
+    ]
+    assert_same_rows(features)
+
+
+def test_numeric_columns_are_typed_arrays():
+    columns = create_feature_columns([usgs_feature("us1", 1_700_000_000_000, tz=None)], METADATA_ID)
+    for column in ["mag", "cdi", "mmi", "dmin", "rms", "gap", "latitude", "longitude", "depth"]:
+        assert columns[column].dtype == np.float64
+    for column in ["tz", "felt", "tsunami", "sig", "nst"]:
+        assert isinstance(columns[column], np.ma.MaskedArray)
+        assert columns[column].dtype == np.int64
+    assert math.isnan(columns["mmi"][0])
+    assert columns["tz"].mask.tolist() == [True]
+
+
+def test_null_time_is_rejected_like_create_feature():
+    feature = usgs_feature("null_time", 1_700_000_000_000, time=None)
+    with pytest.raises(TypeError):
+        create_feature(feature, METADATA_ID)
+    with pytest.raises(TypeError):
+        create_feature_columns([feature], METADATA_ID)
+
+
+def test_empty_batch():
+    columns = create_feature_columns([], METADATA_ID)
+    assert all(len(values) == 0 for values in columns.values())
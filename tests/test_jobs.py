@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.data_integration.jobs import plan_chunks
+
+
+def test_plan_chunks_covers_the_range():
+    chunks = plan_chunks(datetime(2024, 1, 1), datetime(2024, 1, 3, 12), timedelta(days=1))
+    assert chunks == [
+        (datetime(2024, 1, 1), datetime(2024, 1, 2)),
+        (datetime(2024, 1, 2), datetime(2024, 1, 3)),
+        (datetime(2024, 1, 3), datetime(2024, 1, 3, 12)),
+    ]
+
+
+def test_plan_chunks_of_an_empty_range():
+    assert plan_chunks(datetime(2024, 1, 1), datetime(2024, 1, 1)) == []
+
+
+@pytest.mark.parametrize("chunk_size", [timedelta(0), timedelta(days=-1)])
+def test_plan_chunks_rejects_non_positive_sizes(chunk_size):
+    with pytest.raises(ValueError):
+        plan_chunks(datetime(2024, 1, 1), datetime(2024, 1, 2), chunk_size)
@@ -0,0 +1,76 @@
+import math
+
+import mapbox_vector_tile
+import pytest
+
+from src.app.domains.visualization import mvt
+
+
+def decode(tile: bytes) -> dict:
+    return mapbox_vector_tile.decode(tile, default_options={"y_coord_down": True})
+
+
+def mercator(latitude: float) -> float:
+    return math.asinh(math.tan(math.radians(latitude)))
+
+
+def inverse_mercator(y: float) -> float:
+    return math.degrees(math.atan(math.sinh(y)))
+
+
+def test_tile_round_trips_through_a_reference_decoder():
+    points = [
+        (0.0, 0.0, {"mag": 4.5, "count": 3, "offset": -7, "tsunami": True, "place": "Somewhere", "felt": None}),
+        (-45.0, 40.0, {"mag": 4.5, "count": 1, "tsunami": False, "place": "Elsewhere, ñ"}),
+        (120.0, -30.0, {"one": 1, "one_float": 1.0, "flag": True, "large": 2**40}),
+        (10.0, 10.0, {}),
+    ]
+    layer = decode(mvt.encode_tile("earthquakes", points, 0, 0, 0))["earthquakes"]
+
+    assert layer["version"] == 2
+    assert layer["extent"] == mvt.EXTENT
+    assert [feature["properties"] for feature in layer["features"]] == [
+        {key: value for key, value in properties.items() if value is not None} for _, _, properties in points
+    ]
+    assert all(feature["geometry"]["type"] == "Point" for feature in layer["features"])
+    assert layer["features"][0]["geometry"]["coordinates"] == [2048, 2048]
+    # 1, 1.0 and True are distinct values of the layer.
+    third = layer["features"][2]["properties"]
+    assert type(third["one"]) is int and type(third["one_float"]) is float and third["flag"] is True
+
+
+@pytest.mark.parametrize(("z", "x", "y"), [(0, 0, 0), (1, 1, 0), (3, 2, 5), (9, 300, 200), (14, 8000, 6000)])
+def test_points_are_placed_in_tile_coordinates(z, x, y):
+    west, south, east, north = mvt.tile_bounds(z, x, y)
+    north, south = min(north, mvt.MERCATOR_MAX_LATITUDE), max(south, -mvt.MERCATOR_MAX_LATITUDE)
+    center = ((west + east) / 2, inverse_mercator((mercator(north) + mercator(south)) / 2))
+    points = [(west, north, {"corner": "north-west"}), (*center, {"corner": "center"})]
+    features = decode(mvt.encode_tile("earthquakes", points, z, x, y))["earthquakes"]["features"]
+
+    assert features[0]["geometry"]["coordinates"] == [0, 0]
+    assert features[1]["geometry"]["coordinates"] == [mvt.EXTENT // 2, mvt.EXTENT // 2]
+    assert mvt.contains(z, x, y, *center)
+
+
+def test_edges_belong_to_the_tile_east_or_south():
+    west, south, east, north = mvt.tile_bounds(2, 1, 1)
+    assert (west, south, east) == (-90.0, 0.0, 0.0)
+    # The east edge of the tile is the west edge of the next column, the equator the north edge of the next row.
+    assert mvt.contains(2, 1, 1, west, 30.0)
+    assert not mvt.contains(2, 1, 1, east, 30.0) and mvt.contains(2, 2, 1, east, 30.0)
+    assert not mvt.contains(2, 1, 1, -45.0, south) and mvt.contains(2, 1, 2, -45.0, south)
+
+
+def test_buffered_bounds_extend_around_the_tile():
+    west, south, east, north = mvt.tile_bounds(3, 4, 4)
+    buffered_west, buffered_south, buffered_east, buffered_north = mvt.tile_bounds(3, 4, 4, buffer=0.25)
+    assert buffered_west == pytest.approx(west - (east - west) / 4)
+    assert buffered_east == pytest.approx(east + (east - west) / 4)
+    assert buffered_north > north and buffered_south < south
+    # Buffers stop at the antimeridian and the top and bottom rows extend to the poles.
+    assert mvt.tile_bounds(1, 0, 0, buffer=0.5) == (-180.0, pytest.approx(-66.51326044311186), 90.0, 90.0)
+    assert mvt.tile_bounds(1, 1, 1)[1] == -90.0
+
+
+def test_empty_tile():
+    assert decode(mvt.encode_tile("earthquakes", [], 5, 1, 1))["earthquakes"]["features"] == []
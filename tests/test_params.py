@@ -0,0 +1,49 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from src.app.config.params import decode_cursor, encode_cursor
+
+
+def b64(payload: bytes) -> str:
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "time",
+    [datetime(2024, 1, 1), datetime(2024, 2, 29, 23, 59, 59, 999999), datetime(1970, 1, 1, 0, 0, 0, 1)],
+)
+def test_cursor_round_trip(time):
+    id = uuid.uuid4()
+    cursor = encode_cursor(time, id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (time, id)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "!!!",
+        "é",
+        b64(b"not json"),
+        b64(b"\xff\xfe"),
+        b64(b"5"),
+        b64(b"null"),
+        b64(json.dumps(["2024-01-01T00:00:00"]).encode()),
+        b64(json.dumps(["2024-01-01T00:00:00", str(uuid.uuid4()), "extra"]).encode()),
+        b64(json.dumps(["not a time", str(uuid.uuid4())]).encode()),
+        b64(json.dumps(["2024-01-01T00:00:00", "not a uuid"]).encode()),
+        b64(json.dumps([1, 2]).encode()),
+        b64(json.dumps([None, None]).encode()),
+        encode_cursor(datetime(2024, 1, 1), uuid.uuid4())[:-3],
+    ],
+)
+def test_malformed_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400